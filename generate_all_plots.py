@@ -1,9 +1,7 @@
+import sys
 import os
-os.system("python src/visualization/plots.py")
-os.system("python src/visualization/ma_strategy.py")
-os.system("python src/visualization/imbalance.py")
-os.system("python src/visualization/pnl_by_regime.py")
-os.system("python src/visualization/position_vs_vix.py")
-os.system("python src/visualization/position.py")
-os.system("python src/visualization/signal_contribution.py")
-os.system("python src/visualization/interactive_ma_strategy.py")
\ No newline at end of file
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from src.visualization import pipeline
+
+if __name__ == '__main__':
+    pipeline.main(force='--force' in sys.argv[1:])
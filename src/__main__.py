@@ -1,4 +1,5 @@
-from src.visualization import ma_strategy
+import sys
+from src.cli import main
 
 if __name__ == "__main__":
-    ma_strategy.main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import pandas as pd
+import numpy as np
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.core.attribution import COMPONENTS, build_ledger
+from src.core.costs import linear_cost_scenarios
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
+from src.analysis.ma_filter import run_ma_filtered_strategy_arrays
+
+def strategy_ledgers(df, scenario=None, threshold_weight=0.6, calendar_weight=0.4, vix_threshold=20,
+                     ma_window=200, buffer=0.02):
+    """
+    Runs the four strategies on df (signals and VIX already joined) and builds
+    an attribution ledger for each.
+    """
+    results = {
+        'Dual-Signal': run_strategy_arrays(df, threshold_weight, calendar_weight),
+        'Calendar-Only': run_retail_strategy_arrays(df),
+        'Hedged Equity': run_vix_filtered_strategy_arrays(df, vix_threshold),
+        'MA-Filtered': run_ma_filtered_strategy_arrays(df, ma_window, buffer),
+    }
+    return {name: build_ledger(name, result, scenario) for name, result in results.items()}
+
+def format_percent_table(table):
+    """
+    Formats the component and total columns as percentages.
+    """
+    columns = COMPONENTS + ['Total']
+    formatted = table[columns].map(lambda x: f"{x:.2%}")
+    formatted['Days'] = table['Days']
+    return formatted
+
+def main():
+    """
+    Main function to attribute daily P&L of every strategy to its legs.
+    """
+    try:
+        vix_data = pd.read_csv('data/vix.csv', index_col='Date', parse_dates=True)
+        vix_data = vix_data.rename(columns={'VIXSIM': 'VIX'})
+    except FileNotFoundError:
+        print("Error: The file at vix.csv was not found.")
+        return
+
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    if base_data is None:
+        return
+
+    data_with_signals = calculate_signals(base_data)
+    data_with_vix = data_with_signals.join(vix_data, how='inner')
+
+    scenario = linear_cost_scenarios([2])[0]
+    ledgers = strategy_ledgers(data_with_vix, scenario=scenario)
+
+    print(f"--- Annualized P&L Attribution (sum of daily contributions, costs: {scenario['name']} per leg) ---")
+    summary = pd.DataFrame({name: ledger.to_frame().mean() * 252 for name, ledger in ledgers.items()}).T
+    summary['Total'] = summary[COMPONENTS].sum(axis=1)
+    print(summary.map(lambda x: f"{x:.2%}").to_string())
+
+    print("\n--- Dual-Signal Attribution by Year ---")
+    print(format_percent_table(ledgers['Dual-Signal'].aggregate('Y')).to_string())
+
+    vix_level = pd.cut(data_with_vix['VIX'] / 1000, [0, 15, 20, 25, 30, np.inf],
+                       labels=['<15', '15-20', '20-25', '25-30', '>30']).astype(str)
+    for name in ['Hedged Equity', 'MA-Filtered']:
+        ledger = ledgers[name]
+        print(f"\n--- {name} Attribution by VIX Level ---")
+        print(format_percent_table(ledger.aggregate(vix_level.reindex(ledger.index).to_numpy())).to_string())
+
+    periods = {
+        "Dot-Com Bust": ("2000-03-24", "2002-10-09"),
+        "Global Financial Crisis": ("2007-10-09", "2009-03-09"),
+        "COVID-19 Crash": ("2020-02-19", "2020-03-23"),
+        "2022 Rate Shock": ("2022-01-03", "2022-10-12"),
+    }
+    for name, ledger in ledgers.items():
+        print(f"\n--- {name} Attribution by Crisis Period ---")
+        print(format_percent_table(ledger.aggregate(periods)).to_string())
+
+if __name__ == '__main__':
+    main()
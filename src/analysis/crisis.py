@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
 from src.core.backtest import load_data, calculate_signals
-from src.analysis.retail_investor import run_retail_strategy, calculate_retail_statistics
+from src.core.regimes import find_episodes, episode_mask
+from src.core.metrics import performance_table
+from src.analysis.retail_investor import run_retail_strategy_arrays
 
 def main():
     """
@@ -28,7 +30,8 @@ def main():
     # --- Define Crisis Periods ---
     # VIX data is scaled by 1000 (e.g., 25000 represents a VIX of 25)
     vix_threshold = 25000
-    base_data['crisis_period'] = base_data['VIX'] > vix_threshold
+    crisis_episodes = find_episodes(base_data['VIX'], [vix_threshold])
+    base_data['crisis_period'] = episode_mask(base_data.index, crisis_episodes)
     
     crisis_data = base_data[base_data['crisis_period']].copy()
     non_crisis_data = base_data[~base_data['crisis_period']].copy()
@@ -37,22 +40,22 @@ def main():
     print(f"Total Days: {len(base_data)}")
     print(f"Crisis Days: {len(crisis_data)} ({len(crisis_data)/len(base_data):.2%})")
     print(f"Non-Crisis Days: {len(non_crisis_data)} ({len(non_crisis_data)/len(base_data):.2%})")
+    print(f"Crisis Episodes: {len(crisis_episodes)} (median duration {crisis_episodes['duration'].median():.0f} days)")
 
-    # --- Run Backtests on Sub-Periods ---
-    print("\n--- Crisis Period Performance ---")
-    if not crisis_data.empty:
-        crisis_results = run_retail_strategy(crisis_data)
-        calculate_retail_statistics(crisis_results)
-    else:
-        print("No crisis periods to analyze.")
-
-    print("\n--- Non-Crisis Period Performance ---")
-    if not non_crisis_data.empty:
-        non_crisis_results = run_retail_strategy(non_crisis_data)
-        calculate_retail_statistics(non_crisis_results)
-    else:
-        print("No non-crisis periods to analyze.")
-
+    # --- Split One Full-History Run ---
+    # The strategy runs once over every day; each subset keeps the positions that
+    # were actually held, rather than re-running on days that are weeks apart.
+    result = run_retail_strategy_arrays(base_data)
+    in_crisis = base_data['crisis_period'].reindex(result.index).to_numpy()
+    for title, mask in [("Crisis Period Performance", in_crisis), ("Non-Crisis Period Performance", ~in_crisis)]:
+        print(f"\n--- {title} ---")
+        if not mask.any():
+            print("No days to analyze.")
+            continue
+        stats = performance_table(np.column_stack([result.returns[mask], result.spy_return[mask]]),
+                                  names=['Strategy', 'S&P 500 (SPY)'])
+        print(stats.to_string(formatters={'CAGR': '{:.2%}'.format, 'Volatility': '{:.2%}'.format,
+                                          'Sharpe Ratio': '{:.2f}'.format, 'Max Drawdown': '{:.2%}'.format}))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
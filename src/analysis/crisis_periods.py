@@ -1,59 +1,88 @@
 import pandas as pd
-from src.core.backtest import load_data, calculate_signals, run_strategy
-from src.analysis.retail_investor import run_retail_strategy, calculate_retail_statistics
-from src.analysis.vix_filter import run_vix_filtered_strategy
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.core.period_query import PeriodQueryEngine, calendar_year_periods, episode_periods
+from src.core.regimes import find_episodes
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
+
+def build_period_engine(data_with_signals, vix_data=None):
+    """
+    Runs every strategy once over the full history and indexes the daily returns
+    for period queries. The hedged strategy is only included when VIX data is given.
+    """
+    returns = {
+        'Original Dual-Signal': run_strategy_arrays(data_with_signals),
+        'Retail-Adapted (Calendar-Only)': run_retail_strategy_arrays(data_with_signals),
+    }
+    if vix_data is not None:
+        data_with_vix = data_with_signals.join(vix_data, how='inner')
+        returns['Hedged Equity (VIX > 20)'] = run_vix_filtered_strategy_arrays(data_with_vix, vix_threshold=20)
+
+    spy = returns['Original Dual-Signal']
+    columns = {name: pd.Series(result.returns, index=result.index) for name, result in returns.items()}
+    columns['S&P 500 (SPY)'] = pd.Series(spy.spy_return, index=spy.index)
+
+    # Periods before the VIX history report NaN for the hedged strategy
+    return PeriodQueryEngine(pd.DataFrame(columns))
+
+def print_period_table(table):
+    """
+    Prints one block of statistics per period.
+    """
+    for period, rows in table.groupby(level='period', sort=False):
+        first = rows.iloc[0]
+        print(f"\n--- Analyzing Period: {period} ({first['Start']:%Y-%m-%d} to {first['End']:%Y-%m-%d}, {first['Days']} days) ---")
+        print(f"{'Strategy':<32} {'CAGR':>9} {'Volatility':>11} {'Sharpe':>8} {'Max DD':>9}")
+        print("-" * 73)
+        for (_, strategy), row in rows.iterrows():
+            print(f"{strategy:<32} {row['CAGR']:>9.2%} {row['Volatility']:>11.2%} {row['Sharpe Ratio']:>8.2f} {row['Max Drawdown']:>9.2%}")
 
 def analyze_specific_periods(data, periods):
     """
     Analyzes the performance of different strategies over specific historical periods.
+    Signals and strategies are computed once on the full data; each period is then
+    a query against the precomputed returns.
     """
     data_with_signals = calculate_signals(data.copy())
-    
+
     try:
         vix_data = pd.read_csv('data/vix.csv', index_col='Date', parse_dates=True)
         vix_data.rename(columns={'VIXSIM': 'VIX'}, inplace=True)
-        data_with_signals = data_with_signals.join(vix_data, how='inner')
     except FileNotFoundError:
         print("VIX data not found, skipping VIX-filtered strategy.")
-        data_with_signals = None
-
-    for name, (start_date, end_date) in periods.items():
-        print(f"\n--- Analyzing Period: {name} ({start_date} to {end_date}) ---")
-        
-        period_data = data.loc[start_date:end_date].copy()
-        period_data_with_signals = calculate_signals(period_data.copy())
-
-        # 1. Original Dual-Signal Strategy
-        print("\n--- 1. Original Dual-Signal Strategy Performance ---")
-        original_results = run_strategy(period_data_with_signals.copy())
-        calculate_retail_statistics(original_results) # Using retail stats for consistent metrics
-
-        # 2. Retail-Adapted (Calendar-Only) Strategy
-        print("\n--- 2. Retail-Adapted (Calendar-Only) Strategy Performance ---")
-        retail_results = run_retail_strategy(period_data_with_signals.copy())
-        calculate_retail_statistics(retail_results)
-
-        # 3. Final Hedged Equity Strategy
-        if data_with_signals is not None:
-            print("\n--- 3. Final Hedged Equity Strategy (VIX > 20) Performance ---")
-            period_data_with_signals_vix = period_data_with_signals.join(vix_data, how='inner')
-            hedged_results = run_vix_filtered_strategy(period_data_with_signals_vix.copy(), vix_threshold=20)
-            calculate_retail_statistics(hedged_results)
+        vix_data = None
+
+    engine = build_period_engine(data_with_signals, vix_data)
+    print_period_table(engine.query_periods(periods))
+    return engine, vix_data
 
 def main():
     """
     Main function to run the specific period analysis.
     """
-    full_data = load_data('data/Return.csv', start_date='1997-09-10')
+    full_data = load_data('data/Return.csv')
     if full_data is None:
         return
 
     periods_to_analyze = {
+        "Pre-1998": (None, "1997-09-09"),
         "Dot-Com Bust": ("2000-03-24", "2002-10-09"),
-        "Global Financial Crisis": ("2007-10-09", "2009-03-09")
+        "Global Financial Crisis": ("2007-10-09", "2009-03-09"),
+        "COVID-19 Crash": ("2020-02-19", "2020-03-23"),
     }
 
-    analyze_specific_periods(full_data, periods_to_analyze)
+    engine, vix_data = analyze_specific_periods(full_data, periods_to_analyze)
+
+    # --- Generated Periods: every calendar year and every VIX > 30 episode ---
+    yearly = engine.query_periods(calendar_year_periods(engine.index))
+    print("\n--- Sharpe Ratio by Calendar Year ---")
+    print(yearly['Sharpe Ratio'].unstack('strategy').round(2).to_string())
+
+    if vix_data is not None:
+        episodes = find_episodes(vix_data['VIX'], [30 * 1000], min_duration=5)
+        episodes['threshold'] = episodes['threshold'] / 1000
+        print("\n--- Performance During VIX > 30 Episodes (5+ days) ---")
+        print_period_table(engine.query_periods(episode_periods(episodes)))
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,63 @@
+import pandas as pd
+import numpy as np
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.core.drawdowns import find_drawdowns, drawdown_profile
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.ma_filter import run_ma_filtered_strategy_arrays
+
+def bootstrap_drawdown_profiles(returns, num_paths=1000, horizon_years=10, seed=0):
+    """
+    Drawdown profiles of `num_paths` bootstrapped return paths, evaluated as the
+    columns of one (days x paths) matrix.
+    """
+    rng = np.random.default_rng(seed)
+    values = np.asarray(returns, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    paths = values[rng.integers(0, len(values), size=(horizon_years * 252, num_paths))]
+    return drawdown_profile(paths)
+
+def main():
+    """
+    Main function to run the drawdown-episode analysis.
+    """
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    if base_data is None:
+        return
+
+    data_with_signals = calculate_signals(base_data)
+    results = {
+        'Original Dual-Signal': run_strategy_arrays(data_with_signals),
+        'Calendar-Only': run_retail_strategy_arrays(data_with_signals),
+        'MA-Filtered (200d)': run_ma_filtered_strategy_arrays(data_with_signals),
+    }
+    returns = pd.DataFrame({name: pd.Series(r.returns, index=r.index) for name, r in results.items()})
+    returns['S&P 500 (SPY)'] = base_data['SPY_return']
+    returns = returns.dropna()
+
+    print("--- Drawdown Profile ---")
+    profile = drawdown_profile(returns)
+    print(profile.to_string(formatters={
+        'Max Drawdown': '{:.2%}'.format, 'Ulcer Index': '{:.2%}'.format,
+        'CDaR (95%)': '{:.2%}'.format, 'Average Under Water': '{:.1f}'.format,
+    }))
+
+    episodes = find_drawdowns(returns, min_depth=0.05)
+    for name, rows in episodes.groupby('series', sort=False):
+        print(f"\n--- Deepest Drawdowns: {name} ---")
+        deepest = rows.nsmallest(5, 'depth')
+        print(f"{'Peak':<12} {'Trough':<12} {'Recovery':<12} {'Depth':>8} {'To Trough':>10} {'Under Water':>12}")
+        print("-" * 70)
+        for row in deepest.itertuples():
+            recovery = f"{row.recovery:%Y-%m-%d}" if row.recovered else 'ongoing'
+            print(f"{row.peak:%Y-%m-%d}   {row.trough:%Y-%m-%d}   {recovery:<12} {row.depth:>8.2%} "
+                  f"{row.time_to_trough:>10} {row.time_under_water:>12}")
+
+    print("\n--- Bootstrapped 10-Year Drawdown Profiles (1000 paths) ---")
+    for name in ['Calendar-Only', 'S&P 500 (SPY)']:
+        paths = bootstrap_drawdown_profiles(returns[name])
+        print(f"{name}: median max drawdown {paths['Max Drawdown'].median():.2%}, "
+              f"5th percentile {paths['Max Drawdown'].quantile(0.05):.2%}, "
+              f"median longest time under water {paths['Longest Under Water'].median():.0f} days")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+import pandas as pd
+import numpy as np
+from src.core.backtest import load_data
+
+EVENT_MONTHS = {
+    'Month-End': range(1, 13),
+    'Quarter-End': (3, 6, 9, 12),
+    'Year-End': (12,),
+}
+
+def month_end_positions(index, months=range(1, 13)):
+    """
+    Positions of the last trading day of every month whose number is in `months`.
+    The final month of the index is skipped, as it may be incomplete.
+    """
+    periods = index.to_period('M')
+    is_last = np.concatenate([periods[1:] != periods[:-1], [False]])
+    positions = np.flatnonzero(is_last)
+    return positions[np.isin(index.month[positions], list(months))]
+
+def month_to_date_drift(df):
+    """
+    Month-to-date log performance of SPY relative to TLT. Its sign is the sign of
+    the calendar signal's drifted weight minus 0.6, since the calendar portfolio
+    is reset to 60/40 at every month-end.
+    """
+    log_ratio = np.log1p(df['SPY_return']) - np.log1p(df['TLT_return'])
+    return log_ratio.groupby(df.index.to_period('M')).cumsum().to_numpy()
+
+def event_matrix(values, positions, offsets):
+    """
+    Gathers values at every (event, offset) pair in one indexing step over a
+    precomputed (events x offsets) position grid. Out-of-range cells are NaN.
+    """
+    grid = positions[:, None] + np.asarray(offsets)[None, :]
+    inside = (grid >= 0) & (grid < len(values))
+    return np.where(inside, np.asarray(values, dtype=np.float64)[np.clip(grid, 0, len(values) - 1)], np.nan)
+
+def _moments(total, total_sq, positives, count):
+    """
+    Mean, t-statistic and hit rate from summed event returns.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / count
+        variance = (total_sq - count * mean ** 2) / (count - 1)
+        t_stat = mean / np.sqrt(variance / count)
+        hit_rate = positives / count
+    return mean, t_stat, hit_rate
+
+def event_profile(matrix, offsets, groups):
+    """
+    Mean, t-statistic and hit rate of the event returns at every offset, for
+    each named boolean event mask in `groups`. Returns one row per (group, offset).
+    """
+    valid = ~np.isnan(matrix)
+    values = np.where(valid, matrix, 0.0)
+    tables = []
+    for name, mask in groups.items():
+        count = valid[mask].sum(axis=0)
+        mean, t_stat, hit_rate = _moments(
+            values[mask].sum(axis=0), (values[mask] ** 2).sum(axis=0), (values[mask] > 0).sum(axis=0), count
+        )
+        tables.append(pd.DataFrame({
+            'Mean': mean, 't-stat': t_stat, 'Hit Rate': hit_rate, 'Events': count,
+        }, index=pd.MultiIndex.from_product([[name], offsets], names=['group', 'offset'])))
+    return pd.concat(tables)
+
+def rolling_event_profile(matrix, offsets, event_dates, years=5):
+    """
+    Mean and t-statistic at every offset over the events of the trailing
+    `years` years, for every event date. Prefix sums over the event axis make
+    each window a difference of two rows, so all windows cost one pass.
+    """
+    valid = ~np.isnan(matrix)
+    values = np.where(valid, matrix, 0.0)
+    zero_row = np.zeros((1, matrix.shape[1]))
+    prefix = {
+        name: np.vstack([zero_row, np.cumsum(data, axis=0)])
+        for name, data in [('total', values), ('total_sq', values ** 2), ('positives', values > 0), ('count', valid)]
+    }
+
+    event_dates = pd.DatetimeIndex(event_dates)
+    ends = np.arange(1, len(event_dates) + 1)
+    starts = event_dates.searchsorted(event_dates - pd.DateOffset(years=years), side='right')
+    window = {name: data[ends] - data[starts] for name, data in prefix.items()}
+    mean, t_stat, _ = _moments(window['total'], window['total_sq'], window['positives'], window['count'])
+
+    # Windows that do not yet span the full history length are dropped
+    complete = event_dates >= event_dates[0] + pd.DateOffset(years=years)
+    return (pd.DataFrame(mean[complete], index=event_dates[complete], columns=offsets),
+            pd.DataFrame(t_stat[complete], index=event_dates[complete], columns=offsets))
+
+def plot_event_profile(profile, title, filename):
+    """
+    Bar chart of the mean spread at each offset, one panel per group.
+    """
+    import matplotlib.pyplot as plt
+    groups = profile.index.unique('group')
+    fig, axes = plt.subplots(len(groups), 1, figsize=(14, 4 * len(groups)), sharex=True)
+    for ax, group in zip(np.atleast_1d(axes), groups):
+        rows = profile.xs(group, level='group')
+        colors = np.where(rows['t-stat'].abs() >= 2, 'tab:red', 'tab:gray')
+        ax.bar(rows.index, rows['Mean'] * 1e4, color=colors)
+        ax.axhline(0, color='black', linewidth=0.8)
+        ax.axvline(0, color='gray', linestyle='--', linewidth=0.8)
+        ax.set_title(group)
+        ax.set_ylabel('Mean Spread (bps)')
+        ax.grid(True, axis='y')
+    np.atleast_1d(axes)[-1].set_xlabel('Trading Days Relative to Month-End (|t| >= 2 in red)')
+    fig.suptitle(title)
+    fig.tight_layout()
+    plt.savefig(filename)
+    plt.close()
+    print(f"Event-study plot saved to {filename}")
+
+def plot_rolling_t_stats(t_stats, title, filename):
+    """
+    Heatmap of the rolling t-statistic per offset over time.
+    """
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(14, 6))
+    plt.imshow(t_stats.T.to_numpy(), aspect='auto', cmap='RdBu', vmin=-4, vmax=4, origin='lower',
+               extent=[0, len(t_stats), t_stats.columns[0] - 0.5, t_stats.columns[-1] + 0.5])
+    years = t_stats.index.year
+    ticks = np.flatnonzero(np.concatenate([[True], years[1:] != years[:-1]]) & (years % 5 == 0))
+    plt.xticks(ticks, years[ticks])
+    plt.colorbar(label='t-stat')
+    plt.title(title)
+    plt.xlabel('Window End')
+    plt.ylabel('Offset (trading days)')
+    plt.savefig(filename)
+    plt.close()
+    print(f"Rolling event-study plot saved to {filename}")
+
+def main():
+    """
+    Main function to run the month-end event study on the SPY-TLT spread.
+    """
+    data = load_data('data/Return.csv')
+    if data is None:
+        return
+
+    offsets = np.arange(-15, 11)
+    condition_offset = -4
+    spread = (data['SPY_return'] - data['TLT_return']).to_numpy()
+    drift = month_to_date_drift(data)
+
+    print("--- Month-End Event Study: SPY - TLT Spread by Trading-Day Offset ---")
+    for kind, months in EVENT_MONTHS.items():
+        positions = month_end_positions(data.index, months)
+        matrix = event_matrix(spread, positions, offsets)
+        # The drift is read on the 5th-to-last day, as the calendar signal does
+        conditioning = event_matrix(drift, positions, [condition_offset])[:, 0]
+        groups = {
+            'All': np.ones(len(positions), dtype=bool),
+            'SPY Outperformed': conditioning > 0,
+            'SPY Underperformed': conditioning < 0,
+        }
+        profile = event_profile(matrix, offsets, groups)
+
+        print(f"\n--- {kind} ({len(positions)} events, drift read at offset {condition_offset}) ---")
+        table = profile.assign(Mean=profile['Mean'] * 1e4)[['Mean', 't-stat']].unstack('group')
+        print(f"Mean spread in bps and t-stat (offsets up to {condition_offset} overlap the conditioning window):")
+        print(table.round(2).to_string())
+
+        suffix = kind.lower().replace('-', '_')
+        plot_event_profile(profile, f'{kind} Event Study: SPY - TLT Spread', f'plots/other/plot_event_study_{suffix}.png')
+
+        if kind == 'Month-End':
+            # Spread signed by the calendar signal's bet against the month-to-date winner
+            signed = matrix * -np.sign(conditioning)[:, None]
+            mean, t_stats = rolling_event_profile(signed, offsets, data.index[positions], years=5)
+            # Positions set on days -4..-1 earn the spread on offsets -3..0
+            traded = [offset for offset in offsets if -3 <= offset <= 0]
+            print("\n--- Rolling 5-Year Mean of the Signed Spread on Traded Offsets (bps) ---")
+            print((mean[traded].resample('YE').last() * 1e4).round(2).to_string())
+            plot_rolling_t_stats(t_stats, 'Rolling 5-Year t-stat of the Signed Month-End Spread',
+                                 'plots/other/plot_event_study_rolling.png')
+
+if __name__ == '__main__':
+    main()
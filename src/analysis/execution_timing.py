@@ -0,0 +1,126 @@
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.core.costs import leg_weights
+from src.core.metrics import performance_table
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
+from src.analysis.ma_filter import run_ma_filtered_strategy_arrays
+
+def shifted_weight_view(weight, max_shift):
+    """
+    Returns a read-only strided (days x max_shift+1) view whose column k holds
+    weight.shift(k). Only the NaN padding is allocated, the weights are not copied.
+    """
+    weight = np.asarray(weight, dtype=np.float64)
+    padded = np.concatenate([np.full(max_shift, np.nan), weight])
+    return sliding_window_view(padded, max_shift + 1)[:, ::-1]
+
+def lag_weight_matrix(weight, lags):
+    """
+    Builds the (days x lags) matrix of weights actually held under each fill lag.
+    Lag 0 is the current close-to-close fill (weight.shift(1)); a fractional lag
+    such as 0.5 fills half the trade one day later.
+    """
+    lags = np.asarray(lags, dtype=np.float64)
+    whole = np.floor(lags).astype(int)
+    fraction = lags - whole
+    shifted = shifted_weight_view(weight, int(whole.max()) + 2)
+
+    held = shifted[:, whole + 1]
+    # Whole-day lags skip the blend so the extra day of warm-up NaNs does not leak in
+    return np.where(fraction > 0, (1 - fraction) * held + fraction * shifted[:, whole + 2], held)
+
+def lagged_returns(result, lags):
+    """
+    Strategy returns of a BacktestResult for every fill lag, as a (days x lags) matrix.
+    Hedged strategies are lagged leg by leg, so a late switch out of SPY is captured too.
+    """
+    spy_weight, tlt_weight = leg_weights(result.weight, result.hedge_active)
+    return (
+        lag_weight_matrix(spy_weight, lags) * result.spy_return[:, None]
+        + lag_weight_matrix(tlt_weight, lags) * result.tlt_return[:, None]
+    )
+
+def lag_decay_table(results, max_lag=2, step=0.5):
+    """
+    Evaluates every strategy variant for fill lags 0..max_lag in steps of `step`.
+    `results` maps a strategy name to a BacktestResult; the signals are not re-run.
+    """
+    lags = np.arange(0, max_lag + step / 2, step)
+    tables = []
+    for name, result in results.items():
+        returns = lagged_returns(result, lags)
+        # Drop the warm-up rows so every lag is evaluated on the same days
+        returns = returns[int(np.ceil(max_lag)) + 1:]
+        table = performance_table(returns, names=pd.Index(lags, name='lag'))
+        table['Strategy'] = name
+        tables.append(table.reset_index())
+
+    return pd.concat(tables, ignore_index=True).set_index(['Strategy', 'lag'])
+
+def plot_lag_decay(decay, filename='plots/other/plot_execution_lag.png'):
+    """
+    Plots the Sharpe and CAGR decay curves against the fill lag for every strategy.
+    """
+    import matplotlib.pyplot as plt
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    for name, table in decay.groupby(level='Strategy', sort=False):
+        lags = table.index.get_level_values('lag')
+        ax1.plot(lags, table['Sharpe Ratio'], marker='o', label=name)
+        ax2.plot(lags, table['CAGR'], marker='o', label=name)
+
+    ax1.set_title('Sharpe Ratio vs. Fill Lag')
+    ax1.set_xlabel('Fill Lag (trading days after signal close)')
+    ax1.set_ylabel('Sharpe Ratio')
+    ax2.set_title('CAGR vs. Fill Lag')
+    ax2.set_xlabel('Fill Lag (trading days after signal close)')
+    ax2.set_ylabel('CAGR')
+    for ax in (ax1, ax2):
+        ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+        ax.legend()
+
+    fig.tight_layout()
+    plt.savefig(filename)
+    plt.close()
+    print(f"Execution lag plot saved to {filename}")
+
+def main():
+    """
+    Main function to run the execution-lag sensitivity analysis.
+    """
+    # --- Load and Prepare Data ---
+    try:
+        vix_data = pd.read_csv('data/vix.csv', index_col='Date', parse_dates=True)
+        vix_data = vix_data.rename(columns={'VIXSIM': 'VIX'})
+    except FileNotFoundError:
+        print("Error: The file at vix.csv was not found.")
+        return
+
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    if base_data is None:
+        return
+
+    data_with_signals = calculate_signals(base_data)
+    data_with_vix = data_with_signals.join(vix_data, how='inner')
+
+    results = {
+        'Dual-Signal': run_strategy_arrays(data_with_signals),
+        'Calendar-Only': run_retail_strategy_arrays(data_with_signals),
+        'Hedged Equity (VIX > 20)': run_vix_filtered_strategy_arrays(data_with_vix, vix_threshold=20),
+        'MA-Filtered (200d)': run_ma_filtered_strategy_arrays(data_with_signals, ma_window=200, buffer=0.02),
+    }
+
+    print("--- Execution Lag Sensitivity (lag 0 = next-close fill) ---")
+    decay = lag_decay_table(results, max_lag=2, step=0.5)
+
+    print("\nSharpe Ratio by fill lag:")
+    print(decay['Sharpe Ratio'].unstack('lag').round(2).to_string())
+    print("\nCAGR by fill lag:")
+    print(decay['CAGR'].unstack('lag').map(lambda x: f"{x:.2%}").to_string())
+
+    plot_lag_decay(decay)
+
+if __name__ == '__main__':
+    main()
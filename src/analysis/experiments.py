@@ -0,0 +1,391 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import json
+import time
+import sqlite3
+import hashlib
+import tomllib
+import itertools
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.core import instrument
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.core.metrics import performance_table
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
+from src.analysis.ma_filter import run_ma_filtered_strategy_arrays
+from src.analysis.monte_carlo import run_monte_carlo_simulation
+from src.visualization.build_cache import code_fingerprint, file_digest
+
+DEFAULT_SPEC = 'experiments/example.toml'
+DEFAULT_STORE = 'experiments/results.sqlite'
+
+# --- Strategies ---
+
+def _run_dual(df, threshold_weight=0.6):
+    return run_strategy_arrays(df, threshold_weight, 1 - threshold_weight)
+
+def _run_calendar(df):
+    return run_retail_strategy_arrays(df)
+
+def _run_hedged(df, vix_threshold=20):
+    return run_vix_filtered_strategy_arrays(df, vix_threshold)
+
+def _run_ma(df, ma_window=200, buffer=0.02):
+    return run_ma_filtered_strategy_arrays(df, int(ma_window), buffer)
+
+# key: (runner, needs VIX, {parameter: default})
+STRATEGIES = {
+    'dual': (_run_dual, False, {'threshold_weight': 0.6}),
+    'calendar': (_run_calendar, False, {}),
+    'hedged': (_run_hedged, True, {'vix_threshold': 20}),
+    'ma': (_run_ma, False, {'ma_window': 200, 'buffer': 0.02}),
+}
+
+# --- Analyses ---
+# Each takes the strategy's BacktestResult, the dataset, the strategy runner and its
+# parameters, and returns a list of (series, metric, value) rows.
+
+def _table_rows(table):
+    return [(series, metric, float(value)) for series, row in table.iterrows() for metric, value in row.items()]
+
+def analyze_performance(result, data, runner, strategy_params):
+    """
+    CAGR, volatility, Sharpe ratio and max drawdown of the strategy and SPY.
+    """
+    return _table_rows(result.statistics())
+
+def analyze_walk_forward(result, data, runner, strategy_params, in_sample_years=5, out_of_sample_years=2, step_years=2):
+    """
+    Same windows as run_walk_forward_analysis, for any strategy: the out-of-sample
+    slices of the full-history run are stitched together. None of the strategies
+    fit anything in-sample, and slicing (rather than re-running on each slice)
+    keeps indicator warm-ups such as the MA filter's from eating into every window.
+    """
+    start_year, end_year = data.index.year.min(), data.index.year.max()
+    years = result.index.year
+    strategy_returns, spy_returns = [], []
+    current_year = start_year
+    while current_year + in_sample_years + out_of_sample_years <= end_year:
+        out_of_sample_start = current_year + in_sample_years
+        window = (years >= out_of_sample_start) & (years < out_of_sample_start + out_of_sample_years)
+        strategy_returns.append(result.returns[window])
+        spy_returns.append(result.spy_return[window])
+        current_year += step_years
+    if not strategy_returns:
+        return []
+    table = performance_table(np.column_stack([np.concatenate(strategy_returns), np.concatenate(spy_returns)]),
+                              names=['Strategy', 'S&P 500 (SPY)'])
+    return _table_rows(table)
+
+def analyze_monte_carlo(result, data, runner, strategy_params, num_simulations=5000, horizons=(1, 3, 5, 10, 20), seed=0):
+    """
+    Bootstrapped CAGR distribution per horizon. Seeded, so stored results are reproducible.
+    """
+    rows = []
+    for series, returns in [('Strategy', result.returns), ('S&P 500 (SPY)', result.spy_return)]:
+        np.random.seed(seed)
+        simulation = run_monte_carlo_simulation(returns, num_simulations=num_simulations, horizons=list(horizons))
+        for horizon, res in simulation.items():
+            for metric in ['prob_loss', 'median_cagr', '5th_percentile_cagr', '95th_percentile_cagr']:
+                rows.append((series, f"{metric} ({horizon}y)", float(res[metric])))
+    return rows
+
+# name: (function, {parameter: default})
+ANALYSES = {
+    'performance': (analyze_performance, {}),
+    'walk_forward': (analyze_walk_forward, {'in_sample_years': 5, 'out_of_sample_years': 2, 'step_years': 2}),
+    'monte_carlo': (analyze_monte_carlo, {'num_simulations': 5000, 'horizons': [1, 3, 5, 10, 20], 'seed': 0}),
+}
+
+# --- Spec ---
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, default=str)
+
+def _digest(*parts):
+    return hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+
+def load_spec(path):
+    """
+    Reads and validates a TOML experiment spec. Raises ValueError on anything
+    the runner would not understand.
+    """
+    with open(path, 'rb') as handle:
+        spec = tomllib.load(handle)
+    datasets = spec.get('datasets', {})
+    if not datasets:
+        raise ValueError(f"{path}: no [datasets] defined")
+    for name, dataset in datasets.items():
+        unknown = set(dataset) - {'returns', 'vix', 'start', 'end'}
+        if unknown or 'returns' not in dataset:
+            raise ValueError(f"dataset '{name}' needs 'returns' and accepts only vix/start/end (got {', '.join(sorted(dataset))})")
+
+    names = set()
+    for experiment in spec.get('experiments', []):
+        name = experiment.get('name')
+        if not name or name in names:
+            raise ValueError(f"every experiment needs a unique name (got {name!r})")
+        names.add(name)
+        unknown = set(experiment) - {'name', 'dataset', 'strategy', 'analysis', 'params', 'grid'}
+        if unknown:
+            raise ValueError(f"experiment '{name}': unknown keys {', '.join(sorted(unknown))}")
+        if experiment.get('dataset') not in datasets:
+            raise ValueError(f"experiment '{name}': unknown dataset {experiment.get('dataset')!r}")
+        if experiment.get('strategy') not in STRATEGIES:
+            raise ValueError(f"experiment '{name}': strategy must be one of {', '.join(STRATEGIES)}")
+        if experiment.get('analysis', 'performance') not in ANALYSES:
+            raise ValueError(f"experiment '{name}': analysis must be one of {', '.join(ANALYSES)}")
+        if STRATEGIES[experiment['strategy']][1] and 'vix' not in datasets[experiment['dataset']]:
+            raise ValueError(f"experiment '{name}': strategy '{experiment['strategy']}' needs a dataset with 'vix'")
+        for key, values in experiment.get('grid', {}).items():
+            if not isinstance(values, list) or not values:
+                raise ValueError(f"experiment '{name}': grid '{key}' must be a non-empty list")
+    return spec
+
+def expand_experiment(experiment):
+    """
+    One parameter dict per grid point (the cartesian product of `grid`, on top of
+    the fixed `params`), each split into complete strategy and analysis parameters
+    with the defaults filled in, so equal settings always produce equal keys.
+    Returns [(point, strategy_params, analysis_params)].
+    """
+    strategy_defaults = STRATEGIES[experiment['strategy']][2]
+    analysis_defaults = ANALYSES[experiment.get('analysis', 'performance')][1]
+    grid = experiment.get('grid', {})
+    points = []
+    for values in itertools.product(*grid.values()):
+        point = dict(experiment.get('params', {}), **dict(zip(grid, values)))
+        unknown = set(point) - set(strategy_defaults) - set(analysis_defaults)
+        if unknown:
+            raise ValueError(f"experiment '{experiment['name']}': unknown parameters {', '.join(sorted(unknown))}")
+        strategy_params = {key: point.get(key, default) for key, default in strategy_defaults.items()}
+        analysis_params = {key: point.get(key, default) for key, default in analysis_defaults.items()}
+        points.append(({key: point[key] for key in grid}, strategy_params, analysis_params))
+    return points
+
+def dataset_key(dataset):
+    """
+    Hash of a dataset's settings and the contents of the files it reads.
+    """
+    files = [f"{path}:{file_digest(path)}" for path in (dataset['returns'], dataset.get('vix')) if path]
+    return _digest(_canonical(dataset), *files, code_fingerprint(calculate_signals))
+
+def plan(spec):
+    """
+    Expands every experiment into tasks and de-duplicates them: a task is one
+    (dataset, strategy, strategy parameters, analysis, analysis parameters)
+    evaluation, keyed by a hash of its inputs and code. Returns (tasks,
+    memberships), where tasks maps key -> task and memberships lists
+    (experiment, key, grid point) rows.
+    """
+    dataset_keys = {name: dataset_key(dataset) for name, dataset in spec['datasets'].items()}
+    tasks, memberships = {}, []
+    for experiment in spec.get('experiments', []):
+        strategy, analysis = experiment['strategy'], experiment.get('analysis', 'performance')
+        code = code_fingerprint(STRATEGIES[strategy][0]) + code_fingerprint(ANALYSES[analysis][0])
+        for point, strategy_params, analysis_params in expand_experiment(experiment):
+            key = _digest(dataset_keys[experiment['dataset']], strategy, _canonical(strategy_params),
+                          analysis, _canonical(analysis_params), code)
+            tasks.setdefault(key, {
+                'dataset': experiment['dataset'], 'strategy': strategy, 'strategy_params': strategy_params,
+                'analysis': analysis, 'analysis_params': analysis_params,
+            })
+            memberships.append((experiment['name'], key, point))
+    return tasks, memberships
+
+# --- Store ---
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY, dataset TEXT, strategy TEXT, strategy_params TEXT,
+    analysis TEXT, analysis_params TEXT, seconds REAL, created TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    key TEXT, series TEXT, metric TEXT, value REAL, PRIMARY KEY (key, series, metric)
+);
+CREATE TABLE IF NOT EXISTS experiments (
+    experiment TEXT, key TEXT, point TEXT, PRIMARY KEY (experiment, key)
+);
+"""
+
+def open_store(path):
+    """
+    Opens (creating if needed) the SQLite result store.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.executescript(_SCHEMA)
+    return connection
+
+def stored_keys(connection, keys):
+    """
+    The subset of `keys` that already has results in the store.
+    """
+    found = set()
+    keys = list(keys)
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        rows = connection.execute(f"SELECT key FROM results WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+        found.update(key for key, in rows)
+    return found
+
+def save_result(connection, key, task, rows, seconds):
+    with connection:
+        connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (
+            key, task['dataset'], task['strategy'], _canonical(task['strategy_params']),
+            task['analysis'], _canonical(task['analysis_params']), seconds, datetime.now().isoformat(timespec='seconds')))
+        connection.execute("DELETE FROM metrics WHERE key = ?", (key,))
+        connection.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?)", [(key, *row) for row in rows])
+
+def save_memberships(connection, memberships):
+    """
+    Replaces the grid points recorded for every experiment in `memberships`.
+    """
+    with connection:
+        for experiment in {row[0] for row in memberships}:
+            connection.execute("DELETE FROM experiments WHERE experiment = ?", (experiment,))
+        connection.executemany("INSERT OR REPLACE INTO experiments VALUES (?, ?, ?)",
+                               [(experiment, key, _canonical(point)) for experiment, key, point in memberships])
+
+def experiment_table(connection, experiment, series='Strategy'):
+    """
+    One row per grid point of `experiment`: its grid parameters followed by the
+    stored metrics of `series`.
+    """
+    frame = pd.read_sql_query(
+        "SELECT e.point, m.metric, m.value FROM experiments e JOIN metrics m ON m.key = e.key "
+        "WHERE e.experiment = ? AND m.series = ? ORDER BY e.rowid, m.rowid", connection, params=(experiment, series))
+    if frame.empty:
+        return frame
+    table = frame.pivot_table(index='point', columns='metric', values='value', sort=False)
+    metrics = list(dict.fromkeys(frame['metric']))
+    points = pd.DataFrame([json.loads(point) for point in table.index], index=table.index)
+    return pd.concat([points, table[metrics]], axis=1).reset_index(drop=True)
+
+# --- Execution ---
+# Workers receive the prepared datasets once, at start-up, and keep them for their lifetime.
+
+_worker_datasets = None
+
+def _init_worker(datasets, trace_config=None):
+    global _worker_datasets
+    _worker_datasets = datasets
+    if trace_config is not None:
+        instrument.enable(**trace_config)
+
+def run_strategy_tasks(dataset, strategy, strategy_params, analyses):
+    """
+    Runs one strategy once and every analysis that needs it. `analyses` is a list
+    of (key, analysis, analysis_params); returns [(key, rows, seconds)].
+    """
+    start = time.perf_counter()
+    data = _worker_datasets[dataset]
+    runner = STRATEGIES[strategy][0]
+    with instrument.stage(f"{strategy} run", category='task', dataset=dataset):
+        result = runner(data, **strategy_params)
+    shared = (time.perf_counter() - start) / len(analyses)
+
+    output = []
+    for key, analysis, analysis_params in analyses:
+        start = time.perf_counter()
+        with instrument.stage(analysis, category='task', dataset=dataset, strategy=strategy):
+            rows = ANALYSES[analysis][0](result, data, runner, strategy_params, **analysis_params)
+        output.append((key, rows, shared + time.perf_counter() - start))
+    return output
+
+def _run_job(dataset, strategy, strategy_params, analyses):
+    # Worker entry point: the outputs plus the spans recorded for them
+    return run_strategy_tasks(dataset, strategy, strategy_params, analyses), instrument.drain()
+
+def prepare_dataset(dataset):
+    """
+    Loads returns (and VIX, if given) and computes the signals.
+    """
+    data = load_data(dataset['returns'], start_date=dataset.get('start') and str(dataset['start']),
+                     end_date=dataset.get('end') and str(dataset['end']))
+    if data is None:
+        raise ValueError(f"could not load {dataset['returns']}")
+    data = calculate_signals(data)
+    if dataset.get('vix'):
+        vix_data = pd.read_csv(dataset['vix'], index_col='Date', parse_dates=True)
+        data = data.join(vix_data.rename(columns={'VIXSIM': 'VIX'}), how='inner')
+    return data
+
+def run_spec(spec, store_path=None, max_workers=None, force=False):
+    """
+    Runs every task of the spec that is not in the store yet (all of them with
+    `force`). Each dataset's signals are computed once; tasks that share a
+    strategy run share it, and strategy runs are spread over a process pool.
+    Returns (connection, summary).
+    """
+    store_path = store_path or spec.get('store', {}).get('path', DEFAULT_STORE)
+    connection = open_store(store_path)
+    tasks, memberships = plan(spec)
+    done = set() if force else stored_keys(connection, tasks)
+    pending = {key: task for key, task in tasks.items() if key not in done}
+
+    groups = {}
+    for key, task in pending.items():
+        group = (task['dataset'], task['strategy'], _canonical(task['strategy_params']))
+        groups.setdefault(group, []).append((key, task['analysis'], task['analysis_params']))
+
+    start = time.perf_counter()
+    used = sorted({dataset for dataset, _, _ in groups})
+    datasets = {name: prepare_dataset(spec['datasets'][name]) for name in used}
+    jobs = [(dataset, strategy, json.loads(params), analyses) for (dataset, strategy, params), analyses in groups.items()]
+
+    if jobs:
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker,
+                                     initargs=(datasets, instrument.worker_config())) as pool:
+                for output, spans in pool.map(_run_job, *zip(*jobs)):
+                    instrument.merge(spans)
+                    for key, rows, seconds in output:
+                        save_result(connection, key, pending[key], rows, seconds)
+        else:
+            _init_worker(datasets)
+            for job in jobs:
+                for key, rows, seconds in run_strategy_tasks(*job):
+                    save_result(connection, key, pending[key], rows, seconds)
+    save_memberships(connection, memberships)
+
+    summary = {
+        'grid points': len(memberships), 'unique tasks': len(tasks), 'from store': len(tasks) - len(pending),
+        'computed': len(pending), 'strategy runs': len(jobs), 'datasets loaded': len(datasets),
+        'seconds': time.perf_counter() - start,
+    }
+    return connection, summary
+
+def main(spec_path=DEFAULT_SPEC, store_path=None, max_workers=None, force=False):
+    """
+    Main function to run an experiment spec and print every experiment's results.
+    """
+    spec = load_spec(spec_path)
+    connection, summary = run_spec(spec, store_path, max_workers, force)
+    print(f"--- {spec_path}: {summary['grid points']} grid points, {summary['unique tasks']} unique tasks ---")
+    print(f"{summary['from store']} from the store, {summary['computed']} computed in {summary['strategy runs']} strategy runs "
+          f"on {summary['datasets loaded']} dataset(s), {summary['seconds']:.2f}s")
+
+    for experiment in spec.get('experiments', []):
+        print(f"\n--- {experiment['name']} ({experiment['strategy']}, {experiment.get('analysis', 'performance')}) ---")
+        table = experiment_table(connection, experiment['name'])
+        if table.empty:
+            print("No results.")
+        else:
+            # A single grid point reads better as one column
+            print((table.T if len(table) == 1 else table).round(4).to_string())
+    connection.close()
+
+if __name__ == '__main__':
+    # Task keys include code fingerprints, which name functions by module: run through
+    # the package module so they match `python -m src experiments`
+    from src.analysis import experiments
+    arguments = [argument for argument in sys.argv[1:] if argument != '--force']
+    experiments.main(*arguments[:1], force='--force' in sys.argv)
@@ -0,0 +1,80 @@
+import time
+import pandas as pd
+import numpy as np
+from src.core.backtest import load_data, calculate_signals
+from src.core.flows import DEFAULT_POPULATION, make_population, random_population, simulate_rebalancer_flows, add_flow_signals
+from src.core.metrics import performance_table
+from src.core.result import make_result, lagged
+from src.analysis.retail_investor import run_retail_strategy_arrays
+
+def run_flow_strategy_arrays(df, signal_column='flow_signal'):
+    """
+    Trades the SPY-TLT spread on a flow signal column, like run_retail_strategy_arrays
+    does on the calendar signal. Returns a BacktestResult.
+    """
+    weight = df[signal_column].to_numpy(dtype=np.float64)
+    spy_return = df['SPY_return'].to_numpy(dtype=np.float64)
+    tlt_return = df['TLT_return'].to_numpy(dtype=np.float64)
+
+    returns = lagged(weight) * (spy_return - tlt_return)
+
+    return make_result(df.index, weight, returns, spy_return, tlt_return)
+
+def main():
+    """
+    Main function to evaluate the institutional rebalancer flow signals.
+    """
+    base_data = load_data('data/Return.csv')
+    if base_data is None:
+        return
+
+    data = calculate_signals(base_data)
+    data = add_flow_signals(data, make_population(), horizon=5)
+    print("--- Institutional Rebalancer Flow Signals ---")
+    print(make_population().to_string())
+
+    flow = run_flow_strategy_arrays(data)
+    calendar = run_retail_strategy_arrays(data)
+    returns = pd.DataFrame({
+        'Flow Signal': pd.Series(flow.returns, index=flow.index),
+        'Calendar-Only': pd.Series(calendar.returns, index=calendar.index),
+        'S&P 500 (SPY)': data['SPY_return'],
+    }).dropna()
+
+    for label, start in [('Full History', None), ('Since 1997-09-10', '1997-09-10')]:
+        window = returns.loc[start:]
+        print(f"\n--- Performance ({label}) ---")
+        print(performance_table(window, names=window.columns).round(4).to_string())
+
+    active = data['flow_signal'] != 0
+    print(f"\nFlow signal is non-zero on {active.mean():.2%} of days; "
+          f"correlation with the calendar signal on those days: "
+          f"{data.loc[active, 'flow_signal'].corr(data.loc[active, 'modified_calendar_signal']):.2f}")
+
+    # --- Next-day spread by owed-flow quintile ---
+    next_spread = (data['SPY_return'] - data['TLT_return']).shift(-1)
+    imbalance = data.loc[active, 'flow_imbalance']
+    quintile = pd.qcut(imbalance, 5, labels=['Q1 (sell SPY)', 'Q2', 'Q3', 'Q4', 'Q5 (buy SPY)'])
+    by_quintile = next_spread[active].groupby(quintile, observed=True).agg(['mean', 'count'])
+    print("\n--- Next-Day SPY-TLT Spread by Owed-Flow Quintile ---")
+    for name, row in by_quintile.iterrows():
+        print(f"{name:<15} {row['mean'] * 1e4:>8.2f} bps  ({int(row['count'])} days)")
+
+    # --- Each archetype on its own ---
+    print("\n--- Sharpe Ratio of Each Rebalancer Archetype Alone ---")
+    for row in DEFAULT_POPULATION:
+        single = add_flow_signals(data[['SPY_return', 'TLT_return']].copy(), make_population([row]))
+        result = run_flow_strategy_arrays(single)
+        sharpe = result.statistics().loc['Strategy', 'Sharpe Ratio']
+        print(f"{row[0]} fiscal={row[1]:>2} target={row[2]:.2f} band={row[3]:.2f}: {sharpe:>6.2f}")
+
+    # --- Population size barely changes the cost ---
+    print("\n--- Simulation Time by Population Size ---")
+    for size in [1, 100, 1000, 5000]:
+        population = random_population(size)
+        start = time.perf_counter()
+        simulate_rebalancer_flows(data, population)
+        print(f"{size:>6} rebalancers: {time.perf_counter() - start:.2f}s")
+
+if __name__ == '__main__':
+    main()
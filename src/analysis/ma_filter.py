@@ -1,6 +1,10 @@
 
 import pandas as pd
 import numpy as np
+from src.core.result import make_result, lagged, return_legs
+from src.core.instrument import instrumented
+
+@instrumented()
 def run_ma_filtered_strategy(df, ma_window=200, buffer=0.02):
     """
     Runs a strategy that is active only when the SPY price is below its moving average, with a buffer.
@@ -46,4 +50,44 @@ def run_ma_filtered_strategy(df, ma_window=200, buffer=0.02):
     df['cumulative_strategy_return'] = (1 + df['strategy_return']).cumprod()
     df['cumulative_spy_return'] = (1 + df['SPY_return']).cumprod()
     
-    return df
\ No newline at end of file
+    return df
+
+def ma_hedge_state(price, ma_window=200, buffer=0.02):
+    """
+    Hedge state of the MA filter for a price array, with the buffer zone keeping
+    the previous state (unhedged before the first crossing). Returns the boolean
+    state and the moving average.
+    """
+    spy_ma = pd.Series(price).rolling(window=ma_window).mean().to_numpy()
+
+    # 1 activates the hedge, 0 deactivates it, NaN keeps the previous state
+    signal = np.full(len(price), np.nan)
+    signal[price > spy_ma * (1 + buffer)] = 0.0
+    signal[price < spy_ma * (1 - buffer)] = 1.0
+    last_set = np.maximum.accumulate(np.where(np.isnan(signal), -1, np.arange(len(signal))))
+    hedge_active = np.where(last_set >= 0, signal[np.maximum(last_set, 0)], 0.0) == 1.0
+    return hedge_active, spy_ma
+
+@instrumented()
+def run_ma_filtered_strategy_arrays(df, ma_window=200, buffer=0.02):
+    """
+    Copy-free version of run_ma_filtered_strategy.
+    Leaves df untouched and returns a BacktestResult.
+    """
+    price = df['SPYSIM'].to_numpy(dtype=np.float64)
+    hedge_weight = df['modified_calendar_signal'].to_numpy(dtype=np.float64)
+    spy_return = df['SPY_return'].to_numpy(dtype=np.float64)
+    tlt_return = df['TLT_return'].to_numpy(dtype=np.float64)
+
+    hedge_active, spy_ma = ma_hedge_state(price, ma_window, buffer)
+
+    hedge_return = lagged(hedge_weight) * (spy_return - tlt_return)
+    was_active = np.empty(len(hedge_active), dtype=bool)
+    was_active[0] = True
+    was_active[1:] = hedge_active[:-1]
+
+    returns = np.where(was_active, hedge_return, spy_return)
+    weight = np.where(hedge_active, hedge_weight, 1.0)
+
+    legs = return_legs(spy_return - tlt_return, None, hedge_weight, was_active, spy_return)
+    return make_result(df.index, weight, returns, spy_return, tlt_return, hedge_active, inputs=(spy_ma, hedge_weight), legs=legs)
@@ -1,9 +1,10 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from src.core.backtest import load_data, calculate_signals
+from src.core.instrument import instrumented
 from src.analysis.retail_investor import run_retail_strategy
 
+@instrumented()
 def run_monte_carlo_simulation(returns, num_simulations=1000, horizons=[1, 3, 5, 10, 20]):
     """
     Runs a Monte Carlo simulation on a given series of returns.
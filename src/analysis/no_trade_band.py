@@ -0,0 +1,111 @@
+import pandas as pd
+import numpy as np
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.core.costs import leg_weights, leg_turnover, compute_leg_costs, linear_cost_scenarios
+from src.core.execution import apply_no_trade_band
+from src.core.metrics import performance_table
+from src.analysis.retail_investor import run_retail_strategy_arrays
+
+def evaluate_band_grid(result, bands, speeds, scenarios):
+    """
+    Runs the no-trade band over a grid of band widths and adjustment speeds for a
+    spread strategy and nets every configuration against every cost scenario.
+    Returns one row per (band, speed, scenario) with turnover and net statistics.
+    """
+    held = apply_no_trade_band(result.weight, bands, speeds)
+    held = held.reshape(len(held), -1)                                 # days x configs
+
+    spread = result.spy_return - result.tlt_return
+    gross_returns = np.vstack([np.full((1, held.shape[1]), np.nan), held[:-1]]) * spread[:, None]
+
+    spy_weight, tlt_weight = leg_weights(held)
+    spy_costs, tlt_costs = compute_leg_costs(
+        spy_weight, tlt_weight, scenarios,
+        spy_return=result.spy_return, tlt_return=result.tlt_return
+    )                                                                  # days x configs x scenarios
+    net_returns = gross_returns[:, :, None] - spy_costs - tlt_costs
+
+    configs = pd.MultiIndex.from_product([bands, speeds], names=['band', 'speed'])
+    names = [s.get('name', f"scenario {i}") for i, s in enumerate(scenarios)]
+    index = pd.MultiIndex.from_tuples(
+        [config + (name,) for config in configs for name in names],
+        names=['band', 'speed', 'scenario']
+    )
+
+    stats = performance_table(net_returns[1:].reshape(len(held) - 1, -1), names=index)
+    stats['Annual Turnover'] = np.repeat(leg_turnover(held).mean(axis=0) * 252, len(scenarios))
+    return stats
+
+def turnover_frontier(stats):
+    """
+    Marks the configurations on the turnover vs. net Sharpe frontier of each cost
+    scenario: no other configuration has both lower turnover and a higher Sharpe.
+    """
+    stats = stats.copy()
+    stats['Frontier'] = False
+    for _, group in stats.groupby(level='scenario', sort=False):
+        ordered = group.sort_values(['Annual Turnover', 'Sharpe Ratio'], ascending=[True, False])
+        best_sharpe = np.maximum.accumulate(ordered['Sharpe Ratio'].to_numpy())
+        on_frontier = ordered['Sharpe Ratio'].to_numpy() >= best_sharpe
+        stats.loc[ordered.index[on_frontier], 'Frontier'] = True
+    return stats
+
+def plot_turnover_frontier(stats, title, filename):
+    """
+    Scatter of annual turnover against net Sharpe per cost scenario, with the frontier highlighted.
+    """
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(12, 8))
+    for name, group in stats.groupby(level='scenario', sort=False):
+        line = plt.scatter(group['Annual Turnover'], group['Sharpe Ratio'], alpha=0.4, label=name)
+        frontier = group[group['Frontier']].sort_values('Annual Turnover')
+        plt.plot(frontier['Annual Turnover'], frontier['Sharpe Ratio'], color=line.get_facecolor()[0], linewidth=2)
+
+    plt.title(title)
+    plt.xlabel('Annual Turnover')
+    plt.ylabel('Net Sharpe Ratio')
+    plt.legend(title='Costs (per leg)')
+    plt.grid(True, which='both', linestyle='--', linewidth=0.5)
+    plt.tight_layout()
+    plt.savefig(filename)
+    plt.close()
+    print(f"Turnover frontier plot saved to {filename}")
+
+def main():
+    """
+    Main function to run the no-trade band analysis.
+    """
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    if base_data is None:
+        return
+
+    data_with_signals = calculate_signals(base_data)
+
+    bands = [0.0, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75]
+    speeds = [0.25, 0.5, 1.0]
+    scenarios = linear_cost_scenarios([0, 1, 2, 5])
+
+    strategies = {
+        'Original Dual-Signal Strategy': (run_strategy_arrays(data_with_signals), 'dual_signal'),
+        'Retail-Adapted (Calendar-Only)': (run_retail_strategy_arrays(data_with_signals), 'calendar_only'),
+    }
+
+    print("--- Running No-Trade Band Analysis ---")
+    for name, (result, suffix) in strategies.items():
+        stats = turnover_frontier(evaluate_band_grid(result, bands, speeds, scenarios))
+
+        print(f"\n--- {name}: Frontier Configurations ---")
+        frontier = stats[stats['Frontier']]
+        print(f"{'Scenario':<8} {'Band':>6} {'Speed':>6} {'Turnover':>9} {'CAGR':>8} {'Sharpe':>7}")
+        print("-" * 49)
+        for (band, speed, scenario), row in frontier.iterrows():
+            print(f"{scenario:<8} {band:>6.2f} {speed:>6.2f} {row['Annual Turnover']:>9.2f} {row['CAGR']:>8.2%} {row['Sharpe Ratio']:>7.2f}")
+
+        plot_turnover_frontier(
+            stats,
+            f'Turnover vs. Net Sharpe with No-Trade Bands: {name}',
+            f'plots/other/plot_no_trade_band_{suffix}.png'
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+import pandas as pd
+from src.core.backtest import load_data, calculate_signals
+from src.core.metrics import performance_table
+from src.core.overlay import sleeve_returns, weight_grid, evaluate_mixes, efficient_frontier, best_mixes, rolling_reoptimization
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
+
+def plot_overlay_frontier(stats, highlights, title, filename):
+    """
+    Scatter of every mix in volatility/CAGR space, colored by overlay scale,
+    with the efficient frontier and the highlighted mixes marked.
+    """
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(12, 8))
+    points = plt.scatter(stats['Volatility'], stats['CAGR'], c=stats['Overlay'], cmap='viridis', s=8, alpha=0.6)
+    plt.colorbar(points, label='Overlay Scale')
+    frontier = stats[stats['Frontier']].sort_values('Volatility')
+    plt.plot(frontier['Volatility'], frontier['CAGR'], color='black', linewidth=2, label='Efficient Frontier')
+    for name, (vol, cagr) in highlights.items():
+        plt.scatter([vol], [cagr], marker='*', s=250, label=name, zorder=3)
+
+    plt.title(title)
+    plt.xlabel('Volatility')
+    plt.ylabel('CAGR')
+    plt.legend()
+    plt.grid(True, which='both', linestyle='--', linewidth=0.5)
+    plt.tight_layout()
+    plt.savefig(filename)
+    plt.close()
+    print(f"Overlay frontier plot saved to {filename}")
+
+def main():
+    """
+    Main function to optimize a SPY/TLT core with the calendar strategy as an overlay.
+    """
+    try:
+        vix_data = pd.read_csv('data/vix.csv', index_col='Date', parse_dates=True)
+        vix_data = vix_data.rename(columns={'VIXSIM': 'VIX'})
+    except FileNotFoundError:
+        print("Error: The file at vix.csv was not found.")
+        return
+
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    if base_data is None:
+        return
+
+    data_with_signals = calculate_signals(base_data)
+    data_with_vix = data_with_signals.join(vix_data, how='inner')
+
+    overlay = run_retail_strategy_arrays(data_with_vix)
+    hedged = run_vix_filtered_strategy_arrays(data_with_vix, vix_threshold=20)
+    sleeves = sleeve_returns(
+        data_with_vix['SPY_return'], data_with_vix['TLT_return'], pd.Series(overlay.returns, index=overlay.index)
+    )
+
+    weights = weight_grid(core_step=0.05, overlay_max=2.0, overlay_step=0.05)
+    print(f"--- Evaluating {len(weights)} SPY/TLT/Overlay Mixes ---")
+    stats = efficient_frontier(evaluate_mixes(sleeves, weights))
+
+    core_60_40 = stats[(stats['SPY'] == 0.6) & (stats['Overlay'] == 0)].iloc[0]
+    best = best_mixes(stats, min_cagr=core_60_40['CAGR'])
+    hedged_stats = performance_table(
+        pd.Series(hedged.returns, index=hedged.index).reindex(sleeves.index).fillna(0.0).to_numpy(),
+        names=['Hedged Equity (VIX > 20)']
+    ).iloc[0]
+
+    print(f"\n{'Mix':<30} {'SPY':>5} {'TLT':>5} {'Overlay':>8} {'CAGR':>8} {'Vol':>8} {'Sharpe':>7} {'Max DD':>8}")
+    print("-" * 86)
+    rows = [('60/40 Core', core_60_40), ('Max Sharpe', best.loc['Max Sharpe']),
+            ('Min Drawdown (CAGR >= 60/40)', best.loc['Min Drawdown'])]
+    for name, row in rows:
+        print(f"{name:<30} {row['SPY']:>5.2f} {row['TLT']:>5.2f} {row['Overlay']:>8.2f} {row['CAGR']:>8.2%} "
+              f"{row['Volatility']:>8.2%} {row['Sharpe Ratio']:>7.2f} {row['Max Drawdown']:>8.2%}")
+    print(f"{'Hedged Equity (VIX > 20)':<30} {'':>5} {'':>5} {'':>8} {hedged_stats['CAGR']:>8.2%} "
+          f"{hedged_stats['Volatility']:>8.2%} {hedged_stats['Sharpe Ratio']:>7.2f} {hedged_stats['Max Drawdown']:>8.2%}")
+
+    print("\n--- Efficient Frontier (every 5th point) ---")
+    frontier = stats[stats['Frontier']].sort_values('Volatility')
+    print(frontier.iloc[::5][['SPY', 'TLT', 'Overlay', 'CAGR', 'Volatility', 'Sharpe Ratio']].round(3).to_string(index=False))
+
+    # --- Out-of-sample: re-optimize yearly on the trailing five years ---
+    # Maximizing 'Max Drawdown' picks the shallowest (least negative) drawdown
+    for objective in ['Sharpe Ratio', 'Max Drawdown']:
+        allocations, oos = rolling_reoptimization(sleeves, weights, lookback_years=5, hold_months=12, objective=objective)
+        static = sleeves.loc[oos.index]
+        comparison = pd.DataFrame({
+            f'Rolling Best {objective}': oos,
+            '60/40 Core': 0.6 * static['SPY'] + 0.4 * static['TLT'],
+            'Hedged Equity (VIX > 20)': pd.Series(hedged.returns, index=hedged.index).reindex(oos.index).fillna(0.0),
+        })
+        print(f"\n--- Out-of-Sample Rolling Re-Optimization (best {objective}, 5y lookback, yearly) ---")
+        print(allocations[['SPY', 'TLT', 'Overlay']].to_string())
+        print(performance_table(comparison, names=comparison.columns).round(4).to_string())
+
+    plot_overlay_frontier(
+        stats,
+        {
+            '60/40 Core': (core_60_40['Volatility'], core_60_40['CAGR']),
+            'Max Sharpe': (best.loc['Max Sharpe', 'Volatility'], best.loc['Max Sharpe', 'CAGR']),
+            'Hedged Equity': (hedged_stats['Volatility'], hedged_stats['CAGR']),
+        },
+        'SPY/TLT Core with Calendar-Strategy Overlay',
+        'plots/other/plot_overlay_frontier.png'
+    )
+
+if __name__ == '__main__':
+    main()
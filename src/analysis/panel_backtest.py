@@ -0,0 +1,206 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import time
+import itertools
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.core import instrument
+from src.core.panel import PanelResult, month_structure, pair_signals, pair_strategy
+
+# --- Data ---
+
+def load_panel(filepath, start_date=None, end_date=None):
+    """
+    Loads a wide price CSV (Date plus one column per asset, like data/Return.csv
+    with more columns). Gaps inside an asset's history are forward-filled; days
+    before it lists and after it delists stay NaN.
+    """
+    try:
+        prices = pd.read_csv(filepath, index_col='Date', parse_dates=True).sort_index()
+    except FileNotFoundError:
+        print(f"Error: The file at {filepath} was not found.")
+        return None
+    prices = prices.dropna(axis=1, how='all').ffill(limit_area='inside')
+    if start_date:
+        prices = prices.loc[start_date:]
+    if end_date:
+        prices = prices.loc[:end_date]
+    return prices
+
+def panel_returns(prices, start_date=None, end_date=None):
+    """
+    Daily returns of every asset, first row dropped, then filtered by date (as
+    load_data does for the SPY/TLT pair).
+    """
+    returns = prices.pct_change(fill_method=None).iloc[1:]
+    if start_date:
+        returns = returns.loc[start_date:]
+    if end_date:
+        returns = returns.loc[:end_date]
+    return returns
+
+def form_pairs(assets, equities=None, bonds=None, pairs=None):
+    """
+    (equity, bond) pairs to backtest: the explicit `pairs` ("EQ/BD" strings or
+    tuples), or every equity against every bond.
+    """
+    if pairs:
+        pairs = [tuple(pair.split('/')) if isinstance(pair, str) else tuple(pair) for pair in pairs]
+    elif equities and bonds:
+        pairs = list(itertools.product(equities, bonds))
+    else:
+        raise ValueError("Give either pairs or both equities and bonds")
+    known = set(assets)
+    for pair in pairs:
+        if len(pair) != 2:
+            raise ValueError(f"Pair {pair!r} is not of the form EQUITY/BOND")
+        unknown = [asset for asset in pair if asset not in known]
+        if unknown:
+            raise ValueError(f"Unknown asset {', '.join(unknown)} in pair {'/'.join(pair)}")
+    return pairs
+
+# --- Execution ---
+
+def backtest_columns(asset_returns, layout, equity_columns, bond_columns, threshold_weight=0.6, calendar_weight=0.4):
+    """
+    Signals and strategy weight/returns for the pairs given by column positions
+    into the (days x assets) `asset_returns`.
+    """
+    equity_return = asset_returns[:, equity_columns]
+    bond_return = asset_returns[:, bond_columns]
+    threshold, calendar = pair_signals(equity_return, bond_return, layout)
+    return pair_strategy(threshold, calendar, equity_return, bond_return, threshold_weight, calendar_weight)
+
+_shared = {}
+
+def _shared_array(shape):
+    block = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    return block, np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+def _init_worker(input_name, input_shape, output_name, output_shape, layout, trace_config=None):
+    # Attach to the parent's blocks once per worker; the parent owns and unlinks them
+    for key, name, shape in (('input', input_name, input_shape), ('output', output_name, output_shape)):
+        block = shared_memory.SharedMemory(name=name)
+        _shared[key] = (block, np.ndarray(shape, dtype=np.float64, buffer=block.buf))
+    _shared['layout'] = layout
+    if trace_config is not None:
+        instrument.enable(**trace_config)
+
+def _run_shard(start, stop, equity_columns, bond_columns, threshold_weight, calendar_weight):
+    """
+    Backtests pairs start:stop in a worker, writing weight and returns straight
+    into the shared output block.
+    """
+    asset_returns, output = _shared['input'][1], _shared['output'][1]
+    with instrument.stage('panel_shard', pairs=stop - start, rows=len(asset_returns)):
+        weight, returns = backtest_columns(asset_returns, _shared['layout'], equity_columns, bond_columns,
+                                           threshold_weight, calendar_weight)
+        output[0, :, start:stop] = weight
+        output[1, :, start:stop] = returns
+    return instrument.drain()
+
+def _shards(num_pairs, shard_size):
+    return [(start, min(start + shard_size, num_pairs)) for start in range(0, num_pairs, shard_size)]
+
+@instrument.instrumented()
+def run_panel(prices, pairs, start_date=None, end_date=None, threshold_weight=0.6, calendar_weight=0.4,
+              max_workers=None, shard_size=None):
+    """
+    Backtests the dual-signal strategy on every (equity, bond) pair of the price
+    panel. Pairs are processed in shards of `shard_size`, in a process pool
+    sharing the returns and results through shared memory when there are
+    several workers and more than one shard. Returns a PanelResult.
+    """
+    returns = panel_returns(prices, start_date, end_date)
+    position = {asset: i for i, asset in enumerate(returns.columns)}
+    equity_columns = np.array([position[equity] for equity, _ in pairs], dtype=np.intp)
+    bond_columns = np.array([position[bond] for _, bond in pairs], dtype=np.intp)
+    asset_returns = returns.to_numpy(dtype=np.float64)
+    layout = month_structure(returns.index)
+
+    workers = max_workers or os.cpu_count() or 1
+    shard_size = shard_size or max(16, -(-len(pairs) // (2 * workers)))
+    shards = _shards(len(pairs), shard_size)
+
+    if workers <= 1 or len(shards) <= 1:
+        weight = np.empty((len(returns), len(pairs)))
+        strategy_returns = np.empty_like(weight)
+        for start, stop in shards:
+            with instrument.stage('panel_shard', pairs=stop - start, rows=len(returns)):
+                weight[:, start:stop], strategy_returns[:, start:stop] = backtest_columns(
+                    asset_returns, layout, equity_columns[start:stop], bond_columns[start:stop],
+                    threshold_weight, calendar_weight)
+    else:
+        input_block, shared_input = _shared_array(asset_returns.shape)
+        output_block, shared_output = _shared_array((2, len(returns), len(pairs)))
+        try:
+            shared_input[:] = asset_returns
+            initargs = (input_block.name, asset_returns.shape, output_block.name, shared_output.shape,
+                        layout, instrument.worker_config())
+            with ProcessPoolExecutor(max_workers=min(workers, len(shards)), initializer=_init_worker,
+                                     initargs=initargs) as pool:
+                futures = [pool.submit(_run_shard, start, stop, equity_columns[start:stop], bond_columns[start:stop],
+                                       threshold_weight, calendar_weight) for start, stop in shards]
+                for future in futures:
+                    instrument.merge(future.result())
+            weight, strategy_returns = shared_output.copy()
+        finally:
+            # The views must go before the blocks can be closed
+            del shared_input, shared_output
+            for block in (input_block, output_block):
+                block.close()
+                block.unlink()
+
+    return PanelResult(returns.index, pairs, weight, strategy_returns,
+                       asset_returns[:, equity_columns], asset_returns[:, bond_columns])
+
+# --- Reporting ---
+
+def print_panel_report(result, top=10):
+    """
+    Distribution of the per-pair statistics and the best and worst pairs by Sharpe ratio.
+    """
+    stats = result.statistics()
+    print(f"\n--- Panel Backtest: {len(result)} pair(s), {result.index[0]:%Y-%m-%d} to {result.index[-1]:%Y-%m-%d} ---")
+    if len(stats) > 1:
+        print(stats.drop(columns='Days').describe().loc[['mean', 'std', 'min', '50%', 'max']].round(4).to_string())
+    ranked = stats.sort_values('Sharpe Ratio', ascending=False)
+    print(f"\nTop {min(top, len(ranked))} pairs by Sharpe ratio:")
+    print(ranked.head(top).round(4).to_string())
+    if len(ranked) > top:
+        print(f"\nBottom {min(top, len(ranked) - top)} pairs by Sharpe ratio:")
+        print(ranked.tail(min(top, len(ranked) - top)).round(4).to_string())
+    return stats
+
+def main(filepath=None, equities=None, bonds=None, pairs=None, start_date=None, end_date=None,
+         max_workers=None, shard_size=None, synthetic=None, top=10):
+    """
+    Main function to run the panel backtest. Without a file or synthetic universe
+    it runs the SPY/TLT pair of data/Return.csv.
+    """
+    if synthetic:
+        from src.benchmarks.synthetic import synthetic_universe
+        prices = synthetic_universe(*synthetic)
+        equities = equities or [c for c in prices.columns if c.startswith('EQ')]
+        bonds = bonds or [c for c in prices.columns if c.startswith('BD')]
+    else:
+        if filepath is None:
+            filepath, start_date = 'data/Return.csv', start_date or '1997-09-10'
+            equities, bonds = equities or ['SPYSIM'], bonds or ['TLTSIM']
+        prices = load_panel(filepath)
+        if prices is None:
+            return None
+
+    pairs = form_pairs(prices.columns, equities, bonds, pairs)
+    start = time.perf_counter()
+    result = run_panel(prices, pairs, start_date, end_date, max_workers=max_workers, shard_size=shard_size)
+    elapsed = time.perf_counter() - start
+    stats = print_panel_report(result, top)
+    print(f"\n{len(pairs)} pair(s) x {len(result.index):,} days in {elapsed:.2f}s")
+    return stats
+
+if __name__ == '__main__':
+    main()
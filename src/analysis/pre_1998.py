@@ -1,23 +1,24 @@
-import pandas as pd
-import numpy as np
 from src.core.backtest import load_data, calculate_signals
-from src.analysis.retail_investor import run_retail_strategy, calculate_retail_statistics
+from src.analysis.crisis_periods import build_period_engine, print_period_table
+
+PRE_1998 = {"Pre-1998": (None, "1997-09-09")}
 
 def main():
     """
-    Main function to analyze the pre-1998 performance.
+    Main function to analyze the pre-1998 performance. The strategies run once
+    over the full history and the period is a query against those returns, so
+    the numbers match the Pre-1998 row of crisis_periods.
     """
-    # --- Load and Prepare Data ---
-    pre_1998_data = load_data('data/Return.csv', end_date='1997-09-09')
-    if pre_1998_data is None or pre_1998_data.empty:
+    full_data = load_data('data/Return.csv')
+    if full_data is None:
+        return
+    if full_data.loc[:PRE_1998["Pre-1998"][1]].empty:
         print("No data available for the pre-1998 period.")
         return
 
-    pre_1998_data = calculate_signals(pre_1998_data)
-    
+    engine = build_period_engine(calculate_signals(full_data))
     print("--- Pre-1998 Performance Analysis ---")
-    results = run_retail_strategy(pre_1998_data)
-    calculate_retail_statistics(results)
+    print_period_table(engine.query_periods(PRE_1998))
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
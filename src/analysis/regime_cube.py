@@ -0,0 +1,190 @@
+import pandas as pd
+import numpy as np
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
+from src.analysis.ma_filter import run_ma_filtered_strategy_arrays
+
+CUBE_METRICS = ['Days', 'Mean (ann.)', 'Volatility', 'Sharpe Ratio', 'Hit Rate']
+
+def _bucket(values, edges, labels):
+    """
+    Integer bucket codes for values split at `edges`; NaN becomes -1.
+    """
+    codes = np.searchsorted(edges, values, side='right')
+    return pd.Categorical.from_codes(np.where(np.isnan(values), -1, codes), labels)
+
+def _band(samples, tail):
+    """
+    Lower and upper percentile of the finite bootstrap samples (NaN if there are none,
+    e.g. a strategy that is flat in the bucket).
+    """
+    finite = samples[np.isfinite(samples)]
+    if len(finite) == 0:
+        return np.nan, np.nan
+    return np.percentile(finite, tail), np.percentile(finite, 100 - tail)
+
+def regime_labels(df):
+    """
+    Classifies each day by the state known at the previous close (VIX level, VIX
+    5-day change, SPY drawdown) and by its position in the month, which is known
+    in advance. Returns a DataFrame of categorical regime columns.
+    """
+    vix = df['VIX'].to_numpy(dtype=np.float64) / 1000
+    spy_growth = np.cumprod(1 + df['SPY_return'].to_numpy(dtype=np.float64))
+    spy_drawdown = spy_growth / np.maximum.accumulate(spy_growth) - 1
+    vix_change = pd.Series(vix).pct_change(5).to_numpy()
+
+    def previous(values):
+        return np.concatenate([[np.nan], values[:-1]])
+
+    months = df.index.to_period('M')
+    days_to_month_end = df.groupby(months).cumcount(ascending=False).to_numpy()
+    days_from_month_start = df.groupby(months).cumcount().to_numpy()
+    month_position = np.select(
+        [days_to_month_end == 0, days_to_month_end <= 4, days_from_month_start <= 2],
+        [0, 1, 2], default=3
+    )
+
+    return pd.DataFrame({
+        'VIX Level': _bucket(previous(vix), [15, 20, 25, 30], ['<15', '15-20', '20-25', '25-30', '>30']),
+        'VIX 5d Change': _bucket(previous(vix_change), [-0.1, 0.1], ['Falling >10%', 'Flat', 'Rising >10%']),
+        'SPY Drawdown': _bucket(-previous(spy_drawdown), [0.05, 0.10, 0.20], ['0-5%', '5-10%', '10-20%', '>20%']),
+        'Month-End Proximity': pd.Categorical.from_codes(
+            month_position, ['Last day', 'Days 1-4 before end', 'First 3 days', 'Mid-month']
+        ),
+    }, index=df.index)
+
+def _one_hot(regimes):
+    """
+    Stacks every regime column into one (days x buckets) indicator matrix, so all
+    dimensions are reduced by a single matrix product.
+    """
+    blocks, keys = [], []
+    for dimension in regimes.columns:
+        codes = regimes[dimension].cat.codes.to_numpy()
+        categories = regimes[dimension].cat.categories
+        block = np.zeros((len(codes), len(categories)))
+        valid = codes >= 0
+        block[np.flatnonzero(valid), codes[valid]] = 1.0
+        blocks.append(block)
+        keys.extend((dimension, category) for category in categories)
+    return np.hstack(blocks), keys
+
+def regime_cube(returns, regimes, periods_per_year=252):
+    """
+    Computes the (strategy x regime bucket x metric) cube for a (days x strategies)
+    return DataFrame in one grouped reduction. Returns the raw cube and a long table.
+    """
+    values = returns.to_numpy(dtype=np.float64)
+    indicator, keys = _one_hot(regimes)
+
+    counts = indicator.sum(axis=0)[:, None]                       # buckets x 1
+    sums = indicator.T @ values                                   # buckets x strategies
+    sums_sq = indicator.T @ values ** 2
+    hits = indicator.T @ (values > 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sums / counts
+        volatility = np.sqrt(np.maximum(sums_sq - counts * mean ** 2, 0) / (counts - 1)) * np.sqrt(periods_per_year)
+        sharpe = np.where(volatility > 0, mean * periods_per_year / volatility, np.nan)
+        hit_rate = hits / counts
+
+    cube = np.stack([
+        np.broadcast_to(counts, mean.shape), mean * periods_per_year, volatility, sharpe, hit_rate
+    ], axis=-1).transpose(1, 0, 2)                                # strategies x buckets x metrics
+
+    index = pd.MultiIndex.from_tuples(
+        [(strategy,) + key for strategy in returns.columns for key in keys],
+        names=['strategy', 'dimension', 'bucket']
+    )
+    table = pd.DataFrame(cube.reshape(-1, len(CUBE_METRICS)), index=index, columns=CUBE_METRICS)
+    table['Days'] = table['Days'].astype(int)
+    return cube, table
+
+def bootstrap_bands(returns, regimes, num_samples=1000, confidence=0.95, seed=0, chunk=250, periods_per_year=252):
+    """
+    Bootstrap confidence bands for the annualized mean and Sharpe ratio of every
+    (strategy, bucket) cell. Resamples are drawn as count vectors, so each chunk
+    of replicates is one (replicates x days) @ (days x strategies) product.
+    """
+    rng = np.random.default_rng(seed)
+    values = returns.to_numpy(dtype=np.float64)
+    indicator, keys = _one_hot(regimes)
+    tail = (1 - confidence) / 2 * 100
+
+    rows = []
+    for bucket, key in enumerate(keys):
+        members = np.flatnonzero(indicator[:, bucket])
+        n = len(members)
+        if n < 2:
+            continue
+        sample = values[members]
+        means, sharpes = [], []
+        for lo in range(0, num_samples, chunk):
+            size = min(chunk, num_samples - lo)
+            draws = rng.integers(0, n, size=(size, n)) + (np.arange(size) * n)[:, None]
+            weights = np.bincount(draws.ravel(), minlength=size * n).reshape(size, n)
+            mean = weights @ sample / n
+            variance = np.maximum(weights @ sample ** 2 / n - mean ** 2, 0) * n / (n - 1)
+            means.append(mean * periods_per_year)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sharpes.append(mean * np.sqrt(periods_per_year) / np.sqrt(variance))
+        means, sharpes = np.vstack(means), np.vstack(sharpes)
+
+        for col, strategy in enumerate(returns.columns):
+            mean_low, mean_high = _band(means[:, col], tail)
+            sharpe_low, sharpe_high = _band(sharpes[:, col], tail)
+            rows.append({
+                'strategy': strategy, 'dimension': key[0], 'bucket': key[1],
+                'Mean Low': mean_low, 'Mean High': mean_high,
+                'Sharpe Low': sharpe_low, 'Sharpe High': sharpe_high,
+            })
+
+    return pd.DataFrame(rows).set_index(['strategy', 'dimension', 'bucket'])
+
+def main():
+    """
+    Main function to build the regime statistics cube.
+    """
+    try:
+        vix_data = pd.read_csv('data/vix.csv', index_col='Date', parse_dates=True)
+        vix_data = vix_data.rename(columns={'VIXSIM': 'VIX'})
+    except FileNotFoundError:
+        print("Error: The file at vix.csv was not found.")
+        return
+
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    if base_data is None:
+        return
+
+    data_with_signals = calculate_signals(base_data)
+    data_with_vix = data_with_signals.join(vix_data, how='inner')
+
+    results = {
+        'Dual-Signal': run_strategy_arrays(data_with_vix),
+        'Calendar-Only': run_retail_strategy_arrays(data_with_vix),
+        'Hedged Equity': run_vix_filtered_strategy_arrays(data_with_vix, vix_threshold=20),
+        'MA-Filtered': run_ma_filtered_strategy_arrays(data_with_vix),
+    }
+    returns = pd.DataFrame({name: pd.Series(r.returns, index=r.index) for name, r in results.items()})
+    returns['S&P 500 (SPY)'] = data_with_vix['SPY_return']
+    returns = returns.dropna()
+    regimes = regime_labels(data_with_vix).loc[returns.index]
+
+    print("--- Regime-Conditional Statistics Cube ---")
+    _, table = regime_cube(returns, regimes)
+    bands = bootstrap_bands(returns, regimes)
+
+    for dimension in regimes.columns:
+        section = table.xs(dimension, level='dimension')
+        print(f"\n--- {dimension}: Annualized Sharpe Ratio ---")
+        print(section['Sharpe Ratio'].unstack('strategy').round(2).to_string())
+
+        cells = bands.xs(dimension, level='dimension')
+        print(f"\n--- {dimension}: 95% Bootstrap Band of the Sharpe Ratio ---")
+        formatted = cells.apply(lambda row: f"[{row['Sharpe Low']:.2f}, {row['Sharpe High']:.2f}]", axis=1)
+        print(formatted.unstack('strategy').to_string())
+
+if __name__ == '__main__':
+    main()
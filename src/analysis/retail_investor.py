@@ -1,12 +1,17 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from src.core.backtest import load_data, calculate_signals, plot_performance
+from src.core.costs import linear_cost_scenarios, run_cost_grid
+from src.core.result import make_result, lagged, return_legs
+from src.core.drawdowns import max_drawdown
+from src.core.instrument import instrumented
 
-def run_retail_strategy(df, transaction_cost_bps=0):
+@instrumented()
+def run_retail_strategy(df):
     """
     Calculates the returns for a simplified, retail-focused strategy.
     This strategy uses only the calendar signal to reduce complexity and turnover.
+    Returns are gross; trading costs are charged per leg by src.core.costs.
     """
     # Use only the calendar signal for the strategy weight
     df['strategy_weight'] = df['modified_calendar_signal']
@@ -14,11 +19,7 @@ def run_retail_strategy(df, transaction_cost_bps=0):
     # Calculate spread and strategy returns
     df['spread_return'] = df['SPY_return'] - df['TLT_return']
     
-    # Calculate turnover and transaction costs
-    turnover = df['strategy_weight'].diff().abs()
-    transaction_costs = turnover * (transaction_cost_bps / 10000.0)
-    
-    df['strategy_return'] = df['strategy_weight'].shift(1) * df['spread_return'] - transaction_costs
+    df['strategy_return'] = df['strategy_weight'].shift(1) * df['spread_return']
     
     df = df.dropna().copy()
 
@@ -27,7 +28,22 @@ def run_retail_strategy(df, transaction_cost_bps=0):
     
     return df
 
-def calculate_retail_statistics(df, transaction_cost_bps=0):
+@instrumented()
+def run_retail_strategy_arrays(df):
+    """
+    Copy-free version of run_retail_strategy (without costs; see src.core.costs).
+    Leaves df untouched and returns a BacktestResult.
+    """
+    weight = df['modified_calendar_signal'].to_numpy(dtype=np.float64)
+    spy_return = df['SPY_return'].to_numpy(dtype=np.float64)
+    tlt_return = df['TLT_return'].to_numpy(dtype=np.float64)
+
+    returns = lagged(weight) * (spy_return - tlt_return)
+
+    return make_result(df.index, weight, returns, spy_return, tlt_return,
+                       legs=return_legs(spy_return - tlt_return, None, weight))
+
+def calculate_retail_statistics(df):
     """
     Calculates and prints performance statistics for the retail strategy.
     """
@@ -38,20 +54,14 @@ def calculate_retail_statistics(df, transaction_cost_bps=0):
     strategy_cagr = (df['cumulative_strategy_return'].iloc[-1])**(252/len(df)) - 1
     strategy_volatility = df['strategy_return'].std() * np.sqrt(252)
     strategy_sharpe = strategy_cagr / strategy_volatility if strategy_volatility > 0 else 0
-    strategy_cumulative_returns = (1 + df['strategy_return']).cumprod()
-    strategy_peak = strategy_cumulative_returns.cummax()
-    strategy_drawdown = (strategy_cumulative_returns - strategy_peak) / strategy_peak
-    strategy_max_drawdown = strategy_drawdown.min()
+    strategy_max_drawdown = max_drawdown(df['strategy_return'])
 
     spy_cagr = (df['cumulative_spy_return'].iloc[-1])**(252/len(df)) - 1
     spy_volatility = df['SPY_return'].std() * np.sqrt(252)
     spy_sharpe = spy_cagr / spy_volatility if spy_volatility > 0 else 0
-    spy_cumulative_returns = (1 + df['SPY_return']).cumprod()
-    spy_peak = spy_cumulative_returns.cummax()
-    spy_drawdown = (spy_cumulative_returns - spy_peak) / spy_peak
-    spy_max_drawdown = spy_drawdown.min()
+    spy_max_drawdown = max_drawdown(df['SPY_return'])
 
-    print(f"\n--- Retail Strategy Performance (Transaction Costs: {transaction_cost_bps} bps) ---")
+    print("\n--- Retail Strategy Performance (before costs) ---")
     print(f"{'Metric':<20} {'Strategy':<15} {'S&P 500 (SPY)':<15}")
     print("-" * 55)
     print(f"{'CAGR':<20} {strategy_cagr:>14.2%} {spy_cagr:>14.2%}")
@@ -64,6 +74,7 @@ def main():
     """
     Main function to run the retail investor strategy analysis.
     """
+    import matplotlib.pyplot as plt
     base_data = load_data('data/Return.csv', start_date='1997-09-10')
     if base_data is None:
         return
@@ -72,25 +83,31 @@ def main():
     
     print("--- Running Retail Investor Strategy Analysis (Calendar Signal Only) ---")
     
-    # Run backtest with different transaction costs
-    for costs in [0, 1, 2, 5, 10]:
-        data = run_retail_strategy(base_data.copy(), transaction_cost_bps=costs)
-        if costs == 0:
-            # Create a unique plot for this analysis
-            plt.figure(figsize=(12, 8))
-            plt.plot(data.index, data['cumulative_strategy_return'], label='Retail Strategy (Calendar Only)')
-            plt.plot(data.index, data['cumulative_spy_return'], label='S&P 500 (SPY)')
-            plt.title('Cumulative Returns: Retail Strategy vs. S&P 500')
-            plt.xlabel('Date')
-            plt.ylabel('Cumulative Returns')
-            plt.yscale('log')
-            plt.legend()
-            plt.grid(True)
-            plt.savefig('plots/other/performance_retail.png')
-            plt.close()
-            print("\nPerformance chart saved to plots/other/performance_retail.png")
+    data = run_retail_strategy(base_data)
+
+    # Create a unique plot for this analysis
+    plt.figure(figsize=(12, 8))
+    plt.plot(data.index, data['cumulative_strategy_return'], label='Retail Strategy (Calendar Only)')
+    plt.plot(data.index, data['cumulative_spy_return'], label='S&P 500 (SPY)')
+    plt.title('Cumulative Returns: Retail Strategy vs. S&P 500')
+    plt.xlabel('Date')
+    plt.ylabel('Cumulative Returns')
+    plt.yscale('log')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig('plots/other/performance_retail.png')
+    plt.close()
+    print("\nPerformance chart saved to plots/other/performance_retail.png")
+
+    calculate_retail_statistics(data)
 
-        calculate_retail_statistics(data, transaction_cost_bps=costs)
+    # Evaluate all cost levels against the same turnover in one pass
+    stats, _ = run_cost_grid(data, linear_cost_scenarios([0, 1, 2, 5, 10]))
+    print("\n--- Retail Strategy by Cost Level (bps per leg) ---")
+    print(f"{'Costs':<10} {'CAGR':>9} {'Volatility':>11} {'Sharpe':>8} {'Max DD':>9}")
+    print("-" * 51)
+    for name, row in stats.iterrows():
+        print(f"{name:<10} {row['CAGR']:>9.2%} {row['Volatility']:>11.2%} {row['Sharpe Ratio']:>8.2f} {row['Max Drawdown']:>9.2%}")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,153 @@
+import pandas as pd
+import numpy as np
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.ma_filter import run_ma_filtered_strategy_arrays
+
+def month_bounds(index):
+    """
+    Positions of the first and last trading day of every month in the index.
+    """
+    months = index.to_period('M')
+    is_first = np.concatenate([[True], months[1:] != months[:-1]])
+    first = np.flatnonzero(is_first)
+    last = np.concatenate([first[1:] - 1, [len(index) - 1]])
+    return months[first], first, last
+
+def _max_drawdown_sweep(log_curve, first, last, chunk=64):
+    """
+    Max drawdown for every (start month, end month) pair of one log equity curve.
+    Processes a chunk of start months at a time as one 2-D running max/min sweep.
+    """
+    num_months = len(first)
+    out = np.full((num_months, num_months), np.nan, dtype=np.float32)
+    columns = np.arange(len(log_curve))
+
+    for lo in range(0, num_months, chunk):
+        starts = first[lo:lo + chunk]
+        # Days before each start are masked so they can neither set a peak nor a trough
+        before = columns[None, :] < starts[:, None]
+        curve = np.where(before, -np.inf, log_curve[None, :])
+        peak = np.maximum.accumulate(curve, axis=1)
+        with np.errstate(invalid='ignore'):
+            drawdown = np.where(before, 0.0, curve - peak)
+        worst = np.minimum.accumulate(drawdown, axis=1)[:, last]
+        rows = np.arange(lo, lo + len(starts))
+        worst[np.arange(num_months)[None, :] < rows[:, None]] = np.nan
+        out[lo:lo + len(starts)] = np.expm1(worst)
+
+    return out
+
+def robustness_triangle(returns, min_months=12, periods_per_year=252):
+    """
+    CAGR, Sharpe ratio and max drawdown for every (start month, end month) pair of
+    each column of a (days x strategies) return DataFrame. Cells shorter than
+    `min_months` are NaN. Returns {strategy: {metric: float32 matrix}} and the months.
+    """
+    months, first, last = month_bounds(returns.index)
+    values = returns.to_numpy(dtype=np.float64)
+    zero_row = np.zeros((1, values.shape[1]))
+    log_prefix = np.vstack([zero_row, np.cumsum(np.log1p(values), axis=0)])
+    sum_prefix = np.vstack([zero_row, np.cumsum(values, axis=0)])
+    sumsq_prefix = np.vstack([zero_row, np.cumsum(values ** 2, axis=0)])
+
+    start_pos = first[:, None]
+    end_pos = last[None, :] + 1
+    num_days = (end_pos - start_pos).astype(np.float64)
+    span = np.arange(len(months))[None, :] - np.arange(len(months))[:, None] + 1
+    valid = span >= min_months
+
+    triangles = {}
+    for col, name in enumerate(returns.columns):
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            log_growth = log_prefix[end_pos, col] - log_prefix[start_pos, col]
+            total = sum_prefix[end_pos, col] - sum_prefix[start_pos, col]
+            total_sq = sumsq_prefix[end_pos, col] - sumsq_prefix[start_pos, col]
+            cagr = np.exp(log_growth * periods_per_year / num_days) - 1
+            variance = (total_sq - total ** 2 / num_days) / (num_days - 1)
+            volatility = np.sqrt(np.maximum(variance, 0)) * np.sqrt(periods_per_year)
+            sharpe = np.where(volatility > 0, cagr / volatility, 0)
+
+        max_drawdown = _max_drawdown_sweep(log_prefix[1:, col], first, last)
+        triangles[name] = {
+            'CAGR': np.where(valid, cagr, np.nan).astype(np.float32),
+            'Sharpe Ratio': np.where(valid, sharpe, np.nan).astype(np.float32),
+            'Max Drawdown': np.where(valid, max_drawdown, np.nan).astype(np.float32),
+        }
+
+    return triangles, months
+
+def plot_robustness_triangle(triangle, months, title, filename, highlight=None):
+    """
+    Renders the three metric triangles of one strategy as heatmaps
+    (rows: start month, columns: end month).
+    """
+    import matplotlib.pyplot as plt
+    fig, axes = plt.subplots(1, 3, figsize=(21, 7))
+    settings = {
+        'CAGR': dict(cmap='RdYlGn', vmin=-0.1, vmax=0.1),
+        'Sharpe Ratio': dict(cmap='RdYlGn', vmin=-1.0, vmax=1.0),
+        'Max Drawdown': dict(cmap='magma', vmin=-0.6, vmax=0.0),
+    }
+    years = months.year
+    ticks = np.flatnonzero((months.month == 1) & (years % 10 == 0))
+
+    for ax, (metric, options) in zip(axes, settings.items()):
+        image = ax.imshow(triangle[metric], origin='upper', aspect='auto', interpolation='nearest', **options)
+        ax.set_title(metric)
+        ax.set_xlabel('End Month')
+        ax.set_ylabel('Start Month')
+        ax.set_xticks(ticks, years[ticks])
+        ax.set_yticks(ticks, years[ticks])
+        if highlight is not None:
+            ax.plot(highlight[1], highlight[0], marker='x', color='cyan', markersize=10, markeredgewidth=2)
+        fig.colorbar(image, ax=ax, fraction=0.046)
+
+    fig.suptitle(title)
+    fig.tight_layout()
+    plt.savefig(filename)
+    plt.close()
+    print(f"Robustness triangle plot saved to {filename}")
+
+def main():
+    """
+    Main function to compute and plot the all-start/all-end performance triangles.
+    """
+    base_data = load_data('data/Return.csv')
+    if base_data is None:
+        return
+
+    data_with_signals = calculate_signals(base_data)
+    results = {
+        'Original Dual-Signal': run_strategy_arrays(data_with_signals),
+        'Calendar-Only': run_retail_strategy_arrays(data_with_signals),
+        'MA-Filtered (200d)': run_ma_filtered_strategy_arrays(data_with_signals),
+    }
+    returns = pd.DataFrame({name: pd.Series(r.returns, index=r.index) for name, r in results.items()})
+    returns['S&P 500 (SPY)'] = base_data['SPY_return']
+    returns = returns.dropna()
+
+    print("--- Computing All-Start/All-End Performance Triangles ---")
+    triangles, months = robustness_triangle(returns)
+    print(f"{len(months)} months -> {np.isfinite(next(iter(triangles.values()))['CAGR']).sum()} cells per metric and strategy")
+
+    # The report's headline window, for reference on the heatmaps
+    headline = (months.get_loc(pd.Period('1997-09', 'M')), months.get_loc(pd.Period('2023-03', 'M')))
+
+    for name, triangle in triangles.items():
+        sharpe = triangle['Sharpe Ratio']
+        print(f"\n{name}:")
+        print(f"  Headline window Sharpe:         {sharpe[headline]:.2f}")
+        print(f"  Share of windows with Sharpe>0: {np.mean(sharpe[np.isfinite(sharpe)] > 0):.2%}")
+        print(f"  Median Sharpe (10y+ windows):   {np.nanmedian(np.where(np.triu(np.ones_like(sharpe), 119) > 0, sharpe, np.nan)):.2f}")
+
+        suffix = name.lower().replace(' ', '_').replace('(', '').replace(')', '').replace('&', '').replace('-', '_')
+        plot_robustness_triangle(
+            triangle, months,
+            f'Performance by Start and End Month: {name}',
+            f'plots/other/plot_robustness_triangle_{suffix}.png',
+            highlight=headline
+        )
+
+if __name__ == '__main__':
+    main()
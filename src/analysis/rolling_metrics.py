@@ -1,13 +1,14 @@
 import pandas as pd
 import numpy as np
-import statsmodels.api as sm
 from src.core.backtest import load_data, calculate_signals, run_strategy
-import matplotlib.pyplot as plt
+from src.core.instrument import instrumented
 
+@instrumented()
 def calculate_rolling_metrics(df, window=252):
     """
     Calculates rolling alpha and beta for the strategy returns against the benchmark.
     """
+    import statsmodels.api as sm
     # Ensure returns are available
     if 'strategy_return' not in df or 'SPY_return' not in df:
         print("Error: 'strategy_return' or 'SPY_return' not in DataFrame.")
@@ -49,6 +50,7 @@ def plot_rolling_metrics(df):
     """
     Plots the rolling alpha and beta on the same chart with a secondary y-axis.
     """
+    import matplotlib.pyplot as plt
     fig, ax1 = plt.subplots(figsize=(14, 8))
 
     # Plot Rolling Alpha on the primary y-axis
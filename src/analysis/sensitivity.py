@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import numpy as np
+import pandas as pd
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.core.instrument import instrumented
+from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
+
+def _summary(result):
+    stats = result.statistics().loc['Strategy']
+    return {'CAGR': stats['CAGR'], 'Sharpe': stats['Sharpe Ratio'], 'Max Drawdown': stats['Max Drawdown']}
+
+@instrumented()
+def sensitivity_tables(data_with_signals, data_with_signals_vix=None):
+    """
+    CAGR, Sharpe ratio and max drawdown across signal weights, normalization
+    constants and (with VIX data) VIX thresholds. Returns a dict of DataFrames
+    keyed 'weights', 'norm' and 'vix' (None without VIX data).
+    """
+    weights = np.arange(0.2, 0.81, 0.1)
+    weight_df = pd.DataFrame([_summary(run_strategy_arrays(data_with_signals, w, 1 - w)) for w in weights],
+                             index=[f"{w:.1f}/{1-w:.1f}" for w in weights])
+
+    norms = np.arange(0.006, 0.0181, 0.002)
+    norm_results = []
+    for norm in norms:
+        renormalized = data_with_signals.assign(modified_threshold_signal=-(data_with_signals['avg_threshold_signal'] / norm))
+        norm_results.append(_summary(run_strategy_arrays(renormalized)))
+    norm_df = pd.DataFrame(norm_results, index=[f"{norm:.4f}" for norm in norms])
+
+    vix_df = None
+    if data_with_signals_vix is not None:
+        thresholds = np.arange(15, 31, 2.5)
+        vix_df = pd.DataFrame([_summary(run_vix_filtered_strategy_arrays(data_with_signals_vix, t)) for t in thresholds],
+                              index=[f"> {t}" for t in thresholds])
+
+    return {'weights': weight_df, 'norm': norm_df, 'vix': vix_df}
+
+def main():
+    """
+    Main function to print the sensitivity tables.
+    """
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    if base_data is None:
+        return
+    data_with_signals = calculate_signals(base_data)
+
+    try:
+        vix_data = pd.read_csv('data/vix.csv', index_col='Date', parse_dates=True)
+        data_with_signals_vix = data_with_signals.join(vix_data.rename(columns={'VIXSIM': 'VIX'}), how='inner')
+    except FileNotFoundError:
+        print("Error: VIX data not found. The VIX threshold table will be left out.")
+        data_with_signals_vix = None
+
+    tables = sensitivity_tables(data_with_signals, data_with_signals_vix)
+    titles = {'weights': 'Signal Weights (Threshold/Calendar)', 'norm': 'Normalization Constant', 'vix': 'VIX Threshold'}
+    for key, title in titles.items():
+        if tables[key] is not None:
+            print(f"\n--- Performance vs. {title} ---")
+            print(tables[key].round(4).to_string())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import pandas as pd
+import numpy as np
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.core.tail_risk import rolling_tail_risk, var_breach_rates, tail_risk_table
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
+from src.analysis.ma_filter import run_ma_filtered_strategy_arrays
+
+def plot_rolling_expected_shortfall(risk, method='Filtered Historical', level=0.99, horizon=1,
+                                    filename='plots/other/plot_rolling_expected_shortfall.png'):
+    """
+    Plots the rolling expected shortfall of every strategy for one method, level and horizon.
+    """
+    import matplotlib.pyplot as plt
+    shortfall = risk[(method, 'ES', level, horizon)]
+
+    plt.figure(figsize=(14, 8))
+    for strategy, values in shortfall.items():
+        plt.plot(values.index, values, label=strategy, linewidth=1)
+    plt.title(f'Rolling {horizon}-Day Expected Shortfall ({level:.0%}, {method})')
+    plt.xlabel('Date')
+    plt.ylabel('Expected Shortfall (loss)')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(filename)
+    plt.close()
+    print(f"Rolling expected shortfall plot saved to {filename}")
+
+def main():
+    """
+    Main function to run the tail-risk analysis across strategies.
+    """
+    try:
+        vix_data = pd.read_csv('data/vix.csv', index_col='Date', parse_dates=True)
+        vix_data = vix_data.rename(columns={'VIXSIM': 'VIX'})
+    except FileNotFoundError:
+        print("Error: The file at vix.csv was not found.")
+        return
+
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    if base_data is None:
+        return
+
+    data_with_signals = calculate_signals(base_data)
+    data_with_vix = data_with_signals.join(vix_data, how='inner')
+
+    results = {
+        'Dual-Signal': run_strategy_arrays(data_with_vix),
+        'Calendar-Only': run_retail_strategy_arrays(data_with_vix),
+        'Hedged Equity': run_vix_filtered_strategy_arrays(data_with_vix, vix_threshold=20),
+        'MA-Filtered': run_ma_filtered_strategy_arrays(data_with_vix),
+    }
+    returns = pd.DataFrame({name: pd.Series(r.returns, index=r.index) for name, r in results.items()})
+    returns['S&P 500 (SPY)'] = data_with_vix['SPY_return']
+    returns = returns.dropna()
+
+    print("--- Full-Sample 1-Day Tail Risk (losses) ---")
+    print(tail_risk_table(returns).map(lambda x: f"{x:.2%}").to_string())
+
+    risk = rolling_tail_risk(returns, levels=(0.95, 0.99), horizons=(1, 10), window=252)
+
+    print(f"\n--- Rolling Estimates on {returns.index[-1]:%Y-%m-%d} (1-year window) ---")
+    latest = risk.iloc[-1].unstack('strategy')
+    print(latest.map(lambda x: f"{x:.2%}").to_string())
+
+    print("\n--- VaR Backtest: Share of Days with a Loss Beyond VaR ---")
+    breaches = var_breach_rates(returns, risk)
+    print(breaches['Breach Rate'].unstack('strategy').map(lambda x: f"{x:.2%}").to_string())
+
+    # Average 1-day 99% ES while VIX was above 30: does the hedge cut the crisis tail?
+    stressed = (data_with_vix['VIX'] > 30 * 1000).reindex(returns.index)
+    crisis_es = risk[('Filtered Historical', 'ES', 0.99, 1)][stressed].mean()
+    print("\n--- Average 1-Day 99% Filtered ES on Days with VIX > 30 ---")
+    for strategy, value in crisis_es.items():
+        print(f"{strategy:<20} {value:>8.2%}")
+
+    plot_rolling_expected_shortfall(risk)
+
+if __name__ == '__main__':
+    main()
@@ -1,62 +1,5 @@
-import pandas as pd
-import numpy as np
-from src.core.backtest import load_data, calculate_signals, plot_performance
-
-def run_strategy_with_costs(df, transaction_cost_bps=0):
-    """
-    Calculates the unscaled strategy returns, including transaction costs.
-    """
-    # Combine signals into a raw, unscaled weight
-    df['strategy_weight'] = 0.6 * df['modified_threshold_signal'] + 0.4 * df['modified_calendar_signal']
-    
-    # Calculate spread and strategy returns
-    df['spread_return'] = df['SPY_return'] - df['TLT_return']
-    
-    # Calculate turnover and transaction costs
-    turnover = df['strategy_weight'].diff().abs()
-    transaction_costs = turnover * (transaction_cost_bps / 10000.0)
-    
-    df['strategy_return'] = df['strategy_weight'].shift(1) * df['spread_return'] - transaction_costs
-    
-    df = df.dropna().copy()
-
-    df['cumulative_strategy_return'] = (1 + df['strategy_return']).cumprod()
-    df['cumulative_spy_return'] = (1 + df['SPY_return']).cumprod()
-    
-    return df
-
-def calculate_statistics_with_costs(df, transaction_cost_bps=0):
-    """
-    Calculates and prints performance statistics, including turnover.
-    """
-    # Calculate Turnover
-    daily_turnover = df['strategy_weight'].diff().abs().mean()
-    annual_turnover = daily_turnover * 252
-
-    strategy_cagr = (df['cumulative_strategy_return'].iloc[-1])**(252/len(df)) - 1
-    strategy_volatility = df['strategy_return'].std() * np.sqrt(252)
-    strategy_sharpe = strategy_cagr / strategy_volatility if strategy_volatility > 0 else 0
-    strategy_cumulative_returns = (1 + df['strategy_return']).cumprod()
-    strategy_peak = strategy_cumulative_returns.cummax()
-    strategy_drawdown = (strategy_cumulative_returns - strategy_peak) / strategy_peak
-    strategy_max_drawdown = strategy_drawdown.min()
-
-    spy_cagr = (df['cumulative_spy_return'].iloc[-1])**(252/len(df)) - 1
-    spy_volatility = df['SPY_return'].std() * np.sqrt(252)
-    spy_sharpe = spy_cagr / spy_volatility if spy_volatility > 0 else 0
-    spy_cumulative_returns = (1 + df['SPY_return']).cumprod()
-    spy_peak = spy_cumulative_returns.cummax()
-    spy_drawdown = (spy_cumulative_returns - spy_peak) / spy_peak
-    spy_max_drawdown = spy_drawdown.min()
-
-    print(f"\n--- Performance Statistics (Transaction Costs: {transaction_cost_bps} bps) ---")
-    print(f"{'Metric':<20} {'Strategy':<15} {'S&P 500 (SPY)':<15}")
-    print("-" * 55)
-    print(f"{'CAGR':<20} {strategy_cagr:>14.2%} {spy_cagr:>14.2%}")
-    print(f"{'Volatility':<20} {strategy_volatility:>14.2%} {spy_volatility:>14.2%}")
-    print(f"{'Sharpe Ratio':<20} {strategy_sharpe:>14.2f} {spy_sharpe:>14.2f}")
-    print(f"{'Max Drawdown':<20} {strategy_max_drawdown:>14.2%} {spy_max_drawdown:>14.2%}")
-    print(f"{'Annual Turnover':<20} {annual_turnover:>14.2f}")
+from src.core.backtest import load_data, calculate_signals, run_strategy, plot_performance
+from src.core.costs import linear_cost_scenarios, run_cost_grid
 
 def main():
     """
@@ -69,12 +12,26 @@ def main():
     base_data = calculate_signals(base_data)
     
     print("--- Running Transaction Cost Analysis ---")
-    # Run backtest with different transaction costs
-    for costs in [0, 1, 2, 5, 10]:
-        data = run_strategy_with_costs(base_data.copy(), transaction_cost_bps=costs)
-        if costs == 0:
-            plot_performance(data) # Only plot the baseline
-        calculate_statistics_with_costs(data, transaction_cost_bps=costs)
+    # The signals and turnover are computed once; every scenario is a column of one cost grid.
+    data = run_strategy(base_data)
+    plot_performance(data)
+
+    scenarios = linear_cost_scenarios([0, 1, 2, 5, 10]) + [
+        {'name': 'Half-spread 1/2 bps', 'spy_half_spread_bps': 0.5, 'tlt_half_spread_bps': 1.0},
+        {'name': 'Sqrt impact ($1bn AUM)', 'spy_half_spread_bps': 0.5, 'tlt_half_spread_bps': 1.0,
+         'impact_coefficient': 0.1, 'aum': 1e9},
+        {'name': 'Impact + 50 bps borrow', 'spy_half_spread_bps': 0.5, 'tlt_half_spread_bps': 1.0,
+         'impact_coefficient': 0.1, 'aum': 1e9, 'borrow_rate': 0.005},
+    ]
+    stats, _ = run_cost_grid(data, scenarios)
+
+    print("\n--- Performance Statistics by Cost Scenario (costs charged per leg) ---")
+    print(f"{'Scenario':<26} {'CAGR':>9} {'Volatility':>11} {'Sharpe':>8} {'Max DD':>9} {'SPY Cost':>9} {'TLT Cost':>9}")
+    print("-" * 87)
+    for name, row in stats.iterrows():
+        print(f"{name:<26} {row['CAGR']:>9.2%} {row['Volatility']:>11.2%} {row['Sharpe Ratio']:>8.2f} "
+              f"{row['Max Drawdown']:>9.2%} {row['SPY Cost (ann.)']:>9.2%} {row['TLT Cost (ann.)']:>9.2%}")
+    print(f"\nGross leg turnover (SPY + TLT, annualized): {stats['Gross Leg Turnover'].iloc[0]:.2f}")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
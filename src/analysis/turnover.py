@@ -1,24 +1,24 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from src.core.backtest import load_data, calculate_signals, run_strategy
-from src.analysis.retail_investor import run_retail_strategy
-from src.analysis.vix_filter import run_vix_filtered_strategy
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
 
 def analyze_turnover(data_with_signals, data_with_signals_vix):
     """
     Analyzes and plots the turnover for the three different strategy variations.
     """
+    import matplotlib.pyplot as plt
     # 1. Original Dual-Signal Strategy
-    original_results = run_strategy(data_with_signals.copy())
+    original_results = run_strategy_arrays(data_with_signals).to_frame()
     original_turnover = original_results['strategy_weight'].diff().abs()
     
     # 2. Retail-Adapted (Calendar-Only) Strategy
-    retail_results = run_retail_strategy(data_with_signals.copy())
+    retail_results = run_retail_strategy_arrays(data_with_signals).to_frame()
     retail_turnover = retail_results['strategy_weight'].diff().abs()
 
     # 3. Final Hedged Equity Strategy
-    hedged_results = run_vix_filtered_strategy(data_with_signals_vix.copy(), vix_threshold=20)
+    hedged_results = run_vix_filtered_strategy_arrays(data_with_signals_vix, vix_threshold=20).to_frame()
     hedged_turnover = hedged_results['strategy_weight'].diff().abs()
 
     # --- Print Annualized Turnover Statistics ---
@@ -43,7 +43,7 @@ def analyze_turnover(data_with_signals, data_with_signals_vix):
     ax.grid(True, which='both', linestyle='--', linewidth=0.5)
     
     plt.tight_layout()
-    plt.savefig('c:/Users/rwydaegh/OneDrive - UGent/Desktop/Documents/investeren/The Unintended Consequence of Rebalancing/plots/other/plot_turnover_analysis.png')
+    plt.savefig('plots/other/plot_turnover_analysis.png')
     plt.close()
     print("\nTurnover analysis plot saved to plots/other/plot_turnover_analysis.png")
 
@@ -1,8 +1,10 @@
 import pandas as pd
+from src.core.regimes import find_episodes
 
-def analyze_vix_thresholds(vix_filepath='data/vix.csv', thresholds=[20, 25]):
+def analyze_vix_thresholds(vix_filepath='data/vix.csv', thresholds=[20, 25], min_duration=1, merge_gap=0):
     """
     Analyzes the VIX data to identify periods when the VIX was above certain thresholds.
+    Returns the episode table (see src.core.regimes.find_episodes) for reuse.
     """
     try:
         vix_data = pd.read_csv(vix_filepath, index_col='Date', parse_dates=True)
@@ -13,34 +15,25 @@ def analyze_vix_thresholds(vix_filepath='data/vix.csv', thresholds=[20, 25]):
 
     print("--- VIX Threshold Analysis ---")
 
+    # VIX data is scaled by 1000 (e.g., 25000 represents a VIX of 25)
+    episodes = find_episodes(
+        vix_data['VIX'], [t * 1000 for t in thresholds], min_duration=min_duration, merge_gap=merge_gap
+    )
+    episodes['threshold'] = episodes['threshold'] / 1000
+
     for threshold in thresholds:
-        scaled_threshold = threshold * 1000
-        vix_data['above_threshold'] = vix_data['VIX'] > scaled_threshold
-        
-        breach_periods = []
-        in_breach = False
-        start_date = None
-        
-        for date, row in vix_data.iterrows():
-            if row['above_threshold'] and not in_breach:
-                in_breach = True
-                start_date = date
-            elif not row['above_threshold'] and in_breach:
-                in_breach = False
-                end_date = date
-                breach_periods.append((start_date, end_date))
-        
-        # If the last period is still in breach, close it at the end of the data
-        if in_breach:
-            breach_periods.append((start_date, vix_data.index[-1]))
+        breach_periods = episodes[episodes['threshold'] == threshold]
 
         print(f"\nPeriods when VIX > {threshold}:")
-        if not breach_periods:
+        if breach_periods.empty:
             print("  No periods found.")
             continue
-            
-        for start, end in breach_periods:
+
+        # An episode still open at the end of the data is closed at the last date
+        for start, end in zip(breach_periods['start'], breach_periods['exit'].fillna(breach_periods['end'])):
             print(f"  - From {start.strftime('%Y-%m-%d')} to {end.strftime('%Y-%m-%d')}")
 
+    return episodes
+
 if __name__ == '__main__':
     analyze_vix_thresholds()
\ No newline at end of file
@@ -1,8 +1,11 @@
 import pandas as pd
 import numpy as np
 from src.core.backtest import load_data, calculate_signals
+from src.core.result import make_result, lagged, return_legs
+from src.core.instrument import instrumented
 from src.analysis.retail_investor import calculate_retail_statistics
 
+@instrumented()
 def run_vix_filtered_strategy(df, vix_threshold=20):
     """
     Runs the final, superior strategy:
@@ -38,6 +41,31 @@ def run_vix_filtered_strategy(df, vix_threshold=20):
     
     return df
 
+@instrumented()
+def run_vix_filtered_strategy_arrays(df, vix_threshold=20):
+    """
+    Copy-free version of run_vix_filtered_strategy.
+    Leaves df untouched and returns a BacktestResult.
+    """
+    vix = df['VIX'].to_numpy(dtype=np.float64)
+    hedge_weight = df['modified_calendar_signal'].to_numpy(dtype=np.float64)
+    spy_return = df['SPY_return'].to_numpy(dtype=np.float64)
+    tlt_return = df['TLT_return'].to_numpy(dtype=np.float64)
+
+    hedge_active = vix > (vix_threshold * 1000)
+    hedge_return = lagged(hedge_weight) * (spy_return - tlt_return)
+
+    # The first day has no prior position and is dropped, as in the DataFrame runner
+    was_active = np.empty(len(hedge_active), dtype=bool)
+    was_active[0] = True
+    was_active[1:] = hedge_active[:-1]
+
+    returns = np.where(was_active, hedge_return, spy_return)
+    weight = np.where(hedge_active, hedge_weight, 1.0)
+
+    legs = return_legs(spy_return - tlt_return, None, hedge_weight, was_active, spy_return)
+    return make_result(df.index, weight, returns, spy_return, tlt_return, hedge_active, inputs=(vix, hedge_weight), legs=legs)
+
 def main():
     """
     Main function to run the VIX-filtered strategy analysis.
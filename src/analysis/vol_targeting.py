@@ -0,0 +1,39 @@
+import pandas as pd
+import numpy as np
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.core.sizing import vol_target_grid
+from src.analysis.retail_investor import run_retail_strategy_arrays
+
+def main():
+    """
+    Main function to run the volatility-targeting grid on the spread strategies.
+    """
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    if base_data is None:
+        return
+
+    data_with_signals = calculate_signals(base_data)
+    strategies = {
+        'Original Dual-Signal Strategy': run_strategy_arrays(data_with_signals),
+        'Retail-Adapted (Calendar-Only)': run_retail_strategy_arrays(data_with_signals),
+    }
+
+    target_vols = [0.05, 0.08, 0.10, 0.12, 0.15]
+    half_lives = [10, 21, 42, 63]
+
+    print("--- Running Volatility-Targeting Analysis (max leverage 2x) ---")
+    for name, result in strategies.items():
+        unscaled = result.statistics().loc['Strategy']
+        grid = vol_target_grid(result, target_vols, half_lives, max_leverage=2.0)
+
+        print(f"\n--- {name} ---")
+        print(f"Unscaled -> CAGR: {unscaled['CAGR']:.2%}, Volatility: {unscaled['Volatility']:.2%}, Sharpe: {unscaled['Sharpe Ratio']:.2f}")
+        print("\nSharpe Ratio (rows: EWMA half-life, columns: target vol):")
+        print(grid['Sharpe Ratio'].unstack('target_vol').round(2).to_string())
+        print("\nRealized Volatility:")
+        print(grid['Volatility'].unstack('target_vol').map(lambda x: f"{x:.2%}").to_string())
+        print("\nVolatility of 1-Year Rolling Volatility (lower = steadier risk):")
+        print(grid['Vol of 1Y Vol'].unstack('target_vol').map(lambda x: f"{x:.2%}").to_string())
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,11 @@
 import pandas as pd
 import numpy as np
 from src.core.backtest import load_data, calculate_signals
+from src.core.instrument import instrumented
 from src.analysis.retail_investor import calculate_retail_statistics, run_retail_strategy
 from src.analysis.vix_filter import run_vix_filtered_strategy
 
+@instrumented()
 def run_walk_forward_analysis(full_data, in_sample_years, out_of_sample_years, step_years, use_vix_filter=False, vix_threshold=20):
     """
     Performs the walk-forward analysis and returns the stitched out-of-sample results.
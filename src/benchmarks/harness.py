@@ -0,0 +1,342 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import io
+import re
+import gc
+import json
+import time
+import platform
+import tempfile
+import threading
+import tracemalloc
+import contextlib
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from src.core.backtest import load_data, calculate_signals, run_strategy, run_strategy_arrays
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
+from src.analysis.ma_filter import run_ma_filtered_strategy_arrays
+from src.analysis.monte_carlo import run_monte_carlo_simulation
+from src.analysis.rolling_metrics import calculate_rolling_metrics
+from src.analysis.vix import analyze_vix_thresholds
+from src.analysis.sensitivity import sensitivity_tables
+from src.benchmarks.synthetic import synthetic_market, write_market_csv, with_returns, fits_csv
+
+# '<scale>x' is scale times the length of data/Return.csv; '@<bars>' adds intraday bars per day
+DEFAULT_DATASETS = ['1x', '10x', '100x', '1x@13', '1x@78']
+DEFAULT_BASELINE = 'benchmarks/baseline.json'
+
+# --- Stages ---
+# Each stage takes the dataset context (data, vix, signals, CSV paths) and returns
+# its output, which later stages can require by stage name. 'signals' is the
+# calculate_signals output where that stage ran, else tiled_signals.
+
+SIGNAL_SAMPLE_ROWS = 4000
+
+def tiled_signals(data, sample_rows=SIGNAL_SAMPLE_ROWS):
+    """
+    The data with calculate_signals' columns computed on the first `sample_rows`
+    rows and repeated over the full length, so the vectorized downstream stages
+    can be timed at sizes the O(n) Python signal loops cannot reach.
+    """
+    sample = calculate_signals(data.iloc[:sample_rows].copy())
+    added = [column for column in sample.columns if column not in data.columns]
+    repeats = -(-len(data) // len(sample))
+    return data.assign(**{column: np.tile(sample[column].to_numpy(), repeats)[:len(data)] for column in added})
+
+def _signals_vix(ctx):
+    return ctx['signals'].join(ctx['vix'].rename(columns={'VIXSIM': 'VIX'}), how='inner')
+
+def stage_load_data(ctx):
+    data = load_data(ctx['returns_path'])
+    pd.read_csv(ctx['vix_path'], index_col='Date', parse_dates=True)
+    return data
+
+def stage_calculate_signals(ctx):
+    return calculate_signals(ctx['data'].copy())
+
+def stage_strategies(ctx):
+    signals = ctx['signals']
+    return [run_strategy_arrays(signals), run_retail_strategy_arrays(signals),
+            run_vix_filtered_strategy_arrays(_signals_vix(ctx)), run_ma_filtered_strategy_arrays(signals)]
+
+def stage_rolling_metrics(ctx):
+    return calculate_rolling_metrics(run_strategy(ctx['signals'].copy()))
+
+def stage_monte_carlo(ctx):
+    # One bootstrap path as long as the whole history per simulation, so the cost
+    # grows with the dataset like the other stages
+    years = max(len(ctx['data']) // 252, 1)
+    np.random.seed(0)
+    return run_monte_carlo_simulation(ctx['data']['SPY_return'].to_numpy(), num_simulations=100,
+                                      horizons=sorted({1, years}))
+
+def stage_vix_thresholds(ctx):
+    return analyze_vix_thresholds(ctx['vix_path'], thresholds=[20, 25])
+
+def stage_sensitivity(ctx):
+    return sensitivity_tables(ctx['signals'], _signals_vix(ctx))
+
+# name: (function, requirements, default row limit). 'csv' means the dataset can
+# be written to and read back from CSV; the row limits keep the O(n) Python loops
+# (the signal recursions, one OLS fit per rolling window) from running for hours
+# at 100x (override with max_rows).
+STAGES = {
+    'load_data': (stage_load_data, ['csv'], None),
+    'calculate_signals': (stage_calculate_signals, [], 200_000),
+    'strategies': (stage_strategies, ['signals'], None),
+    'rolling_metrics': (stage_rolling_metrics, ['signals'], 40_000),
+    'monte_carlo': (stage_monte_carlo, [], None),
+    'vix_thresholds': (stage_vix_thresholds, ['csv'], None),
+    'sensitivity': (stage_sensitivity, ['signals'], None),
+}
+
+def parse_dataset(name):
+    """
+    '10x' -> (10.0, 1), '1x@78' -> (1.0, 78). Raises ValueError otherwise.
+    """
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)x(?:@(\d+))?', name)
+    if not match:
+        raise ValueError(f"Dataset '{name}' is not of the form <scale>x or <scale>x@<bars per day>")
+    return float(match.group(1)), int(match.group(2) or 1)
+
+# --- Measurement ---
+
+class MemorySampler:
+    """
+    Samples the resident set size from a background thread while a stage runs.
+    Falls back to the process-wide peak (getrusage) where /proc is unavailable.
+    """
+    __slots__ = ('interval', 'start', 'peak', '_stop', '_thread')
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.start = self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def rss():
+        try:
+            with open('/proc/self/statm') as handle:
+                return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, AttributeError):
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if sys.platform == 'darwin' else peak * 1024
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.rss())
+
+    def __enter__(self):
+        self.start = self.peak = self.rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.rss())
+        return False
+
+def measure_stage(function, ctx, repeat=1, allocations=True):
+    """
+    Runs a stage `repeat` times (best wall time is kept; RSS from the first run)
+    and, with `allocations`, once more under tracemalloc for the peak of traced
+    Python allocations, so tracing does not distort the timings. Stage output
+    printed to stdout is swallowed. Returns (output, measurements).
+    """
+    times, output = [], None
+    for run in range(repeat):
+        gc.collect()
+        with MemorySampler() as memory, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            output = function(ctx)
+            times.append(time.perf_counter() - start)
+        if run == 0:
+            peak_rss, rss_delta = memory.peak, memory.peak - memory.start
+
+    alloc_peak = np.nan
+    if allocations:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                function(ctx)
+            alloc_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return output, {
+        'seconds': min(times),
+        'peak_rss_mb': peak_rss / 2**20,
+        'rss_delta_mb': rss_delta / 2**20,
+        'alloc_peak_mb': alloc_peak / 2**20,
+    }
+
+def run_benchmarks(datasets=None, stages=None, repeat=1, allocations=True, max_rows=None, seed=0, progress=True):
+    """
+    Runs the selected stages (plus the stages they need) on every synthetic
+    dataset. `max_rows` overrides the per-stage row limits (0 disables them).
+    Stages that need signals get tiled_signals where calculate_signals did not
+    run. Returns one record per (dataset, stage) as a DataFrame; skipped stages
+    carry the reason in 'status'.
+    """
+    datasets = datasets or DEFAULT_DATASETS
+    stages = stages or list(STAGES)
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+    # Stages the selected ones need run too, in STAGES order
+    selected = set(stages)
+    for stage in reversed(list(STAGES)):
+        if stage in selected:
+            selected.update(requirement for requirement in STAGES[stage][1] if requirement in STAGES)
+    stages = [stage for stage in STAGES if stage in selected]
+
+    records = []
+    for name in datasets:
+        scale, bars_per_day = parse_dataset(name)
+        prices, vix = synthetic_market(scale, bars_per_day, seed)
+        ctx = {'data': with_returns(prices), 'vix': vix}
+        rows = len(ctx['data'])
+
+        with tempfile.TemporaryDirectory(prefix='bench_') as directory:
+            if fits_csv(prices.index):
+                ctx['returns_path'], ctx['vix_path'] = write_market_csv(prices, vix, directory)
+                ctx['csv'] = True
+            del prices
+
+            for stage in stages:
+                function, requires, limit = STAGES[stage]
+                limit = limit if max_rows is None else (max_rows or None)
+                record = {'dataset': name, 'rows': rows, 'stage': stage}
+                if 'signals' in requires and 'signals' not in ctx and (limit is None or rows <= limit):
+                    ctx['signals'] = ctx.get('calculate_signals')
+                    if ctx['signals'] is None:
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            ctx['signals'] = tiled_signals(ctx['data'])
+                        if progress:
+                            print(f"  {name:<8} signals tiled from the first {SIGNAL_SAMPLE_ROWS:,} rows", flush=True)
+                missing = [requirement for requirement in requires if requirement not in ctx]
+                if missing:
+                    reason = 'dates beyond the CSV range' if missing == ['csv'] else f"needs {', '.join(missing)}"
+                    record['status'] = f"skipped ({reason})"
+                elif limit is not None and rows > limit:
+                    record['status'] = f"skipped (> {limit:,} rows)"
+                else:
+                    ctx[stage], measurements = measure_stage(function, ctx, repeat, allocations)
+                    record.update(measurements, status='ok')
+                records.append(record)
+                if progress:
+                    seconds = f"{record['seconds']:8.3f}s" if record['status'] == 'ok' else f"{'':9}"
+                    print(f"  {name:<8} {stage:<18} {seconds}  {record['status']}", flush=True)
+        del ctx
+        gc.collect()
+
+    columns = ['dataset', 'rows', 'stage', 'status', 'seconds', 'peak_rss_mb', 'rss_delta_mb', 'alloc_peak_mb']
+    return pd.DataFrame(records, columns=columns)
+
+# --- Baseline ---
+
+def save_baseline(results, path=DEFAULT_BASELINE):
+    """
+    Writes the results with a description of the machine they were taken on.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    baseline = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'results': json.loads(results.to_json(orient='records')),
+    }
+    with open(path, 'w') as handle:
+        json.dump(baseline, handle, indent=1)
+    return path
+
+def load_baseline(path=DEFAULT_BASELINE):
+    """
+    Baseline results as a DataFrame (with the machine description in attrs), or None.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as handle:
+        baseline = json.load(handle)
+    results = pd.DataFrame(baseline.pop('results'))
+    results.attrs.update(baseline)
+    return results
+
+def compare_to_baseline(results, baseline, tolerance=0.25, min_seconds=0.05, min_mb=1.0):
+    """
+    Time and allocation ratios (current / baseline) per (dataset, stage). A stage
+    regresses when either ratio exceeds 1 + tolerance and the absolute increase is
+    above the noise floor (min_seconds, min_mb).
+    """
+    keys = ['dataset', 'stage']
+    merged = results.merge(baseline[keys + ['rows', 'seconds', 'alloc_peak_mb']], on=keys, how='left',
+                           suffixes=('', '_baseline'))
+    merged['time_ratio'] = merged['seconds'] / merged['seconds_baseline']
+    merged['alloc_ratio'] = merged['alloc_peak_mb'] / merged['alloc_peak_mb_baseline']
+    slower = (merged['time_ratio'] > 1 + tolerance) & (merged['seconds'] - merged['seconds_baseline'] > min_seconds)
+    bigger = (merged['alloc_ratio'] > 1 + tolerance) & (merged['alloc_peak_mb'] - merged['alloc_peak_mb_baseline'] > min_mb)
+    merged['regression'] = slower | bigger
+    return merged
+
+def print_report(results, comparison=None):
+    """
+    One line per (dataset, stage): time, peak RSS, RSS growth, traced allocation
+    peak and, given a comparison, the change against the baseline.
+    """
+    table = comparison if comparison is not None else results
+    print(f"\n{'Dataset':<8} {'Rows':>10} {'Stage':<18} {'Time':>9} {'Peak RSS':>9} {'dRSS':>8} {'Alloc':>8}  Status")
+    print("-" * 100)
+    for row in table.itertuples(index=False):
+        if row.status != 'ok':
+            print(f"{row.dataset:<8} {row.rows:>10,} {row.stage:<18} {'':>9} {'':>9} {'':>8} {'':>8}  {row.status}")
+            continue
+        alloc = f"{row.alloc_peak_mb:>6.1f}MB" if np.isfinite(row.alloc_peak_mb) else f"{'-':>8}"
+        line = (f"{row.dataset:<8} {row.rows:>10,} {row.stage:<18} {row.seconds:>8.3f}s {row.peak_rss_mb:>7.0f}MB "
+                f"{row.rss_delta_mb:>6.0f}MB {alloc}  ok")
+        if comparison is not None and np.isfinite(row.time_ratio):
+            alloc = f", alloc {row.alloc_ratio:.2f}x" if np.isfinite(row.alloc_ratio) else ''
+            line += f"  (time {row.time_ratio:.2f}x{alloc}){'  <-- REGRESSION' if row.regression else ''}"
+        elif comparison is not None:
+            line += "  (not in baseline)"
+        print(line)
+    print("-" * 100)
+    if comparison is not None:
+        regressions = int(comparison['regression'].sum())
+        print(f"{regressions} regression(s) against the baseline" if regressions else "No regressions against the baseline")
+
+def main(datasets=None, stages=None, repeat=1, allocations=True, max_rows=None, baseline_path=DEFAULT_BASELINE,
+         save=False, tolerance=0.25):
+    """
+    Main function to run the benchmarks, compare them against the saved baseline
+    and (optionally) save them as the new baseline. Returns the number of regressions.
+    """
+    print(f"--- Benchmarks (Python {platform.python_version()}, pandas {pd.__version__}, numpy {np.__version__}) ---")
+    results = run_benchmarks(datasets, stages, repeat, allocations, max_rows)
+
+    baseline = load_baseline(baseline_path)
+    comparison = None
+    if baseline is not None:
+        print(f"\nComparing against {baseline_path} ({baseline.attrs.get('created')}, {baseline.attrs.get('platform')})")
+        comparison = compare_to_baseline(results, baseline, tolerance)
+    print_report(results, comparison)
+
+    if save:
+        print(f"\nBaseline saved to {save_baseline(results, baseline_path)}")
+    return 0 if comparison is None else int(comparison['regression'].sum())
+
+if __name__ == '__main__':
+    main(save='--save-baseline' in sys.argv)
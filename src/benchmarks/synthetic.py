@@ -0,0 +1,129 @@
+import os
+import numpy as np
+import pandas as pd
+
+BASE_DAYS = 16000  # about the length of data/Return.csv
+SESSION_OPEN_MINUTES = 570  # 09:30
+SESSION_MINUTES = 390
+
+# Calm and stressed regimes: daily drift and volatility of SPY and TLT, their
+# correlation, and the probability of staying in the regime from one day to the next
+REGIMES = {
+    'spy_drift': (0.0005, -0.0008),
+    'spy_vol': (0.008, 0.022),
+    'tlt_drift': (0.0002, 0.0004),
+    'tlt_vol': (0.006, 0.010),
+    'correlation': (-0.2, -0.5),
+    'stay': (0.995, 0.97),
+}
+
+def regime_path(days, rng):
+    """
+    0 (calm) / 1 (stressed) per day from a two-state Markov chain, built from
+    geometric regime durations instead of a day-by-day loop.
+    """
+    stay = REGIMES['stay']
+    mean_cycle = 1 / (1 - stay[0]) + 1 / (1 - stay[1])
+    cycles = int(days / mean_cycle * 1.5) + 10
+    durations = np.column_stack([rng.geometric(1 - stay[0], cycles), rng.geometric(1 - stay[1], cycles)]).ravel()
+    while durations.sum() < days:
+        durations = np.concatenate([durations, durations])
+    states = np.tile([0, 1], len(durations) // 2)
+    return np.repeat(states, durations)[:days]
+
+def market_index(days, bars_per_day=1, start='1962-01-02'):
+    """
+    Business-day (or intraday bar) timestamps. Spans beyond the datetime64[ns]
+    range (about 584 years) use second resolution, which pandas handles in
+    memory but which cannot be round-tripped through read_csv.
+    """
+    # Weekdays from a plain day range (bdate_range is slow for millions of days)
+    calendar = np.datetime64(start, 'D') + np.arange(days * 7 // 5 + 7)
+    weekdays = calendar[(calendar.astype(np.int64) + 3) % 7 < 5][:days].astype('datetime64[s]')
+    if bars_per_day > 1:
+        offsets = (SESSION_OPEN_MINUTES + np.arange(bars_per_day) * SESSION_MINUTES // bars_per_day) * 60
+        weekdays = (weekdays[:, None] + offsets.astype('timedelta64[s]')[None, :]).ravel()
+    dates = pd.DatetimeIndex(weekdays)
+    if dates[-1] < pd.Timestamp.max:
+        dates = dates.as_unit('ns')
+    return dates.rename('Date')
+
+def fits_csv(index):
+    """
+    Whether the index survives a CSV round trip (nanosecond timestamps).
+    """
+    return index.unit == 'ns'
+
+def synthetic_market(scale=1.0, bars_per_day=1, seed=0, start='1962-01-02'):
+    """
+    SPY/TLT prices (like data/Return.csv) and a VIX series (like data/vix.csv,
+    scaled by 1000) covering `scale` times BASE_DAYS business days, with
+    `bars_per_day` bars per day. Returns follow a calm/stressed regime switch with
+    regime-dependent drift, volatility and correlation; the VIX tracks the
+    regime's SPY volatility with persistent noise. Returns (prices, vix).
+    """
+    rng = np.random.default_rng(seed)
+    days = max(int(BASE_DAYS * scale), 2)
+    regime = np.repeat(regime_path(days, rng), bars_per_day)
+    bars = len(regime)
+
+    params = {key: np.asarray(values)[regime] for key, values in REGIMES.items() if key != 'stay'}
+    z_spy, z_other = rng.standard_normal((2, bars))
+    z_tlt = params['correlation'] * z_spy + np.sqrt(1 - params['correlation'] ** 2) * z_other
+    scale_vol = 1 / np.sqrt(bars_per_day)
+    spy_return = params['spy_drift'] / bars_per_day + params['spy_vol'] * scale_vol * z_spy
+    tlt_return = params['tlt_drift'] / bars_per_day + params['tlt_vol'] * scale_vol * z_tlt
+
+    index = market_index(days, bars_per_day, start)
+    prices = pd.DataFrame({
+        'SPYSIM': 10000 * np.cumprod(np.r_[1.0, 1 + spy_return[1:]]),
+        'TLTSIM': 10000 * np.cumprod(np.r_[1.0, 1 + tlt_return[1:]]),
+    }, index=index)
+
+    # Persistent multiplicative noise around the annualized regime volatility
+    noise = pd.Series(rng.standard_normal(days)).ewm(alpha=0.05, adjust=False).mean().to_numpy()
+    daily_vix = 100 * np.asarray(REGIMES['spy_vol'])[regime[::bars_per_day]] * np.sqrt(252) * np.exp(0.8 * noise)
+    vix = pd.DataFrame({'VIXSIM': 1000 * np.repeat(daily_vix, bars_per_day)}, index=index)
+    return prices, vix
+
+def write_market_csv(prices, vix, directory):
+    """
+    Writes the synthetic data in the layout of data/Return.csv and data/vix.csv.
+    Returns (returns_path, vix_path).
+    """
+    os.makedirs(directory, exist_ok=True)
+    returns_path = os.path.join(directory, 'Return.csv')
+    vix_path = os.path.join(directory, 'vix.csv')
+    prices.to_csv(returns_path, float_format='%.4f')
+    vix.to_csv(vix_path, float_format='%.2f')
+    return returns_path, vix_path
+
+def with_returns(prices):
+    """
+    The in-memory equivalent of load_data: prices plus SPY/TLT returns, first row dropped.
+    """
+    df = prices.copy()
+    df['SPY_return'] = df['SPYSIM'].pct_change()
+    df['TLT_return'] = df['TLTSIM'].pct_change()
+    return df.dropna()
+
+def synthetic_universe(num_equities=20, num_bonds=10, scale=1.0, seed=0, listed=0.5):
+    """
+    Wide price panel (like a multi-column data/Return.csv) of `num_equities`
+    equity series EQ001... and `num_bonds` bond series BD001..., each leg of its
+    own synthetic_market draw. A `listed` fraction of the assets starts trading
+    part-way through (NaN before), like a real universe.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for i in range(max(num_equities, num_bonds)):
+        prices, _ = synthetic_market(scale, seed=seed + i + 1)
+        if i < num_equities:
+            columns[f"EQ{i + 1:03d}"] = prices['SPYSIM'].to_numpy()
+        if i < num_bonds:
+            columns[f"BD{i + 1:03d}"] = prices['TLTSIM'].to_numpy()
+    panel = pd.DataFrame(columns, index=prices.index)
+    late = rng.random(panel.shape[1]) < listed
+    for column, start in zip(panel.columns[late], rng.integers(1, len(panel) // 2, late.sum())):
+        panel.iloc[:start, panel.columns.get_loc(column)] = np.nan
+    return panel[sorted(panel.columns)]
@@ -0,0 +1,395 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+# Only the standard library is imported here: every subcommand imports what it
+# needs when it runs, so `python -m src --help` and stats-only commands never
+# pay for matplotlib, plotly or statsmodels.
+
+HEAVY_MODULES = ['matplotlib', 'plotly', 'statsmodels', 'scipy']
+
+# (module, seconds): cold-start import budgets checked by `python -m src import-time`
+# and tests/test_import_time.py. None of them may load HEAVY_MODULES at import.
+IMPORT_BUDGETS = [
+    ('src.cli', 0.15),
+    ('src.core.backtest', 1.0),
+    ('src.core.metrics', 1.0),
+    ('src.analysis.vix_filter', 1.0),
+    ('src.analysis.walk_forward', 1.0),
+    ('src.analysis.monte_carlo', 1.0),
+    ('src.analysis.sensitivity', 1.0),
+    ('src.analysis.execution_timing', 1.0),
+    ('src.analysis.robustness_triangle', 1.0),
+    ('src.analysis.overlay_optimizer', 1.0),
+    ('src.analysis.tail_risk_analysis', 1.0),
+    ('src.analysis.event_study', 1.0),
+    ('src.analysis.no_trade_band', 1.0),
+    ('src.analysis.turnover', 1.0),
+    ('src.analysis.experiments', 1.0),
+    ('src.analysis.panel_backtest', 1.0),
+]
+
+STRATEGY_NAMES = ['dual', 'calendar', 'hedged', 'ma']
+
+def _load_signals(args, with_vix=False):
+    """
+    Loads returns, computes the signals and optionally joins the VIX data.
+    Returns None (after printing why) if a file is missing.
+    """
+    import pandas as pd
+    from src.core.backtest import load_data, calculate_signals
+    from src.core.instrument import stage
+
+    data = load_data(args.data, start_date=None if args.full_history else args.start)
+    if data is None:
+        return None
+    data = calculate_signals(data)
+    if with_vix:
+        try:
+            vix_data = pd.read_csv(args.vix, index_col='Date', parse_dates=True)
+        except FileNotFoundError:
+            print(f"Error: The file at {args.vix} was not found.")
+            return None
+        with stage('vix_join') as span:
+            data = data.join(vix_data.rename(columns={'VIXSIM': 'VIX'}), how='inner')
+            span.set(rows=len(data))
+    return data
+
+def _run_named_strategy(name, data, args):
+    from src.core.backtest import run_strategy_arrays
+    from src.analysis.retail_investor import run_retail_strategy_arrays
+    from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
+    from src.analysis.ma_filter import run_ma_filtered_strategy_arrays
+
+    if name == 'dual':
+        return 'Dual-Signal', run_strategy_arrays(data, args.threshold_weight, 1 - args.threshold_weight)
+    if name == 'calendar':
+        return 'Calendar-Only', run_retail_strategy_arrays(data)
+    if name == 'hedged':
+        return f'Hedged Equity (VIX > {args.vix_threshold:g})', run_vix_filtered_strategy_arrays(data, args.vix_threshold)
+    return f'MA-Filtered ({args.ma_window}d, {args.buffer:.1%})', run_ma_filtered_strategy_arrays(data, args.ma_window, args.buffer)
+
+# --- Subcommands ---
+
+def cmd_signals(args):
+    """
+    Computes the signals and prints a summary (or writes them to CSV).
+    """
+    data = _load_signals(args)
+    if data is None:
+        return 1
+    columns = ['avg_threshold_signal', 'modified_threshold_signal', 'modified_calendar_signal']
+    print(f"--- Signals: {len(data)} days, {data.index[0]:%Y-%m-%d} to {data.index[-1]:%Y-%m-%d} ---")
+    print(data[columns].describe().round(4).to_string())
+    print("\n--- Latest Values ---")
+    print(data[columns].tail(args.tail).round(4).to_string())
+    if args.output:
+        data.to_csv(args.output)
+        print(f"\nSignals written to {args.output}")
+    return 0
+
+def cmd_stats(args):
+    """
+    Prints CAGR, volatility, Sharpe ratio and max drawdown per strategy.
+    """
+    import pandas as pd
+    from src.core.metrics import performance_table
+
+    data = _load_signals(args, with_vix='hedged' in args.strategies)
+    if data is None:
+        return 1
+    returns = {}
+    for name in args.strategies:
+        label, result = _run_named_strategy(name, data, args)
+        returns[label] = pd.Series(result.returns, index=result.index)
+    returns['S&P 500 (SPY)'] = data['SPY_return']
+    returns = pd.DataFrame(returns).dropna()
+
+    print(f"--- Performance ({returns.index[0]:%Y-%m-%d} to {returns.index[-1]:%Y-%m-%d}, common dates) ---")
+    print(performance_table(returns, names=returns.columns).round(4).to_string())
+    return 0
+
+def cmd_walk_forward(args):
+    """
+    Stitched out-of-sample walk-forward run of the calendar or VIX-filtered strategy.
+    """
+    from src.analysis.walk_forward import run_walk_forward_analysis
+    from src.analysis.retail_investor import calculate_retail_statistics
+
+    data = _load_signals(args, with_vix=args.vix_filter)
+    if data is None:
+        return 1
+    results = run_walk_forward_analysis(data, args.in_sample, args.out_of_sample, args.step,
+                                        use_vix_filter=args.vix_filter, vix_threshold=args.vix_threshold)
+    if results is None:
+        print("Not enough data to perform a walk-forward analysis with the specified parameters.")
+        return 1
+    label = f"VIX > {args.vix_threshold:g}" if args.vix_filter else "Calendar-Only"
+    print(f"\n--- Walk-Forward Performance (Stitched, {label}) ---")
+    calculate_retail_statistics(results)
+    return 0
+
+def cmd_monte_carlo(args):
+    """
+    Bootstrapped CAGR distribution of the calendar strategy and SPY.
+    """
+    import numpy as np
+    from src.analysis.retail_investor import run_retail_strategy_arrays
+    from src.analysis.monte_carlo import run_monte_carlo_simulation
+
+    data = _load_signals(args)
+    if data is None:
+        return 1
+    if args.seed is not None:
+        np.random.seed(args.seed)
+    result = run_retail_strategy_arrays(data)
+    strategy_mc = run_monte_carlo_simulation(result.returns, num_simulations=args.simulations, horizons=args.horizons)
+    spy_mc = run_monte_carlo_simulation(result.spy_return, num_simulations=args.simulations, horizons=args.horizons)
+
+    print(f"--- Monte Carlo Results, Calendar-Only ({args.simulations} Simulations) ---")
+    print(f"{'Horizon':>8} {'P(Loss)':>8} {'Median':>8} {'5th Pct':>8} {'95th Pct':>9} {'P(< SPY)':>9}")
+    for horizon in args.horizons:
+        res = strategy_mc[horizon]
+        underperform = np.mean(np.array(res['cagr_dist']) < np.array(spy_mc[horizon]['cagr_dist']))
+        print(f"{horizon:>7}y {res['prob_loss']:>8.2%} {res['median_cagr']:>8.2%} {res['5th_percentile_cagr']:>8.2%} "
+              f"{res['95th_percentile_cagr']:>9.2%} {underperform:>9.2%}")
+    return 0
+
+def cmd_sensitivity(args):
+    """
+    CAGR and Sharpe ratio across signal weights, normalization constants and
+    VIX thresholds. --plot also renders the sensitivity charts.
+    """
+    from src.analysis.sensitivity import sensitivity_tables
+
+    data = _load_signals(args, with_vix=True)
+    if data is None:
+        return 1
+    signals = data.drop(columns=['VIX'])
+    tables = sensitivity_tables(signals, data)
+    titles = {'weights': 'Signal Weights (Threshold/Calendar)', 'norm': 'Normalization Constant', 'vix': 'VIX Threshold'}
+    for key, title in titles.items():
+        print(f"--- Performance vs. {title} ---")
+        print(tables[key].round(4).to_string() + "\n")
+
+    if args.plot:
+        from src.core.instrument import stage
+        from src.visualization.plots import plot_all_sensitivity_analyses
+        with stage('plot_sensitivity', category='plot'):
+            plot_all_sensitivity_analyses(signals, data)
+    return 0
+
+def cmd_plots(args):
+    """
+    Runs the plot pipeline (incremental unless --force).
+    """
+    from src.visualization import pipeline
+
+    if args.list:
+        for name, (kind, _, inputs) in pipeline.TASKS.items():
+            print(f"{name:<34} {kind:<9} <- {', '.join(inputs) or '(files)'}")
+        return 0
+    try:
+        _, timings = pipeline.run_pipeline(targets=args.only, max_workers=args.workers,
+                                           cache_dir=None if args.force else pipeline.CACHE_DIR)
+    except ValueError as error:
+        print(f"Error: {error}")
+        return 1
+    pipeline.print_timing_report(timings)
+    return int((timings['status'] == 'failed').any())
+
+def cmd_experiments(args):
+    """
+    Runs a TOML experiment spec, reusing stored results.
+    """
+    from src.analysis import experiments
+
+    try:
+        experiments.main(args.spec, args.store, args.workers, args.force)
+    except (ValueError, OSError) as error:
+        print(f"Error: {error}")
+        return 1
+    return 0
+
+def cmd_bench(args):
+    """
+    Benchmarks the hot paths on synthetic data; non-zero exit on regressions.
+    """
+    from src.benchmarks import harness
+
+    try:
+        regressions = harness.main(args.datasets, args.stages, args.repeat, not args.no_allocations, args.max_rows,
+                                   args.baseline, args.save_baseline, args.tolerance)
+    except ValueError as error:
+        print(f"Error: {error}")
+        return 1
+    return int(regressions > 0)
+
+def cmd_panel(args):
+    """
+    Backtests the strategy across many equity/bond pairs.
+    """
+    from src.analysis import panel_backtest
+
+    try:
+        panel_backtest.main(args.file, args.equities, args.bonds, args.pairs, args.start, args.end,
+                            args.workers, args.shard_size, args.synthetic, args.top)
+    except ValueError as error:
+        print(f"Error: {error}")
+        return 1
+    return 0
+
+def measure_import(module, repeat=3):
+    """
+    Cold-start import time of `module` in fresh interpreters (best of `repeat`),
+    and which HEAVY_MODULES it pulls in.
+    """
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    code = (f"import sys, time; start = time.perf_counter(); import {module}; "
+            f"elapsed = time.perf_counter() - start; "
+            f"print(elapsed); print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    best, heavy = float('inf'), []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=root, env=env, check=True)
+        lines = output.stdout.strip().splitlines()
+        best = min(best, float(lines[0]))
+        heavy = [m for m in (lines[1].split(',') if len(lines) > 1 else []) if m]
+    return best, heavy
+
+def cmd_import_time(args):
+    """
+    Checks the import-time budgets; exits non-zero if any module is over budget
+    or loads a heavy plotting/statistics package.
+    """
+    failed = False
+    print(f"{'Module':<36} {'Import':>8} {'Budget':>8}  Heavy modules loaded")
+    print("-" * 80)
+    for module, budget in IMPORT_BUDGETS:
+        seconds, heavy = measure_import(module, args.repeat)
+        budget *= args.scale
+        ok = seconds <= budget and not heavy
+        failed |= not ok
+        print(f"{module:<36} {seconds:>7.3f}s {budget:>7.2f}s  {', '.join(heavy) or '-'}{'' if ok else '  <-- FAIL'}")
+    print("-" * 80)
+    print("FAIL" if failed else "OK")
+    return int(failed)
+
+# --- Parser ---
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m src', description='Rebalancing front-running strategy toolkit.')
+    parser.add_argument('--data', default='data/Return.csv', help='returns CSV (default: %(default)s)')
+    parser.add_argument('--vix', default='data/vix.csv', help='VIX CSV (default: %(default)s)')
+    parser.add_argument('--start', default='1997-09-10', help='first date (default: %(default)s)')
+    parser.add_argument('--full-history', action='store_true', help='ignore --start and use every date')
+    parser.add_argument('--trace', metavar='PATH', help='record stage timings and write them to PATH as JSON')
+    parser.add_argument('--chrome-trace', metavar='PATH', help='also write them in Chrome trace format (chrome://tracing)')
+    parser.add_argument('--trace-memory', action='store_true', help='add peak traced memory per stage (slow)')
+    commands = parser.add_subparsers(dest='command', metavar='command')
+
+    signals = commands.add_parser('signals', help='compute and summarize the signals')
+    signals.add_argument('--tail', type=int, default=5, help='latest rows to show')
+    signals.add_argument('--output', help='write the signals to this CSV')
+    signals.set_defaults(handler=cmd_signals)
+
+    stats = commands.add_parser('stats', help='performance statistics per strategy')
+    stats.add_argument('strategies', nargs='*', metavar='strategy',
+                       help=f"any of {', '.join(STRATEGY_NAMES)} (default: all)")
+    stats.add_argument('--threshold-weight', type=float, default=0.6)
+    stats.add_argument('--vix-threshold', type=float, default=20)
+    stats.add_argument('--ma-window', type=int, default=200)
+    stats.add_argument('--buffer', type=float, default=0.02)
+    stats.set_defaults(handler=cmd_stats)
+
+    walk = commands.add_parser('walk-forward', help='stitched out-of-sample walk-forward analysis')
+    walk.add_argument('--vix-filter', action='store_true', help='walk forward the VIX-filtered strategy')
+    walk.add_argument('--vix-threshold', type=float, default=20)
+    walk.add_argument('--in-sample', type=int, default=5, help='in-sample years')
+    walk.add_argument('--out-of-sample', type=int, default=2, help='out-of-sample years')
+    walk.add_argument('--step', type=int, default=2, help='step in years')
+    walk.set_defaults(handler=cmd_walk_forward)
+
+    monte_carlo = commands.add_parser('monte-carlo', help='bootstrapped CAGR distributions')
+    monte_carlo.add_argument('--simulations', type=int, default=5000)
+    monte_carlo.add_argument('--horizons', type=int, nargs='+', default=[1, 3, 5, 10, 20])
+    monte_carlo.add_argument('--seed', type=int)
+    monte_carlo.set_defaults(handler=cmd_monte_carlo)
+
+    sensitivity = commands.add_parser('sensitivity', help='weight, normalization and VIX-threshold sensitivity')
+    sensitivity.add_argument('--plot', action='store_true', help='also render the sensitivity charts')
+    sensitivity.set_defaults(handler=cmd_sensitivity)
+
+    plots = commands.add_parser('plots', help='regenerate the plots through the build pipeline')
+    plots.add_argument('--only', nargs='+', metavar='TASK', help='tasks to build (see --list)')
+    plots.add_argument('--workers', type=int, help='process pool size')
+    plots.add_argument('--force', action='store_true', help='ignore the build cache')
+    plots.add_argument('--list', action='store_true', help='list the pipeline tasks')
+    plots.set_defaults(handler=cmd_plots)
+
+    experiment = commands.add_parser('experiments', help='run a TOML experiment spec into the result store')
+    experiment.add_argument('spec', nargs='?', default='experiments/example.toml', help='spec file (default: %(default)s)')
+    experiment.add_argument('--store', help="SQLite store (default: the spec's [store] path)")
+    experiment.add_argument('--workers', type=int, help='process pool size')
+    experiment.add_argument('--force', action='store_true', help='recompute results that are already stored')
+    experiment.set_defaults(handler=cmd_experiments)
+
+    bench = commands.add_parser('bench', help='benchmark the hot paths on scaled synthetic data')
+    bench.add_argument('--datasets', nargs='+', metavar='SCALE', help="e.g. 1x 10x 1x@78 (default: 1x 10x 100x 1x@13 1x@78)")
+    bench.add_argument('--stages', nargs='+', metavar='STAGE', help='stages to run (default: all)')
+    bench.add_argument('--repeat', type=int, default=1, help='timed runs per stage (best is kept)')
+    bench.add_argument('--no-allocations', action='store_true', help='skip the tracemalloc pass')
+    bench.add_argument('--max-rows', type=int, help='row limit for every stage (0: none; default: per-stage limits)')
+    bench.add_argument('--baseline', default='benchmarks/baseline.json', help='baseline file (default: %(default)s)')
+    bench.add_argument('--save-baseline', action='store_true', help='save these results as the new baseline')
+    bench.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown/growth before flagging (default: %(default)s)')
+    bench.set_defaults(handler=cmd_bench)
+
+    panel = commands.add_parser('panel', help='backtest many equity/bond pairs from a wide price panel')
+    panel.add_argument('--file', help='wide price CSV, one column per asset (default: the SPY/TLT pair of data/Return.csv)')
+    panel.add_argument('--equities', nargs='+', metavar='ASSET', help='equity columns (paired with every bond)')
+    panel.add_argument('--bonds', nargs='+', metavar='ASSET', help='bond columns')
+    panel.add_argument('--pairs', nargs='+', metavar='EQUITY/BOND', help='explicit pairs instead of equities x bonds')
+    panel.add_argument('--start', help='first date')
+    panel.add_argument('--end', help='last date')
+    panel.add_argument('--workers', type=int, help='process pool size (1: in-process)')
+    panel.add_argument('--shard-size', type=int, help='pairs per worker task')
+    panel.add_argument('--synthetic', nargs=2, type=int, metavar=('EQUITIES', 'BONDS'), help='use a synthetic universe')
+    panel.add_argument('--top', type=int, default=10, help='best/worst pairs to list (default: %(default)s)')
+    panel.set_defaults(handler=cmd_panel)
+
+    import_time = commands.add_parser('import-time', help='check module import-time budgets')
+    import_time.add_argument('--repeat', type=int, default=3, help='fresh interpreters per module (best is kept)')
+    import_time.add_argument('--scale', type=float, default=1.0, help='multiply every budget (slow machines)')
+    import_time.set_defaults(handler=cmd_import_time)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'stats':
+        unknown = [name for name in args.strategies if name not in STRATEGY_NAMES]
+        if unknown:
+            parser.error(f"unknown strategy {', '.join(unknown)} (choose from {', '.join(STRATEGY_NAMES)})")
+        args.strategies = args.strategies or STRATEGY_NAMES
+    if args.command is None:
+        parser.print_help()
+        return 0
+    tracing = args.trace or args.chrome_trace or args.trace_memory
+    if tracing:
+        from src.core import instrument
+        instrument.enable(memory=args.trace_memory)
+    start = time.perf_counter()
+    status = args.handler(args)
+    if args.command != 'import-time':
+        print(f"\n[{args.command} finished in {time.perf_counter() - start:.2f}s]")
+    if tracing:
+        instrument.print_summary()
+        if args.trace:
+            print(f"Trace written to {instrument.write_json(args.trace)}")
+        if args.chrome_trace:
+            print(f"Chrome trace written to {instrument.write_chrome_trace(args.chrome_trace)}")
+        instrument.disable()
+    return status
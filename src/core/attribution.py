@@ -0,0 +1,121 @@
+import pandas as pd
+import numpy as np
+from src.core.costs import leg_weights, compute_leg_costs
+
+COMPONENTS = ['threshold_leg', 'calendar_leg', 'hedge_switch', 'cost']
+
+class AttributionLedger:
+    """
+    Columnar daily P&L attribution of one strategy run. Each component is a
+    float32 array over the same dates, and the components add up to the net
+    daily return. Aggregations read the stored columns only, so any grouping
+    (month, regime, named period) is answered without re-running the strategy.
+    """
+    __slots__ = ('name', 'index', 'columns', '_prefix')
+
+    def __init__(self, name, index, columns):
+        self.name = name
+        self.index = pd.DatetimeIndex(index)
+        self.columns = {key: np.ascontiguousarray(columns[key], dtype=np.float32) for key in COMPONENTS}
+        self._prefix = None
+
+    def __len__(self):
+        return len(self.index)
+
+    def __repr__(self):
+        if len(self) == 0:
+            return f"AttributionLedger({self.name!r}, empty)"
+        return f"AttributionLedger({self.name!r}, {len(self)} days, {self.index[0]:%Y-%m-%d} to {self.index[-1]:%Y-%m-%d})"
+
+    def total(self):
+        """
+        Net daily return, the sum of all components (float64).
+        """
+        return np.sum([self.columns[key].astype(np.float64) for key in COMPONENTS], axis=0)
+
+    def to_frame(self):
+        """
+        The ledger as a DataFrame with one column per component.
+        """
+        return pd.DataFrame(self.columns, index=self.index)
+
+    def aggregate(self, by='M'):
+        """
+        Sums every component by group, where `by` is a period frequency ('M', 'Q',
+        'Y'), an array of per-day labels (e.g. a regime column), or a dict of
+        named (start, end) periods. Returns components, 'Total' and 'Days' per group.
+        """
+        if isinstance(by, dict):
+            return self._aggregate_periods(by)
+
+        labels = self.index.to_period(by) if isinstance(by, str) else np.asarray(by)
+        codes, groups = pd.factorize(labels, sort=True)
+        valid = codes >= 0
+        table = pd.DataFrame({
+            key: np.bincount(codes[valid], weights=self.columns[key][valid], minlength=len(groups))
+            for key in COMPONENTS
+        }, index=pd.Index(groups, name='group'))
+        table['Total'] = table[COMPONENTS].sum(axis=1)
+        table['Days'] = np.bincount(codes[valid], minlength=len(groups))
+        return table
+
+    def _aggregate_periods(self, periods):
+        """
+        Period sums as differences of cumulative sums, computed once per ledger.
+        """
+        if self._prefix is None:
+            stacked = np.column_stack([self.columns[key].astype(np.float64) for key in COMPONENTS])
+            self._prefix = np.vstack([np.zeros((1, len(COMPONENTS))), np.cumsum(stacked, axis=0)])
+
+        names = list(periods)
+        starts = np.array([0 if periods[n][0] is None else self.index.searchsorted(pd.Timestamp(periods[n][0]), side='left')
+                           for n in names])
+        ends = np.array([len(self) if periods[n][1] is None else self.index.searchsorted(pd.Timestamp(periods[n][1]), side='right')
+                         for n in names])
+        table = pd.DataFrame(self._prefix[ends] - self._prefix[starts], index=pd.Index(names, name='group'), columns=COMPONENTS)
+        table['Total'] = table[COMPONENTS].sum(axis=1)
+        table['Days'] = ends - starts
+        return table
+
+    def save(self, path):
+        """
+        Writes the ledger to a compressed .npz file.
+        """
+        np.savez_compressed(path, name=np.array(self.name), dates=self.index.values.astype('datetime64[D]'), **self.columns)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a ledger written by save().
+        """
+        with np.load(path) as stored:
+            return cls(str(stored['name']), pd.DatetimeIndex(stored['dates']), {key: stored[key] for key in COMPONENTS})
+
+def build_ledger(name, result, scenario=None):
+    """
+    Splits each day's return of a finished run into its components:
+      - threshold_leg / calendar_leg: each signal's share of the lagged spread
+        weight times the SPY-TLT spread, on days the spread position was held.
+      - hedge_switch: the SPY return earned on days a hedged strategy sat out
+        of the spread (100% SPY).
+      - cost: minus the per-leg trading costs of `scenario` (see src.core.costs).
+    The legs come from the run itself (result.legs, set by the array runners), so
+    threshold_leg + calendar_leg + hedge_switch equals result.returns day by day
+    and the total is the return net of costs. Raises ValueError otherwise.
+    """
+    if result.legs is None:
+        raise ValueError(f"{name}: the result carries no return legs (use an *_arrays runner)")
+    components = {key: result.legs[key] for key in ['threshold_leg', 'calendar_leg', 'hedge_switch']}
+    if not np.allclose(sum(components.values()), result.returns, rtol=0, atol=1e-12):
+        raise ValueError(f"{name}: the return legs do not add up to the strategy returns")
+
+    if scenario is None:
+        components['cost'] = np.zeros(len(result))
+    else:
+        spy_weight, tlt_weight = leg_weights(result.weight, result.hedge_active)
+        spy_costs, tlt_costs = compute_leg_costs(
+            spy_weight, tlt_weight, [scenario], spy_return=result.spy_return, tlt_return=result.tlt_return
+        )
+        components['cost'] = -(spy_costs[:, 0] + tlt_costs[:, 0])
+
+    return AttributionLedger(name, result.index, components)
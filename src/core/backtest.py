@@ -1,8 +1,10 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import statsmodels.api as sm
+from src.core.result import make_result, lagged, return_legs
+from src.core.drawdowns import max_drawdown
+from src.core.instrument import instrumented, stage
 
+@instrumented()
 def load_data(filepath, start_date=None, end_date=None):
     """
     Loads the CSV data, calculates daily returns, and filters by date.
@@ -23,6 +25,7 @@ def load_data(filepath, start_date=None, end_date=None):
         print(f"Error: The file at {filepath} was not found.")
         return None
 
+@instrumented()
 def calculate_signals(df):
     """
     Calculates signals based on the definitive methodology from the original paper.
@@ -31,80 +34,84 @@ def calculate_signals(df):
     # For each threshold delta, run an independent portfolio simulation.
     # The final signal is the average of the signals from each simulation.
     
-    all_threshold_signals = []
+    with stage('threshold_loop', rows=len(df)):
+        all_threshold_signals = []
     
-    # Per the paper, use delta from 0% to 2.5% with 0.1% increments.
-    for delta in np.arange(0.0, 0.0251, 0.001):
+        # Per the paper, use delta from 0% to 2.5% with 0.1% increments.
+        for delta in np.arange(0.0, 0.0251, 0.001):
         
-        w_equity = 0.6
-        daily_signals = []
-
-        for i in range(len(df)):
-            # Calculate the drifted weight BEFORE rebalancing
-            # This is the source of the signal for this day
-            w_drifted = (w_equity * (1 + df['SPY_return'].iloc[i])) / \
-                        (w_equity * (1 + df['SPY_return'].iloc[i]) + (1 - w_equity) * (1 + df['TLT_return'].iloc[i]))
+            w_equity = 0.6
+            daily_signals = []
+
+            for i in range(len(df)):
+                # Calculate the drifted weight BEFORE rebalancing
+                # This is the source of the signal for this day
+                w_drifted = (w_equity * (1 + df['SPY_return'].iloc[i])) / \
+                            (w_equity * (1 + df['SPY_return'].iloc[i]) + (1 - w_equity) * (1 + df['TLT_return'].iloc[i]))
             
-            signal = w_drifted - 0.6
-            daily_signals.append(signal)
+                signal = w_drifted - 0.6
+                daily_signals.append(signal)
             
-            # Now, check if a rebalance is needed for the NEXT day's starting weight
-            if abs(w_drifted - 0.6) >= delta:
-                w_equity = 0.6
-            else:
-                w_equity = w_drifted
+                # Now, check if a rebalance is needed for the NEXT day's starting weight
+                if abs(w_drifted - 0.6) >= delta:
+                    w_equity = 0.6
+                else:
+                    w_equity = w_drifted
         
-        all_threshold_signals.append(pd.Series(daily_signals, index=df.index))
+            all_threshold_signals.append(pd.Series(daily_signals, index=df.index))
 
-    # The final signal is the average of all individual threshold signals
-    df['avg_threshold_signal'] = pd.concat(all_threshold_signals, axis=1).mean(axis=1)
+        # The final signal is the average of all individual threshold signals
+        df['avg_threshold_signal'] = pd.concat(all_threshold_signals, axis=1).mean(axis=1)
     avg_threshold_signal = df['avg_threshold_signal']
     
     # --- Calendar Signal (Paper Implementation) ---
     # The Calendar signal is based on a simple monthly rebalance simulation.
-    w_equity_calendar = 0.6
-    calendar_signals = []
-    for i in range(len(df)):
-        w_drifted = (w_equity_calendar * (1 + df['SPY_return'].iloc[i])) / \
-                    (w_equity_calendar * (1 + df['SPY_return'].iloc[i]) + (1 - w_equity_calendar) * (1 + df['TLT_return'].iloc[i]))
+    with stage('calendar_loop', rows=len(df)):
+        w_equity_calendar = 0.6
+        calendar_signals = []
+        for i in range(len(df)):
+            w_drifted = (w_equity_calendar * (1 + df['SPY_return'].iloc[i])) / \
+                        (w_equity_calendar * (1 + df['SPY_return'].iloc[i]) + (1 - w_equity_calendar) * (1 + df['TLT_return'].iloc[i]))
         
-        signal = w_drifted - 0.6
-        calendar_signals.append(signal)
+            signal = w_drifted - 0.6
+            calendar_signals.append(signal)
         
-        # Rebalance on the last business day of the month
-        if i < len(df) - 1 and df.index[i].month != df.index[i+1].month:
-            w_equity_calendar = 0.6
-        else:
-            w_equity_calendar = w_drifted
+            # Rebalance on the last business day of the month
+            if i < len(df) - 1 and df.index[i].month != df.index[i+1].month:
+                w_equity_calendar = 0.6
+            else:
+                w_equity_calendar = w_drifted
             
-    df['calendar_signal_raw'] = pd.Series(calendar_signals, index=df.index)
+        df['calendar_signal_raw'] = pd.Series(calendar_signals, index=df.index)
 
     # 4. Normalize and invert the signal as described.
     normalization_constant = 0.012
     df['modified_threshold_signal'] = - (avg_threshold_signal / normalization_constant)
 
     # --- Modified Calendar Signal (Blog Implementation) ---
-    df['days_to_month_end'] = df.groupby(df.index.to_period('M')).cumcount(ascending=False)
-    df['modified_calendar_signal'] = 0
+    with stage('calendar_signal', rows=len(df)):
+        df['days_to_month_end'] = df.groupby(df.index.to_period('M')).cumcount(ascending=False)
+        df['modified_calendar_signal'] = 0
     
-    trade_days = (df['days_to_month_end'] >= 1) & (df['days_to_month_end'] <= 4)
-    df.loc[trade_days, 'modified_calendar_signal'] = -np.sign(df['calendar_signal_raw'][trade_days])
+        trade_days = (df['days_to_month_end'] >= 1) & (df['days_to_month_end'] <= 4)
+        df.loc[trade_days, 'modified_calendar_signal'] = -np.sign(df['calendar_signal_raw'][trade_days])
 
-    signal_on_5th_last_day = -np.sign(df['calendar_signal_raw'][df['days_to_month_end'] == 4])
-    monthly_reversion_signal_source = signal_on_5th_last_day.resample('ME').last()
-    previous_month_signal = monthly_reversion_signal_source.shift(1)
+        signal_on_5th_last_day = -np.sign(df['calendar_signal_raw'][df['days_to_month_end'] == 4])
+        monthly_reversion_signal_source = signal_on_5th_last_day.resample('ME').last()
+        previous_month_signal = monthly_reversion_signal_source.shift(1)
     
-    df['YYYY-MM'] = df.index.to_period('M')
-    previous_month_signal.index = previous_month_signal.index.to_period('M')
-    df['reversion_signal'] = df['YYYY-MM'].map(previous_month_signal)
-    
-    last_day_mask = df['days_to_month_end'] == 0
-    df.loc[last_day_mask, 'modified_calendar_signal'] = -df.loc[last_day_mask, 'reversion_signal']
+        df['YYYY-MM'] = df.index.to_period('M')
+        previous_month_signal.index = previous_month_signal.index.to_period('M')
+        df['reversion_signal'] = df['YYYY-MM'].map(previous_month_signal)
     
+        last_day_mask = df['days_to_month_end'] == 0
+        df.loc[last_day_mask, 'modified_calendar_signal'] = -df.loc[last_day_mask, 'reversion_signal']
+
     df = df.drop(columns=['YYYY-MM', 'reversion_signal', 'days_to_month_end', 'calendar_signal_raw'])
     
     return df
 
+@instrumented()
 def run_strategy(df):
     """
     Calculates the unscaled strategy returns, removing all scaling logic.
@@ -123,10 +130,28 @@ def run_strategy(df):
 
     return df
 
+@instrumented()
+def run_strategy_arrays(df, threshold_weight=0.6, calendar_weight=0.4):
+    """
+    Copy-free version of run_strategy. Reads the signal columns as arrays, leaves
+    df untouched and returns a BacktestResult.
+    """
+    threshold_signal = df['modified_threshold_signal'].to_numpy(dtype=np.float64)
+    calendar_signal = df['modified_calendar_signal'].to_numpy(dtype=np.float64)
+    spy_return = df['SPY_return'].to_numpy(dtype=np.float64)
+    tlt_return = df['TLT_return'].to_numpy(dtype=np.float64)
+
+    weight = threshold_weight * threshold_signal + calendar_weight * calendar_signal
+    returns = lagged(weight) * (spy_return - tlt_return)
+
+    legs = return_legs(spy_return - tlt_return, threshold_weight * threshold_signal, calendar_weight * calendar_signal)
+    return make_result(df.index, weight, returns, spy_return, tlt_return, inputs=(threshold_signal, calendar_signal), legs=legs)
+
 def plot_performance(df):
     """
     Saves the cumulative returns plot of the strategy vs. the benchmark.
     """
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(12, 8))
     plt.plot(df.index, df['cumulative_strategy_return'], label='Front-Running Strategy')
     plt.plot(df.index, df['cumulative_spy_return'], label='S&P 500 (SPY)')
@@ -147,18 +172,12 @@ def calculate_statistics(df):
     strategy_cagr = (df['cumulative_strategy_return'].iloc[-1])**(252/len(df)) - 1
     strategy_volatility = df['strategy_return'].std() * np.sqrt(252)
     strategy_sharpe = strategy_cagr / strategy_volatility if strategy_volatility > 0 else 0
-    strategy_cumulative_returns = (1 + df['strategy_return']).cumprod()
-    strategy_peak = strategy_cumulative_returns.cummax()
-    strategy_drawdown = (strategy_cumulative_returns - strategy_peak) / strategy_peak
-    strategy_max_drawdown = strategy_drawdown.min()
+    strategy_max_drawdown = max_drawdown(df['strategy_return'])
 
     spy_cagr = (df['cumulative_spy_return'].iloc[-1])**(252/len(df)) - 1
     spy_volatility = df['SPY_return'].std() * np.sqrt(252)
     spy_sharpe = spy_cagr / spy_volatility if spy_volatility > 0 else 0
-    spy_cumulative_returns = (1 + df['SPY_return']).cumprod()
-    spy_peak = spy_cumulative_returns.cummax()
-    spy_drawdown = (spy_cumulative_returns - spy_peak) / spy_peak
-    spy_max_drawdown = spy_drawdown.min()
+    spy_max_drawdown = max_drawdown(df['SPY_return'])
 
     print("\n--- Performance Statistics ---")
     print(f"{'Metric':<20} {'Strategy':<15} {'S&P 500 (SPY)':<15}")
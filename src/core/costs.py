@@ -0,0 +1,133 @@
+import pandas as pd
+import numpy as np
+from src.core.metrics import performance_table
+
+# Every cost scenario is a plain dict; missing keys fall back to these defaults.
+# Rates are in basis points per unit of notional traded on that leg, ADV and AUM
+# in dollars, and the borrow rate is annualized on the short notional.
+DEFAULT_COST_SCENARIO = {
+    'spy_bps': 0.0,
+    'tlt_bps': 0.0,
+    'spy_half_spread_bps': 0.0,
+    'tlt_half_spread_bps': 0.0,
+    'impact_coefficient': 0.0,
+    'aum': 1e8,
+    'spy_adv': 2.5e10,
+    'tlt_adv': 1.5e9,
+    'borrow_rate': 0.0,
+}
+
+def linear_cost_scenarios(bps_list):
+    """
+    Builds flat per-leg bps scenarios: `bps` charged on the notional traded on
+    each leg.
+    """
+    return [
+        {'name': f"{bps} bps", 'spy_bps': bps, 'tlt_bps': bps}
+        for bps in bps_list
+    ]
+
+def leg_weights(strategy_weight, hedge_active=None):
+    """
+    Splits a strategy weight into its SPY and TLT leg weights.
+    Spread strategies hold +w SPY / -w TLT. When hedge_active is given, inactive
+    days are a plain 100% SPY position (strategy_weight == 1) with no TLT leg.
+    """
+    weight = np.asarray(strategy_weight, dtype=np.float64)
+    spy_weight = weight
+    tlt_weight = -weight
+
+    if hedge_active is not None:
+        active = np.asarray(hedge_active, dtype=bool)
+        if active.ndim < weight.ndim:
+            active = active.reshape(active.shape + (1,) * (weight.ndim - active.ndim))
+        tlt_weight = np.where(active, -weight, 0.0)
+
+    return spy_weight, tlt_weight
+
+def leg_turnover(leg_weight):
+    """
+    Absolute daily change of a leg weight. The first day has no trade.
+    """
+    leg_weight = np.asarray(leg_weight, dtype=np.float64)
+    return np.abs(np.diff(leg_weight, axis=0, prepend=leg_weight[:1]))
+
+def _scenario_arrays(scenarios):
+    """
+    Turns a list of scenario dicts into one float array per parameter.
+    """
+    return {
+        key: np.array([s.get(key, default) for s in scenarios], dtype=np.float64)
+        for key, default in DEFAULT_COST_SCENARIO.items()
+    }
+
+def _leg_volatility(leg_return, num_days, vol_window):
+    """
+    Rolling daily volatility of a leg, back-filled over the warm-up window.
+    """
+    if leg_return is None:
+        return np.zeros(num_days)
+    vol = pd.Series(np.asarray(leg_return, dtype=np.float64)).rolling(vol_window, min_periods=2).std()
+    return vol.bfill().fillna(0).to_numpy()
+
+def _single_leg_cost(weight, bps, half_spread_bps, impact_coefficient, aum, adv, borrow_rate, daily_vol):
+    """
+    Daily cost drag of one leg for every scenario (last axis).
+    """
+    turnover = leg_turnover(weight)[..., None]
+    held = np.concatenate([np.zeros_like(weight[:1]), weight[:-1]], axis=0)
+    short_exposure = np.maximum(-held, 0)[..., None]
+    daily_vol = daily_vol.reshape(daily_vol.shape + (1,) * weight.ndim)
+
+    linear = turnover * ((bps + half_spread_bps) / 10000.0)
+    impact = impact_coefficient * daily_vol * turnover * np.sqrt(turnover * aum / adv)
+    borrow = short_exposure * (borrow_rate / 252)
+
+    return linear + impact + borrow
+
+def compute_leg_costs(spy_weight, tlt_weight, scenarios, spy_return=None, tlt_return=None, vol_window=21):
+    """
+    Evaluates every cost scenario against one precomputed set of leg weights.
+    Weights may be (days,) or (days x N); the result has one extra trailing axis
+    with one entry per scenario and is expressed as a daily return drag.
+    """
+    spy_weight = np.asarray(spy_weight, dtype=np.float64)
+    tlt_weight = np.asarray(tlt_weight, dtype=np.float64)
+    params = _scenario_arrays(scenarios)
+    num_days = spy_weight.shape[0]
+
+    spy_costs = _single_leg_cost(
+        spy_weight, params['spy_bps'], params['spy_half_spread_bps'],
+        params['impact_coefficient'], params['aum'], params['spy_adv'],
+        params['borrow_rate'], _leg_volatility(spy_return, num_days, vol_window)
+    )
+    tlt_costs = _single_leg_cost(
+        tlt_weight, params['tlt_bps'], params['tlt_half_spread_bps'],
+        params['impact_coefficient'], params['aum'], params['tlt_adv'],
+        params['borrow_rate'], _leg_volatility(tlt_return, num_days, vol_window)
+    )
+    return spy_costs, tlt_costs
+
+def run_cost_grid(df, scenarios):
+    """
+    Applies a list of cost scenarios to a finished strategy run in a single pass.
+    Returns the net performance statistics per scenario and the (days x scenarios)
+    matrix of net returns.
+    """
+    hedge_active = df['hedge_active'].to_numpy() if 'hedge_active' in df else None
+    spy_weight, tlt_weight = leg_weights(df['strategy_weight'].to_numpy(), hedge_active)
+
+    spy_costs, tlt_costs = compute_leg_costs(
+        spy_weight, tlt_weight, scenarios,
+        spy_return=df['SPY_return'].to_numpy(),
+        tlt_return=df['TLT_return'].to_numpy()
+    )
+    net_returns = df['strategy_return'].to_numpy()[:, None] - spy_costs - tlt_costs
+
+    names = [s.get('name', f"scenario {i}") for i, s in enumerate(scenarios)]
+    stats = performance_table(net_returns, names=names)
+    stats['SPY Cost (ann.)'] = spy_costs.mean(axis=0) * 252
+    stats['TLT Cost (ann.)'] = tlt_costs.mean(axis=0) * 252
+    stats['Gross Leg Turnover'] = (leg_turnover(spy_weight).mean() + leg_turnover(tlt_weight).mean()) * 252
+
+    return stats, pd.DataFrame(net_returns, index=df.index, columns=names)
@@ -0,0 +1,127 @@
+import pandas as pd
+import numpy as np
+
+def drawdown_series(returns):
+    """
+    Drawdown from the running peak of the compounded equity curve for every
+    column of a (days x N) return matrix. Missing returns are skipped like
+    pandas' cumprod/cummax, and their drawdown is NaN.
+    """
+    values = np.asarray(returns, dtype=np.float64)
+    missing = np.isnan(values)
+    growth = np.cumprod(1 + np.where(missing, 0.0, values), axis=0)
+    growth[missing] = np.nan
+    peak = np.fmax.accumulate(growth, axis=0)
+    return growth / peak - 1
+
+def max_drawdown(returns):
+    """
+    Deepest drawdown of each column (a float for 1-D input).
+    """
+    return np.nanmin(drawdown_series(returns), axis=0)
+
+def find_drawdowns(returns, names=None, index=None, min_depth=0.0):
+    """
+    Extracts every drawdown episode of every column of a (days x N) return
+    matrix in one pass over a run-length encoding of the underwater days.
+    An episode runs from the last peak to the first day back at that peak.
+    Returns one row per episode with its peak, trough, recovery (NaT if still
+    underwater), depth and durations in trading days.
+    """
+    if isinstance(returns, (pd.Series, pd.DataFrame)):
+        index = returns.index if index is None else index
+        if names is None:
+            names = [returns.name] if isinstance(returns, pd.Series) else list(returns.columns)
+    drawdown = drawdown_series(returns)
+    if drawdown.ndim == 1:
+        drawdown = drawdown[:, None]
+    num_days, num_series = drawdown.shape
+    names = list(range(num_series)) if names is None else list(names)
+    index = pd.RangeIndex(num_days) if index is None else index
+
+    # --- Run-length encode the underwater days of every column at once ---
+    underwater = drawdown.T < 0                                      # series x days
+    padded = np.zeros((num_series, num_days + 2), dtype=np.int8)
+    padded[:, 1:-1] = underwater
+    edges = np.diff(padded, axis=1)
+    series_id, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)                                # exclusive: recovery day
+
+    # --- Depth and trough of each episode via segment reductions ---
+    lengths = ends - starts
+    offsets = np.cumsum(lengths) - lengths
+    rows = np.arange(lengths.sum()) - np.repeat(offsets, lengths) + np.repeat(starts, lengths)
+    episode_days = drawdown[rows, np.repeat(series_id, lengths)]
+    if len(rows):
+        depth = np.minimum.reduceat(episode_days, offsets)
+        at_trough = np.flatnonzero(episode_days == np.repeat(depth, lengths))
+        episode_id = np.repeat(np.arange(len(starts)), lengths)
+        _, first_hit = np.unique(episode_id[at_trough], return_index=True)
+        troughs = rows[at_trough[first_hit]]
+    else:
+        depth, troughs = np.zeros(0), np.zeros(0, dtype=np.int64)
+
+    keep = depth <= -min_depth
+    series_id, starts, ends, troughs, depth = series_id[keep], starts[keep], ends[keep], troughs[keep], depth[keep]
+    peaks = starts - 1                                               # day 0 is always at its own peak
+    recovered = ends < num_days
+
+    return pd.DataFrame({
+        'series': np.asarray(names, dtype=object)[series_id],
+        'peak': index[peaks],
+        'trough': index[troughs],
+        'recovery': pd.Series(index[np.minimum(ends, num_days - 1)]).where(recovered),
+        'depth': depth,
+        'time_to_trough': troughs - peaks,
+        'time_to_recovery': np.where(recovered, ends - troughs, -1),
+        'duration': ends - peaks,
+        'time_under_water': ends - starts,
+        'recovered': recovered,
+    })
+
+def ulcer_index(returns):
+    """
+    Root-mean-square drawdown of each column.
+    """
+    return np.sqrt(np.nanmean(drawdown_series(returns) ** 2, axis=0))
+
+def conditional_drawdown_at_risk(returns, alpha=0.95):
+    """
+    Average of the worst (1 - alpha) share of daily drawdowns of each column.
+    """
+    drawdown = np.sort(drawdown_series(returns), axis=0)             # deepest first, NaN last
+    counts = np.sum(~np.isnan(drawdown), axis=0)
+    tail = np.maximum(np.ceil(np.round((1 - alpha) * counts, 9)).astype(np.int64), 1)
+    ranks = np.arange(drawdown.shape[0])
+    if drawdown.ndim == 1:
+        return drawdown[:tail].mean()
+    return np.nanmean(np.where(ranks[:, None] < tail[None, :], drawdown, np.nan), axis=0)
+
+def drawdown_profile(returns, names=None, alpha=0.95):
+    """
+    One row of drawdown statistics per column of a (days x N) return matrix.
+    """
+    values = np.asarray(returns, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    if names is None:
+        names = list(returns.columns) if isinstance(returns, pd.DataFrame) else range(values.shape[1])
+
+    episodes = find_drawdowns(values)
+    grouped = episodes.groupby('series')
+    num_series = values.shape[1]
+
+    def per_series(column, reducer, fill):
+        out = np.full(num_series, fill, dtype=np.float64)
+        result = reducer(grouped[column])
+        out[result.index.to_numpy(dtype=np.int64)] = result.to_numpy()
+        return out
+
+    return pd.DataFrame({
+        'Max Drawdown': max_drawdown(values),
+        'Ulcer Index': ulcer_index(values),
+        f'CDaR ({alpha:.0%})': conditional_drawdown_at_risk(values, alpha),
+        'Episodes': per_series('depth', lambda g: g.count(), 0).astype(int),
+        'Longest Under Water': per_series('time_under_water', lambda g: g.max(), 0).astype(int),
+        'Average Under Water': per_series('time_under_water', lambda g: g.mean(), 0),
+    }, index=names if isinstance(names, pd.Index) else pd.Index(names))
@@ -0,0 +1,24 @@
+import numpy as np
+
+def apply_no_trade_band(target_weight, bands, speeds, initial_weight=0.0):
+    """
+    Simulates a no-trade-band execution layer for every (band, speed) pair at once.
+    The holding only moves when the target drifts more than `band` away from it,
+    and then closes `speed` of the gap (speed 1 trades fully to target).
+    Returns the held weights as a (days x bands x speeds) array.
+    """
+    target_weight = np.asarray(target_weight, dtype=np.float64)
+    bands = np.asarray(bands, dtype=np.float64)[:, None]
+    speeds = np.asarray(speeds, dtype=np.float64)[None, :]
+
+    held = np.empty((len(target_weight), bands.shape[0], speeds.shape[1]))
+    current = np.full(held.shape[1:], initial_weight, dtype=np.float64)
+
+    # Path dependent, so step through time but update the whole grid per day
+    for i, target in enumerate(target_weight):
+        if np.isfinite(target):
+            gap = target - current
+            current = np.where(np.abs(gap) > bands, current + speeds * gap, current)
+        held[i] = current
+
+    return held
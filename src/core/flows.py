@@ -0,0 +1,123 @@
+import pandas as pd
+import numpy as np
+
+# Archetypal rebalancers: (frequency, fiscal_month, target, band, aum_share).
+# Frequency is 'D' (checked daily), 'M', 'Q' or 'A'; quarterly and annual
+# schedules are aligned to the fiscal year-end month.
+DEFAULT_POPULATION = [
+    ('M', 12, 0.60, 0.00, 0.15),    # monthly 60/40, as in calculate_signals
+    ('Q', 12, 0.60, 0.00, 0.20),    # calendar-quarter pensions
+    ('Q', 12, 0.70, 0.02, 0.10),    # equity-heavy pensions with a tolerance band
+    ('Q', 6, 0.55, 0.00, 0.10),     # June fiscal year, off-cycle quarters
+    ('A', 12, 0.60, 0.00, 0.10),    # calendar year-end rebalancers
+    ('A', 6, 0.60, 0.00, 0.10),     # June fiscal year-end
+    ('A', 9, 0.50, 0.00, 0.05),     # September fiscal year-end (endowments)
+    ('D', 12, 0.60, 0.05, 0.20),    # threshold-only rebalancers
+]
+
+def make_population(rows=DEFAULT_POPULATION):
+    """
+    Builds a population table from (frequency, fiscal_month, target, band, aum_share)
+    rows, with AUM shares normalized to sum to one.
+    """
+    population = pd.DataFrame(rows, columns=['frequency', 'fiscal_month', 'target', 'band', 'aum_share'])
+    population['aum_share'] = population['aum_share'] / population['aum_share'].sum()
+    return population
+
+def random_population(size, seed=0, rows=DEFAULT_POPULATION):
+    """
+    Samples `size` synthetic rebalancers around the archetypes: each draws an
+    archetype in proportion to its AUM share, then jitters its target and band.
+    """
+    rng = np.random.default_rng(seed)
+    base = make_population(rows)
+    population = base.iloc[rng.choice(len(base), size=size, p=base['aum_share'])].reset_index(drop=True)
+    population['target'] = np.clip(population['target'] + rng.normal(0, 0.05, size), 0.2, 0.9)
+    population['band'] = np.maximum(population['band'] + rng.normal(0, 0.005, size) * (population['band'] > 0), 0)
+    population['aum_share'] = rng.lognormal(0, 1, size)
+    population['aum_share'] /= population['aum_share'].sum()
+    return population
+
+def rebalance_schedule(index, frequency, fiscal_month):
+    """
+    Boolean mask of the scheduled rebalance days for one calendar: the last
+    trading day of each month ('M'), of each fiscal quarter ('Q') or of the
+    fiscal year ('A'), or every day ('D').
+    """
+    if frequency == 'D':
+        return np.ones(len(index), dtype=bool)
+    periods = index.to_period('M')
+    month_end = np.concatenate([periods[1:] != periods[:-1], [True]])
+    months_after_fiscal_end = (index.month - fiscal_month) % 12
+    if frequency == 'Q':
+        return month_end & (months_after_fiscal_end % 3 == 0)
+    if frequency == 'A':
+        return month_end & (months_after_fiscal_end == 0)
+    return month_end
+
+def _days_to_next(schedule):
+    """
+    Trading days until the next scheduled day (0 on the day itself) for every
+    column of a (days x calendars) schedule; a large number if none remains.
+    """
+    num_days = schedule.shape[0]
+    positions = np.where(schedule, np.arange(num_days)[:, None], num_days * 2)
+    next_position = np.minimum.accumulate(positions[::-1], axis=0)[::-1]
+    return next_position - np.arange(num_days)[:, None]
+
+def simulate_rebalancer_flows(df, population, horizon=5):
+    """
+    Simulates every rebalancer of `population` over the SPY/TLT returns in `df`.
+    The population is held as arrays and the day loop updates all of them with
+    vector operations, so its cost barely depends on the population size.
+
+    Returns a DataFrame with:
+      - rebalance_flow: equity bought (+) or sold (-) that day, as a share of AUM.
+      - flow_imbalance: equity flow still owed after the close by rebalancers whose
+        next scheduled date is within `horizon` trading days and whose drift
+        exceeds their band.
+    """
+    spy_return = df['SPY_return'].to_numpy(dtype=np.float64)
+    tlt_return = df['TLT_return'].to_numpy(dtype=np.float64)
+    target = population['target'].to_numpy(dtype=np.float64)
+    band = population['band'].to_numpy(dtype=np.float64)
+    share = population['aum_share'].to_numpy(dtype=np.float64)
+
+    # --- One schedule per distinct calendar; members index into it ---
+    calendars = population[['frequency', 'fiscal_month']].drop_duplicates().reset_index(drop=True)
+    calendar_id = population.merge(calendars.reset_index(), on=['frequency', 'fiscal_month'], how='left')['index'].to_numpy()
+    schedule = np.column_stack([
+        rebalance_schedule(df.index, row.frequency, row.fiscal_month) for row in calendars.itertuples()
+    ])
+    upcoming = _days_to_next(schedule) <= horizon
+
+    weight = target.copy()
+    flow = np.empty(len(df))
+    imbalance = np.empty(len(df))
+    for day in range(len(df)):
+        spy_growth = weight * (1 + spy_return[day])
+        weight = spy_growth / (spy_growth + (1 - weight) * (1 + tlt_return[day]))
+        gap = target - weight
+        rebalancing = (np.abs(gap) >= band) & schedule[day, calendar_id]
+        flow[day] = np.dot(share, gap * rebalancing)
+        weight = np.where(rebalancing, target, weight)
+
+        # Flow still owed after today's close, i.e. tradable from tomorrow
+        gap = target - weight
+        imbalance[day] = np.dot(share, gap * ((np.abs(gap) >= band) & upcoming[day, calendar_id]))
+
+    return pd.DataFrame({'rebalance_flow': flow, 'flow_imbalance': imbalance}, index=df.index)
+
+def add_flow_signals(df, population=None, horizon=5, normalization_constant=0.012):
+    """
+    Adds the rebalancer flow columns and a 'flow_signal' weight to `df`. The
+    signal leans with the owed flow, scaled like modified_threshold_signal and
+    capped at +/-1.
+    """
+    if population is None:
+        population = make_population()
+    flows = simulate_rebalancer_flows(df, population, horizon=horizon)
+    df['rebalance_flow'] = flows['rebalance_flow']
+    df['flow_imbalance'] = flows['flow_imbalance']
+    df['flow_signal'] = np.clip(df['flow_imbalance'] / normalization_constant, -1, 1)
+    return df
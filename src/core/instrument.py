@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import threading
+import functools
+import tracemalloc
+import pandas as pd
+
+# Opt-in stage instrumentation. While disabled (the default) `stage` returns a
+# shared no-op span and `instrumented` functions go straight to the original, so
+# the hooks can stay in the hot paths.
+
+_trace = None
+_local = threading.local()
+
+class _NullSpan:
+    """
+    Stand-in span while tracing is off: every operation is a no-op.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class _Trace:
+    """
+    The recorded spans plus the clock and memory settings of one tracing session.
+    """
+    __slots__ = ('spans', 'memory', 'epoch', 'origin', 'lock')
+
+    def __init__(self, memory):
+        self.spans = []
+        self.memory = memory
+        # Wall-clock anchor so spans recorded in worker processes line up
+        self.epoch = time.time()
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def now_us(self):
+        return (self.epoch + time.perf_counter() - self.origin) * 1e6
+
+class Span:
+    """
+    One timed stage: wall and CPU time, row count, nesting depth and, with memory
+    tracking, the peak of traced allocations above the level at entry.
+    """
+    __slots__ = ('name', 'category', 'fields', 'start', 'cpu_start', 'memory_start', 'child_peak', 'parent', 'depth')
+
+    def __init__(self, name, category, fields):
+        self.name = name
+        self.category = category
+        self.fields = fields
+
+    def set(self, **fields):
+        """
+        Adds fields to the record (e.g. rows=len(result) once known).
+        """
+        self.fields.update(fields)
+
+    def __enter__(self):
+        trace = _trace
+        self.parent = getattr(_local, 'span', None)
+        self.depth = 0 if self.parent is None else self.parent.depth + 1
+        _local.span = self
+        if trace.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent is not None:
+                self.parent.child_peak = max(self.parent.child_peak, peak)
+            tracemalloc.reset_peak()
+            self.memory_start, self.child_peak = current, current
+        self.cpu_start = time.thread_time()
+        self.start = trace.now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        trace = _trace
+        end = trace.now_us()
+        record = {
+            'name': self.name,
+            'category': self.category,
+            'start_us': self.start,
+            'wall_ms': (end - self.start) / 1000,
+            'cpu_ms': (time.thread_time() - self.cpu_start) * 1000,
+            'depth': self.depth,
+            'parent': None if self.parent is None else self.parent.name,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+        }
+        if trace.memory:
+            peak = max(self.child_peak, tracemalloc.get_traced_memory()[1])
+            record['peak_mb'] = (peak - self.memory_start) / 2**20
+            if self.parent is not None:
+                self.parent.child_peak = max(self.parent.child_peak, peak)
+            tracemalloc.reset_peak()
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        record.update(self.fields)
+        _local.span = self.parent
+        with trace.lock:
+            trace.spans.append(record)
+        return False
+
+# --- Hooks ---
+
+def stage(name, category='stage', **fields):
+    """
+    Context manager timing a block as one span, e.g.
+        with stage('vix_join') as span:
+            ...
+            span.set(rows=len(df))
+    """
+    if _trace is None:
+        return _NULL_SPAN
+    return Span(name, category, fields)
+
+def _row_count(value):
+    if isinstance(value, tuple):
+        value = value[0] if value else None
+    return len(value) if hasattr(value, '__len__') and not isinstance(value, (str, bytes, dict)) else None
+
+def instrumented(name=None, category='stage'):
+    """
+    Decorator recording every call as a span named after the function. The row
+    count is the length of the return value, or of the first argument when the
+    result has none.
+    """
+    def decorate(function):
+        span_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _trace is None:
+                return function(*args, **kwargs)
+            with Span(span_name, category, {}) as span:
+                result = function(*args, **kwargs)
+                rows = _row_count(result)
+                if rows is None and args:
+                    rows = _row_count(args[0])
+                span.set(rows=rows)
+            return result
+        return wrapper
+    return decorate
+
+# --- Session ---
+
+def enable(memory=False):
+    """
+    Starts recording (discarding earlier spans). With `memory`, tracemalloc runs
+    as well and every span gets its peak traced allocations, at a large slowdown.
+    """
+    global _trace
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _trace = _Trace(memory)
+    _local.span = None
+
+def disable():
+    """
+    Stops recording and returns the spans recorded so far.
+    """
+    global _trace
+    recorded = [] if _trace is None else _trace.spans
+    if _trace is not None and _trace.memory:
+        tracemalloc.stop()
+    _trace = None
+    return recorded
+
+def is_enabled():
+    return _trace is not None
+
+def worker_config():
+    """
+    Arguments for enable() in a worker process (None while tracing is off), for
+    pool initializers.
+    """
+    return None if _trace is None else {'memory': _trace.memory}
+
+def drain():
+    """
+    Removes and returns the spans recorded so far, e.g. to ship them from a
+    worker to the parent process.
+    """
+    if _trace is None:
+        return []
+    with _trace.lock:
+        recorded, _trace.spans = _trace.spans, []
+    return recorded
+
+def merge(records):
+    """
+    Adds spans recorded elsewhere (another process) to the current trace.
+    """
+    if _trace is not None and records:
+        with _trace.lock:
+            _trace.spans.extend(records)
+
+def spans():
+    return [] if _trace is None else list(_trace.spans)
+
+# --- Export ---
+
+def summary(records=None):
+    """
+    Spans aggregated by name: calls, total and mean wall time, CPU time, rows and
+    (with memory tracking) the largest peak, slowest first.
+    """
+    records = spans() if records is None else records
+    if not records:
+        return pd.DataFrame()
+    frame = pd.DataFrame(records)
+    aggregations = {'calls': ('wall_ms', 'size'), 'wall_ms': ('wall_ms', 'sum'), 'mean_ms': ('wall_ms', 'mean'),
+                    'cpu_ms': ('cpu_ms', 'sum')}
+    if 'rows' in frame:
+        aggregations['rows'] = ('rows', 'max')
+    if 'peak_mb' in frame:
+        aggregations['peak_mb'] = ('peak_mb', 'max')
+    table = frame.groupby('name').agg(**aggregations).sort_values('wall_ms', ascending=False)
+    if 'rows' in table:
+        table['rows'] = table['rows'].astype('Int64')
+    return table
+
+def print_summary(records=None):
+    table = summary(records)
+    if table.empty:
+        print("No spans recorded.")
+        return
+    print("\n--- Stage Profile ---")
+    print(table.round(2).to_string())
+
+def write_json(path, records=None):
+    """
+    Writes the spans (start times relative to the first span) as JSON.
+    """
+    records = spans() if records is None else records
+    origin = min((record['start_us'] for record in records), default=0)
+    output = [dict(record, start_ms=(record['start_us'] - origin) / 1000) for record in records]
+    for record in output:
+        del record['start_us']
+    with open(path, 'w') as handle:
+        json.dump({'spans': sorted(output, key=lambda record: record['start_ms'])}, handle, indent=1, default=str)
+    return path
+
+def write_chrome_trace(path, records=None):
+    """
+    Writes the spans in the Chrome trace-event format (chrome://tracing, Perfetto).
+    """
+    records = spans() if records is None else records
+    origin = min((record['start_us'] for record in records), default=0)
+    standard = {'name', 'category', 'start_us', 'wall_ms', 'pid', 'tid', 'depth', 'parent'}
+    events = [{
+        'name': record['name'],
+        'cat': record['category'],
+        'ph': 'X',
+        'ts': record['start_us'] - origin,
+        'dur': record['wall_ms'] * 1000,
+        'pid': record['pid'],
+        'tid': record['tid'],
+        'args': {key: value for key, value in record.items() if key not in standard},
+    } for record in records]
+    with open(path, 'w') as handle:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, handle, default=str)
+    return path
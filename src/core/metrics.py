@@ -0,0 +1,29 @@
+import pandas as pd
+import numpy as np
+from src.core.drawdowns import max_drawdown
+
+def performance_table(returns, names=None, periods_per_year=252):
+    """
+    Calculates CAGR, volatility, Sharpe ratio and max drawdown for every column
+    of a (days x N) return matrix at once, using the same definitions as
+    calculate_statistics.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.ndim == 1:
+        returns = returns[:, None]
+    num_days = returns.shape[0]
+
+    growth = np.prod(1 + returns, axis=0)
+    cagr = growth ** (periods_per_year / num_days) - 1
+    volatility = returns.std(axis=0, ddof=1) * np.sqrt(periods_per_year)
+    sharpe = np.divide(cagr, volatility, out=np.zeros_like(cagr), where=volatility > 0)
+
+    if names is None:
+        names = range(returns.shape[1])
+
+    return pd.DataFrame({
+        'CAGR': cagr,
+        'Volatility': volatility,
+        'Sharpe Ratio': sharpe,
+        'Max Drawdown': max_drawdown(returns),
+    }, index=names if isinstance(names, pd.Index) else pd.Index(names))
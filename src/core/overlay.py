@@ -0,0 +1,87 @@
+import pandas as pd
+import numpy as np
+from src.core.metrics import performance_table
+
+SLEEVES = ['SPY', 'TLT', 'Overlay']
+
+def sleeve_returns(spy_return, tlt_return, overlay_return):
+    """
+    Aligns the three sleeves into one (days x sleeves) return DataFrame. The
+    overlay is a spread strategy, so it adds on top of a fully invested core.
+    """
+    sleeves = pd.concat([spy_return, tlt_return, overlay_return], axis=1, keys=SLEEVES)
+    return sleeves.dropna()
+
+def weight_grid(core_step=0.05, overlay_max=2.0, overlay_step=0.05):
+    """
+    Every (SPY, TLT, Overlay) mix with SPY + TLT = 1 and the overlay scaled from
+    zero to `overlay_max`, as a (mixes x sleeves) DataFrame.
+    """
+    equity = np.round(np.arange(0, 1 + core_step / 2, core_step), 6)
+    overlay = np.round(np.arange(0, overlay_max + overlay_step / 2, overlay_step), 6)
+    spy, scale = np.meshgrid(equity, overlay, indexing='ij')
+    return pd.DataFrame({'SPY': spy.ravel(), 'TLT': 1 - spy.ravel(), 'Overlay': scale.ravel()})
+
+def mix_returns(sleeves, weights):
+    """
+    Daily returns of every mix (days x mixes), rebalanced to its weights daily,
+    as one matrix product.
+    """
+    return sleeves[SLEEVES].to_numpy(dtype=np.float64) @ weights[SLEEVES].to_numpy(dtype=np.float64).T
+
+def evaluate_mixes(sleeves, weights):
+    """
+    CAGR, volatility, Sharpe ratio and max drawdown of every mix in `weights`.
+    """
+    stats = performance_table(mix_returns(sleeves, weights), names=weights.index)
+    return pd.concat([weights, stats], axis=1)
+
+def efficient_frontier(stats):
+    """
+    Marks the mixes on the volatility vs. CAGR frontier: no other mix has both
+    lower volatility and a higher CAGR.
+    """
+    stats = stats.copy()
+    ordered = stats.sort_values(['Volatility', 'CAGR'], ascending=[True, False])
+    best_cagr = np.maximum.accumulate(ordered['CAGR'].to_numpy())
+    stats['Frontier'] = False
+    stats.loc[ordered.index[ordered['CAGR'].to_numpy() >= best_cagr], 'Frontier'] = True
+    return stats
+
+def best_mixes(stats, min_cagr=None):
+    """
+    The max-Sharpe mix and the min-drawdown mix (optionally among mixes with a
+    CAGR of at least `min_cagr`, since the shallowest drawdown alone favours cash-like mixes).
+    """
+    eligible = stats if min_cagr is None else stats[stats['CAGR'] >= min_cagr]
+    return pd.DataFrame({
+        'Max Sharpe': stats.loc[stats['Sharpe Ratio'].idxmax()],
+        'Min Drawdown': eligible.loc[eligible['Max Drawdown'].idxmax()],
+    }).T
+
+def rolling_reoptimization(sleeves, weights, lookback_years=5, hold_months=12, objective='Sharpe Ratio'):
+    """
+    Out-of-sample allocation: at each rebalance date the whole grid is scored on
+    the trailing `lookback_years`, and the best mix by `objective` is held for
+    the next `hold_months`. Mix returns are computed once for the full history,
+    so every step only slices rows. Returns the allocation history and the
+    out-of-sample daily returns.
+    """
+    returns = mix_returns(sleeves, weights)
+    index = sleeves.index
+    first = index[0] + pd.DateOffset(years=lookback_years)
+    rebalance_dates = pd.date_range(first, index[-1], freq=pd.DateOffset(months=hold_months))
+
+    allocations, oos_returns = [], []
+    for start_date, end_date in zip(rebalance_dates, list(rebalance_dates[1:]) + [index[-1] + pd.Timedelta(days=1)]):
+        train = (index >= start_date - pd.DateOffset(years=lookback_years)) & (index < start_date)
+        test = (index >= start_date) & (index < end_date)
+        if train.sum() < 2 or not test.any():
+            continue
+
+        scores = performance_table(returns[train], names=weights.index)[objective]
+        best = scores.idxmax()
+        allocations.append({'date': index[test][0], **weights.loc[best].to_dict(), objective: scores[best]})
+        oos_returns.append(pd.Series(returns[test, weights.index.get_loc(best)], index=index[test]))
+
+    return pd.DataFrame(allocations).set_index('date'), pd.concat(oos_returns)
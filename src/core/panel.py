@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+from src.core.result import make_result
+from src.core.drawdowns import max_drawdown
+
+# Batched versions of calculate_signals and run_strategy_arrays: every array is
+# (days x pairs), and the day-by-day portfolio simulations step all pairs (and all
+# threshold deltas) at once instead of looping over one pair in Python.
+
+THRESHOLD_DELTAS = np.arange(0.0, 0.0251, 0.001)
+TARGET_WEIGHT = 0.6
+NORMALIZATION_CONSTANT = 0.012
+
+def month_structure(index):
+    """
+    Calendar layout shared by every pair: whether each day is the last of its
+    month in the data, days left to the month end, each day's position in the
+    list of data months, and each month's predecessor position (-1 when the
+    previous calendar month is not in the data).
+    """
+    month_number = np.asarray(index.year * 12 + index.month - 1, dtype=np.int64)
+    month_end = np.r_[month_number[1:] != month_number[:-1], False]
+    months, month_position = np.unique(month_number, return_inverse=True)
+    last_row = np.r_[np.flatnonzero(month_end), len(index) - 1]
+    days_to_month_end = last_row[month_position] - np.arange(len(index))
+    previous = np.searchsorted(months, months - 1)
+    previous = np.where((previous < len(months)) & (months[np.minimum(previous, len(months) - 1)] == months - 1), previous, -1)
+    return month_end, days_to_month_end, month_position, previous
+
+def _drift(weight, equity_return, bond_return):
+    # Same operation order as calculate_signals, so single pairs match it exactly
+    equity = weight * (1 + equity_return)
+    return equity / (equity + (1 - weight) * (1 + bond_return))
+
+def threshold_signal(equity_return, bond_return, deltas=THRESHOLD_DELTAS, target=TARGET_WEIGHT):
+    """
+    Average over `deltas` of the drifted-minus-target weight of a portfolio that
+    rebalances whenever it drifts by delta or more (calculate_signals' threshold
+    loop) for every pair. Days with a missing return are NaN and reset the
+    portfolio to the target.
+    """
+    days, pairs = equity_return.shape
+    deltas = np.asarray(deltas, dtype=np.float64)[:, None]
+    weight = np.full((len(deltas), pairs), target)
+    signal = np.empty((days, pairs))
+    for day in range(days):
+        drifted = _drift(weight, equity_return[day], bond_return[day])
+        signal[day] = (drifted - target).mean(axis=0)
+        weight = np.where(np.abs(drifted - target) >= deltas, target, drifted)
+        weight[np.isnan(weight)] = target
+    return signal
+
+def calendar_signal_raw(equity_return, bond_return, month_end, target=TARGET_WEIGHT):
+    """
+    Drifted-minus-target weight of a portfolio rebalanced on the last day of
+    every month (calculate_signals' calendar loop) for every pair.
+    """
+    days, pairs = equity_return.shape
+    weight = np.full(pairs, target)
+    signal = np.empty((days, pairs))
+    for day in range(days):
+        drifted = _drift(weight, equity_return[day], bond_return[day])
+        signal[day] = drifted - target
+        weight = np.full(pairs, target) if month_end[day] else np.where(np.isnan(drifted), target, drifted)
+    return signal
+
+def modified_calendar_signal(raw, days_to_month_end, month_position, previous_month):
+    """
+    The blog calendar signal for every pair: fade the drift on the four days
+    before the month end, and on the last day take the reversion position
+    implied by the previous month's fifth-to-last day (NaN when that month is
+    missing), zero otherwise.
+    """
+    fade = -np.sign(raw)
+    signal = np.zeros_like(raw)
+    trade_days = (days_to_month_end >= 1) & (days_to_month_end <= 4)
+    signal[trade_days] = fade[trade_days]
+
+    fifth_last = np.flatnonzero(days_to_month_end == 4)
+    month_fade = np.full((month_position.max() + 1, raw.shape[1]), np.nan)
+    month_fade[month_position[fifth_last]] = fade[fifth_last]
+    reversion = np.where((previous_month >= 0)[:, None], month_fade[np.maximum(previous_month, 0)], np.nan)
+
+    last_days = np.flatnonzero(days_to_month_end == 0)
+    signal[last_days] = -reversion[month_position[last_days]]
+    return signal
+
+def pair_signals(equity_return, bond_return, layout, normalization_constant=NORMALIZATION_CONSTANT):
+    """
+    Threshold and calendar signals for every pair (the calculate_signals columns
+    modified_threshold_signal and modified_calendar_signal). `layout` is the
+    result of month_structure.
+    """
+    month_end, days_to_month_end, month_position, previous_month = layout
+    threshold = -(threshold_signal(equity_return, bond_return) / normalization_constant)
+    raw = calendar_signal_raw(equity_return, bond_return, month_end)
+    calendar = modified_calendar_signal(raw, days_to_month_end, month_position, previous_month)
+    return threshold, calendar
+
+def pair_strategy(threshold, calendar, equity_return, bond_return, threshold_weight=0.6, calendar_weight=0.4):
+    """
+    Weight and return of the dual-signal strategy for every pair, as in
+    run_strategy_arrays (calendar-only is threshold_weight=0, calendar_weight=1).
+    """
+    weight = threshold_weight * threshold + calendar_weight * calendar
+    returns = np.full_like(weight, np.nan)
+    returns[1:] = weight[:-1] * (equity_return[1:] - bond_return[1:])
+    return weight, returns
+
+def valid_days(weight, returns, equity_return, bond_return):
+    """
+    The days make_result would keep, per pair.
+    """
+    return np.isfinite(weight) & np.isfinite(returns) & np.isfinite(equity_return) & np.isfinite(bond_return)
+
+def pair_performance(returns, valid, periods_per_year=252):
+    """
+    CAGR, volatility, Sharpe ratio and max drawdown of every column over its own
+    valid days, with the definitions of performance_table.
+    """
+    num_days = valid.sum(axis=0)
+    masked = np.where(valid, returns, np.nan)
+    growth = np.prod(np.where(valid, 1 + returns, 1.0), axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cagr = growth ** (periods_per_year / num_days) - 1
+        volatility = np.nanstd(masked, axis=0, ddof=1) * np.sqrt(periods_per_year)
+    sharpe = np.divide(cagr, volatility, out=np.zeros_like(cagr), where=volatility > 0)
+    return {'Days': num_days, 'CAGR': cagr, 'Volatility': volatility, 'Sharpe Ratio': sharpe,
+            'Max Drawdown': max_drawdown(masked)}
+
+class PanelResult:
+    """
+    Strategy weights and returns of many pairs on one date index, as (days x pairs)
+    arrays. pair() gives any single pair as a BacktestResult.
+    """
+    __slots__ = ('index', 'pairs', 'weight', 'returns', 'equity_return', 'bond_return')
+
+    def __init__(self, index, pairs, weight, returns, equity_return, bond_return):
+        self.index = index
+        self.pairs = list(pairs)
+        self.weight = weight
+        self.returns = returns
+        self.equity_return = equity_return
+        self.bond_return = bond_return
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def __repr__(self):
+        return f"PanelResult({len(self.pairs)} pairs, {len(self.index)} days)"
+
+    @property
+    def names(self):
+        return [f"{equity}/{bond}" for equity, bond in self.pairs]
+
+    def pair(self, key):
+        """
+        One pair (by position, name or (equity, bond) tuple) as a BacktestResult.
+        """
+        if isinstance(key, str):
+            key = self.names.index(key)
+        elif isinstance(key, tuple):
+            key = self.pairs.index(key)
+        return make_result(self.index, self.weight[:, key], self.returns[:, key],
+                           self.equity_return[:, key], self.bond_return[:, key])
+
+    def statistics(self):
+        """
+        Per-pair performance of the strategy and of the equity leg over the days
+        the strategy is defined, one row per pair.
+        """
+        valid = valid_days(self.weight, self.returns, self.equity_return, self.bond_return)
+        strategy = pair_performance(self.returns, valid)
+        equity = pair_performance(self.equity_return, valid)
+        table = pd.DataFrame(strategy, index=pd.Index(self.names, name='Pair'))
+        table['Equity CAGR'] = equity['CAGR']
+        table['Equity Max Drawdown'] = equity['Max Drawdown']
+        return table
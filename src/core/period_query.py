@@ -0,0 +1,130 @@
+import pandas as pd
+import numpy as np
+
+class PeriodQueryEngine:
+    """
+    Answers CAGR, volatility, Sharpe ratio and max drawdown for any (start, end)
+    interval of a (days x strategies) return matrix without re-running anything.
+    Sums come from prefix arrays in O(1); drawdowns from a sparse table of
+    power-of-two blocks, merged in O(log n) per query. Intervals that touch a
+    missing (NaN) return of a strategy report NaN for that strategy.
+    """
+    __slots__ = ('index', 'names', 'periods_per_year', 'log_prefix', 'sum_prefix', 'sumsq_prefix',
+                 'missing_prefix', 'block_max', 'block_min', 'block_drawdown')
+
+    def __init__(self, returns, periods_per_year=252):
+        values = returns.to_numpy(dtype=np.float64)
+        missing = np.isnan(values)
+        values = np.where(missing, 0.0, values)
+        self.index = returns.index
+        self.names = list(returns.columns)
+        self.periods_per_year = periods_per_year
+
+        zero_row = np.zeros((1, values.shape[1]))
+        log_growth = np.log1p(values)
+        self.log_prefix = np.vstack([zero_row, np.cumsum(log_growth, axis=0)])
+        self.sum_prefix = np.vstack([zero_row, np.cumsum(values, axis=0)])
+        self.sumsq_prefix = np.vstack([zero_row, np.cumsum(values ** 2, axis=0)])
+        self.missing_prefix = np.vstack([zero_row, np.cumsum(missing, axis=0)])
+
+        # --- Sparse table over the log equity curve ---
+        # Level l, position k covers days [k, k + 2**l): running max, min and the
+        # deepest log drawdown inside the block (peak and trough both in the block).
+        curve = self.log_prefix[1:]
+        self.block_max = [curve]
+        self.block_min = [curve]
+        self.block_drawdown = [np.zeros_like(curve)]
+        half = 1
+        while 2 * half <= len(curve):
+            size = len(curve) - 2 * half + 1
+            left_max, right_max = self.block_max[-1][:size], self.block_max[-1][half:half + size]
+            left_min, right_min = self.block_min[-1][:size], self.block_min[-1][half:half + size]
+            left_dd, right_dd = self.block_drawdown[-1][:size], self.block_drawdown[-1][half:half + size]
+            self.block_max.append(np.maximum(left_max, right_max))
+            self.block_min.append(np.minimum(left_min, right_min))
+            self.block_drawdown.append(np.minimum(np.minimum(left_dd, right_dd), right_min - left_max))
+            half *= 2
+
+    def query(self, starts, ends):
+        """
+        Statistics for inclusive day positions [start, end], vectorized over queries.
+        Returns a dict of (queries x strategies) arrays.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        num_days = (ends - starts + 1).astype(np.float64)[:, None]
+
+        log_growth = self.log_prefix[ends + 1] - self.log_prefix[starts]
+        total = self.sum_prefix[ends + 1] - self.sum_prefix[starts]
+        total_sq = self.sumsq_prefix[ends + 1] - self.sumsq_prefix[starts]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cagr = np.exp(log_growth * self.periods_per_year / num_days) - 1
+            variance = (total_sq - total ** 2 / num_days) / (num_days - 1)
+            volatility = np.sqrt(np.maximum(variance, 0)) * np.sqrt(self.periods_per_year)
+            sharpe = np.where(volatility > 0, cagr / volatility, 0)
+
+        # --- Merge the binary decomposition of each interval, largest block first ---
+        length = ends - starts + 1
+        position = starts.copy()
+        running_max = np.full(log_growth.shape, -np.inf)
+        running_dd = np.zeros(log_growth.shape)
+        for level in range(len(self.block_max) - 1, -1, -1):
+            take = ((length >> level) & 1).astype(bool)
+            if not take.any():
+                continue
+            rows = position[take]
+            block_max = self.block_max[level][rows]
+            merged_dd = np.minimum(
+                np.minimum(running_dd[take], self.block_drawdown[level][rows]),
+                self.block_min[level][rows] - running_max[take]
+            )
+            running_dd[take] = merged_dd
+            running_max[take] = np.maximum(running_max[take], block_max)
+            position[take] += 1 << level
+
+        incomplete = (self.missing_prefix[ends + 1] - self.missing_prefix[starts]) > 0
+        stats = {
+            'CAGR': cagr,
+            'Volatility': volatility,
+            'Sharpe Ratio': sharpe,
+            'Max Drawdown': np.expm1(running_dd),
+        }
+        return {metric: np.where(incomplete, np.nan, values) for metric, values in stats.items()}
+
+    def query_periods(self, periods):
+        """
+        Batch-evaluates named periods, given as {name: (start_date, end_date)}.
+        Either date may be None for an open end. Returns one row per (period, strategy).
+        """
+        names = list(periods)
+        start_dates = [periods[name][0] for name in names]
+        end_dates = [periods[name][1] for name in names]
+        starts = np.array([0 if d is None else self.index.searchsorted(pd.Timestamp(d), side='left') for d in start_dates])
+        ends = np.array([len(self.index) - 1 if d is None else self.index.searchsorted(pd.Timestamp(d), side='right') - 1
+                         for d in end_dates])
+
+        valid = ends - starts >= 1
+        stats = self.query(starts[valid], ends[valid])
+
+        rows = pd.MultiIndex.from_product([np.array(names)[valid], self.names], names=['period', 'strategy'])
+        table = pd.DataFrame({metric: values.ravel() for metric, values in stats.items()}, index=rows)
+        table.insert(0, 'Start', np.repeat(self.index[starts[valid]], len(self.names)))
+        table.insert(1, 'End', np.repeat(self.index[ends[valid]], len(self.names)))
+        table.insert(2, 'Days', np.repeat(ends[valid] - starts[valid] + 1, len(self.names)))
+        return table
+
+def calendar_year_periods(index):
+    """
+    One period per calendar year present in the index.
+    """
+    return {str(year): (f"{year}-01-01", f"{year}-12-31") for year in np.unique(index.year)}
+
+def episode_periods(episodes):
+    """
+    One period per row of an episode table from src.core.regimes.find_episodes.
+    """
+    return {
+        f"> {row.threshold:g} from {row.start:%Y-%m-%d}": (row.start, row.end)
+        for row in episodes.itertuples()
+    }
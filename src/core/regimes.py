@@ -0,0 +1,77 @@
+import pandas as pd
+import numpy as np
+
+def find_episodes(series, thresholds, above=True, min_duration=1, merge_gap=0):
+    """
+    Finds every regime episode (run of days beyond a threshold) for a list of
+    thresholds in one vectorized pass over a run-length encoding of the breaches.
+    Episodes separated by at most `merge_gap` days are merged, and episodes
+    shorter than `min_duration` days are dropped afterwards.
+    Returns an interval table with one row per episode.
+    """
+    values = series.to_numpy(dtype=np.float64)
+    index = series.index
+    thresholds = np.atleast_1d(np.asarray(thresholds, dtype=np.float64))
+    num_days = len(values)
+
+    # --- Run-length encode the breaches of every threshold at once ---
+    oriented = values if above else -values
+    limits = thresholds if above else -thresholds
+    breached = oriented[None, :] > limits[:, None]                  # thresholds x days
+    padded = np.zeros((len(thresholds), num_days + 2), dtype=np.int8)
+    padded[:, 1:-1] = breached
+    edges = np.diff(padded, axis=1)
+    threshold_id, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)                               # exclusive ends
+
+    # --- Merge episodes separated by short gaps ---
+    if merge_gap > 0 and len(starts) > 1:
+        joined = (threshold_id[1:] == threshold_id[:-1]) & (starts[1:] - ends[:-1] <= merge_gap)
+        first = np.flatnonzero(np.concatenate([[True], ~joined]))
+        last = np.concatenate([first[1:], [len(starts)]]) - 1
+        threshold_id, starts, ends = threshold_id[first], starts[first], ends[last]
+
+    keep = (ends - starts) >= min_duration
+    threshold_id, starts, ends = threshold_id[keep], starts[keep], ends[keep]
+
+    # --- Peak of each episode via a flat gather over all episode days ---
+    lengths = ends - starts
+    offsets = np.cumsum(lengths) - lengths
+    rows = np.arange(lengths.sum()) - np.repeat(offsets, lengths) + np.repeat(starts, lengths)
+    episode_id = np.repeat(np.arange(len(starts)), lengths)
+    if len(rows):
+        order = np.lexsort((-oriented[rows], episode_id))
+        peak_rows = rows[order[offsets]]
+    else:
+        peak_rows = rows
+
+    is_open = ends == num_days
+    exit_dates = pd.DatetimeIndex(index[np.minimum(ends, num_days - 1)]).where(~is_open, pd.NaT)
+
+    return pd.DataFrame({
+        'threshold': thresholds[threshold_id],
+        'start': index[starts],
+        'end': index[ends - 1],
+        'exit': exit_dates,
+        'duration': lengths,
+        'calendar_days': (index[ends - 1] - index[starts]).days + 1,
+        'peak': values[peak_rows],
+        'peak_date': index[peak_rows],
+        'open': is_open,
+    })
+
+def episode_mask(index, episodes, threshold=None):
+    """
+    Turns an interval table from find_episodes back into a boolean day mask on
+    `index`, optionally for a single threshold only.
+    """
+    if threshold is not None:
+        episodes = episodes[episodes['threshold'] == threshold]
+
+    starts = index.searchsorted(episodes['start'].to_numpy(), side='left')
+    ends = index.searchsorted(episodes['end'].to_numpy(), side='right')
+
+    counts = np.zeros(len(index) + 1, dtype=np.int64)
+    np.add.at(counts, starts, 1)
+    np.add.at(counts, ends, -1)
+    return np.cumsum(counts[:-1]) > 0
@@ -0,0 +1,123 @@
+import pandas as pd
+import numpy as np
+from src.core.metrics import performance_table
+
+class BacktestResult:
+    """
+    Array-backed result of a single strategy run.
+    Holds contiguous float64 arrays that share one date index and only builds
+    the familiar DataFrame (same column names as run_strategy) when asked for.
+    `legs` (see return_legs) splits each day's return by source.
+    """
+    __slots__ = ('index', 'weight', 'returns', 'cumulative', 'spy_return', 'tlt_return', 'hedge_active', 'legs', '_frame')
+
+    def __init__(self, index, weight, returns, spy_return, tlt_return, hedge_active=None, legs=None):
+        self.index = index
+        self.weight = np.ascontiguousarray(weight, dtype=np.float64)
+        self.returns = np.ascontiguousarray(returns, dtype=np.float64)
+        self.cumulative = np.cumprod(1 + self.returns)
+        self.spy_return = np.ascontiguousarray(spy_return, dtype=np.float64)
+        self.tlt_return = np.ascontiguousarray(tlt_return, dtype=np.float64)
+        self.hedge_active = None if hedge_active is None else np.ascontiguousarray(hedge_active, dtype=bool)
+        self.legs = legs
+        self._frame = None
+
+    def __len__(self):
+        return len(self.returns)
+
+    def __repr__(self):
+        if len(self) == 0:
+            return "BacktestResult(empty)"
+        return f"BacktestResult({len(self)} days, {self.index[0]:%Y-%m-%d} to {self.index[-1]:%Y-%m-%d})"
+
+    @property
+    def cumulative_spy(self):
+        return np.cumprod(1 + self.spy_return)
+
+    def to_frame(self):
+        """
+        Builds (once) a DataFrame with the same columns the DataFrame runners produce.
+        """
+        if self._frame is None:
+            columns = {
+                'SPY_return': self.spy_return,
+                'TLT_return': self.tlt_return,
+                'strategy_weight': self.weight,
+                'spread_return': self.spy_return - self.tlt_return,
+                'strategy_return': self.returns,
+                'cumulative_strategy_return': self.cumulative,
+                'cumulative_spy_return': self.cumulative_spy,
+            }
+            if self.hedge_active is not None:
+                columns['hedge_active'] = self.hedge_active
+            self._frame = pd.DataFrame(columns, index=self.index, copy=False)
+        return self._frame
+
+    def statistics(self):
+        """
+        Strategy and SPY performance statistics without building a DataFrame.
+        """
+        return performance_table(
+            np.column_stack([self.returns, self.spy_return]),
+            names=['Strategy', 'S&P 500 (SPY)']
+        )
+
+def _valid_rows(valid):
+    """
+    Returns a slice when the valid rows form one contiguous block (no copy needed),
+    otherwise the boolean mask itself.
+    """
+    rows = np.flatnonzero(valid)
+    if len(rows) == 0:
+        return slice(0, 0)
+    if rows[-1] - rows[0] + 1 == len(rows):
+        return slice(rows[0], rows[-1] + 1)
+    return valid
+
+def make_result(index, weight, returns, spy_return, tlt_return, hedge_active=None, inputs=(), legs=None):
+    """
+    Drops the rows the DataFrame runners would drop with dropna() (any non-finite
+    input or output) and wraps the remaining rows in a BacktestResult.
+    """
+    valid = np.isfinite(weight) & np.isfinite(returns) & np.isfinite(spy_return) & np.isfinite(tlt_return)
+    for values in inputs:
+        valid &= np.isfinite(values)
+
+    rows = _valid_rows(valid)
+    return BacktestResult(
+        index[rows],
+        weight[rows],
+        returns[rows],
+        spy_return[rows],
+        tlt_return[rows],
+        None if hedge_active is None else hedge_active[rows],
+        None if legs is None else {key: values[rows] for key, values in legs.items()}
+    )
+
+def lagged(values):
+    """
+    Shifts an array forward by one day, like Series.shift(1), without pandas.
+    """
+    out = np.empty(len(values), dtype=np.float64)
+    out[0] = np.nan
+    out[1:] = values[:-1]
+    return out
+
+def return_legs(spread, threshold_position, calendar_position, was_active=None, spy_return=None):
+    """
+    Each day's return split by source, for attribution: threshold_leg and
+    calendar_leg are each signal's part of the held spread weight (the lagged
+    `*_position` arrays, already scaled by the signal weights) times the spread;
+    hedge_switch is the SPY return on days a hedged strategy sat out of the
+    spread (`was_active` False). The legs add up to the strategy return.
+    """
+    zeros = np.zeros(len(spread))
+    threshold_leg = zeros if threshold_position is None else lagged(threshold_position) * spread
+    calendar_leg = lagged(calendar_position) * spread
+    if was_active is None:
+        return {'threshold_leg': threshold_leg, 'calendar_leg': calendar_leg, 'hedge_switch': zeros}
+    return {
+        'threshold_leg': np.where(was_active, threshold_leg, 0.0),
+        'calendar_leg': np.where(was_active, calendar_leg, 0.0),
+        'hedge_switch': np.where(was_active, 0.0, spy_return),
+    }
@@ -0,0 +1,92 @@
+import pandas as pd
+import numpy as np
+from src.core.metrics import performance_table
+
+class EWMAVolatility:
+    """
+    Online EWMA volatility estimate for live use.
+    Tracks one variance per half-life, so a vector of half-lives is updated at
+    once. update() takes the latest daily return and returns annualized vols.
+    """
+    __slots__ = ('half_lives', 'decay', 'variance', 'periods_per_year')
+
+    def __init__(self, half_lives, initial_variance=None, periods_per_year=252):
+        self.half_lives = np.atleast_1d(np.asarray(half_lives, dtype=np.float64))
+        self.decay = 0.5 ** (1 / self.half_lives)
+        self.variance = None if initial_variance is None else np.broadcast_to(
+            np.asarray(initial_variance, dtype=np.float64), self.half_lives.shape
+        ).copy()
+        self.periods_per_year = periods_per_year
+
+    def update(self, daily_return):
+        """
+        Folds one daily return into the estimate and returns the annualized volatility.
+        """
+        squared = daily_return * daily_return
+        if self.variance is None:
+            self.variance = np.full(self.half_lives.shape, squared)
+        else:
+            self.variance = self.decay * self.variance + (1 - self.decay) * squared
+        return np.sqrt(self.variance * self.periods_per_year)
+
+def ewma_volatility(returns, half_lives, warmup=21, periods_per_year=252):
+    """
+    Annualized EWMA volatility for every half-life, as a (days x half-lives) matrix.
+    The estimate on day t includes day t's return, so it is known at that close.
+    Over the first `warmup` days the variance is the expanding mean of squared
+    returns so far; the EWMA continues from there, so no estimate sees a later day.
+    """
+    returns = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+    warmup = max(min(warmup, len(returns)), 1)
+    squared = returns[:warmup] ** 2
+    tracker = EWMAVolatility(half_lives, initial_variance=np.mean(squared), periods_per_year=periods_per_year)
+    out = np.empty((len(returns), len(tracker.half_lives)))
+    out[:warmup] = np.sqrt(np.cumsum(squared) / np.arange(1, warmup + 1) * periods_per_year)[:, None]
+    for i in range(warmup, len(returns)):
+        out[i] = tracker.update(returns[i])
+    return out
+
+def typical_weight(weight, half_lives):
+    """
+    Causal EWMA of the absolute weight for every half-life (days x half-lives).
+    Used to express a raw signal relative to its usual size.
+    """
+    magnitude = pd.Series(np.abs(np.nan_to_num(np.asarray(weight, dtype=np.float64))))
+    return np.column_stack([
+        magnitude.ewm(halflife=h).mean().to_numpy() for h in np.atleast_1d(half_lives)
+    ])
+
+def size_position(weight, volatility, target_vol, max_leverage=2.0, unit_weight=1.0):
+    """
+    Scales a raw weight so that a position of size `unit_weight` carries
+    `target_vol` of annualized risk, capped at `max_leverage` gross.
+    Works on scalars (live) and on broadcast arrays (grids).
+    """
+    risk = volatility * unit_weight
+    scale = np.divide(target_vol, risk, out=np.zeros(np.broadcast(target_vol, risk).shape), where=risk > 0)
+    return np.clip(weight * scale, -max_leverage, max_leverage)
+
+def vol_target_grid(result, target_vols, half_lives, max_leverage=2.0):
+    """
+    Evaluates a grid of target vols and EWMA half-lives for a spread strategy in
+    one vectorized pass. The risk estimate is the EWMA volatility of the SPY-TLT
+    spread times the strategy's typical absolute weight over the same half-life.
+    Returns the performance statistics per (half_life, target_vol).
+    """
+    spread = result.spy_return - result.tlt_return
+    target_vols = np.asarray(target_vols, dtype=np.float64)
+
+    volatility = ewma_volatility(spread, half_lives)                            # days x H
+    unit_weight = typical_weight(result.weight, half_lives)                     # days x H
+    sized = size_position(result.weight[:, None, None], volatility[:, :, None],
+                          target_vols[None, None, :], max_leverage,
+                          unit_weight[:, :, None])                              # days x H x T
+    held = np.concatenate([np.full((1,) + sized.shape[1:], np.nan), sized[:-1]])
+    returns = (held * spread[:, None, None])[1:].reshape(len(spread) - 1, -1)
+
+    names = pd.MultiIndex.from_product([np.atleast_1d(half_lives), target_vols], names=['half_life', 'target_vol'])
+    stats = performance_table(returns, names=names)
+    stats['Average Leverage'] = np.abs(sized).reshape(len(spread), -1).mean(axis=0)
+    stats['Vol of 1Y Vol'] = pd.DataFrame(returns).rolling(252).std().std().to_numpy() * np.sqrt(252)
+
+    return stats
@@ -0,0 +1,186 @@
+import pandas as pd
+import numpy as np
+from bisect import bisect_left, insort
+from collections import deque
+from statistics import NormalDist
+from src.core.sizing import ewma_volatility
+
+class SortedWindow:
+    """
+    Fixed-size rolling window that keeps its values sorted, so lower-tail
+    quantiles and tail means are read off the front of the list instead of
+    re-sorting every window. push() is O(window) for the list shift but with a
+    tiny constant, and far cheaper than a sort per day.
+    """
+    __slots__ = ('size', 'window', 'ordered')
+
+    def __init__(self, size):
+        self.size = size
+        self.window = deque()
+        self.ordered = []
+
+    def __len__(self):
+        return len(self.window)
+
+    def push(self, value):
+        """
+        Adds the newest value, dropping the oldest once the window is full.
+        """
+        if len(self.window) == self.size:
+            oldest = self.window.popleft()
+            del self.ordered[bisect_left(self.ordered, oldest)]
+        self.window.append(value)
+        insort(self.ordered, value)
+
+    def lower_tail(self, probability):
+        """
+        Empirical lower quantile at `probability` and the mean of the values at or
+        below it (the k smallest, with k = ceil(probability * n)).
+        """
+        count = max(int(np.ceil(round(probability * len(self.ordered), 9))), 1)
+        tail = self.ordered[:count]
+        return tail[-1], sum(tail) / count
+
+def horizon_returns(returns, horizon):
+    """
+    Overlapping compounded `horizon`-day returns ending on each day (days x N).
+    """
+    log_growth = pd.DataFrame(np.log1p(np.asarray(returns, dtype=np.float64)))
+    return np.expm1(log_growth.rolling(horizon, min_periods=horizon).sum().to_numpy())
+
+def rolling_lower_tail(values, window, probabilities):
+    """
+    Rolling lower-tail quantile and tail mean of every column of a (days x N)
+    matrix for several tail probabilities. NaNs are skipped; days before a full
+    window are NaN. Returns two (days x N x probabilities) arrays.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    num_days, num_series = values.shape
+    quantiles = np.full((num_days, num_series, len(probabilities)), np.nan)
+    tail_means = np.full_like(quantiles, np.nan)
+
+    for col in range(num_series):
+        tracker = SortedWindow(window)
+        for day, value in enumerate(values[:, col]):
+            if np.isnan(value):
+                continue
+            tracker.push(value)
+            if len(tracker) == window:
+                for k, probability in enumerate(probabilities):
+                    quantiles[day, col, k], tail_means[day, col, k] = tracker.lower_tail(probability)
+
+    return quantiles, tail_means
+
+def _cornish_fisher_quantile(z, skew, excess_kurtosis):
+    """
+    Cornish-Fisher expansion of the standard normal quantile z.
+    """
+    return (z + (z ** 2 - 1) * skew / 6 + (z ** 3 - 3 * z) * excess_kurtosis / 24
+            - (2 * z ** 3 - 5 * z) * skew ** 2 / 36)
+
+def rolling_tail_risk(returns, levels=(0.95, 0.99), horizons=(1, 10), window=252, half_life=11, vol_floor=0.5,
+                      tail_points=20):
+    """
+    Rolling VaR and expected shortfall of every column of a (days x strategies)
+    return DataFrame, for each confidence level and horizon, by three methods:
+      - Historical: empirical tail of the overlapping horizon returns in the window.
+      - Filtered Historical: daily returns standardized by their EWMA volatility
+        forecast (floored at `vol_floor` times the window RMS return), with the
+        standardized tail rescaled by today's volatility and sqrt(horizon).
+      - Cornish-Fisher: rolling mean, vol, skew and kurtosis of the horizon
+        returns; ES averages the expansion over `tail_points` tail quantiles.
+        The expansion is only reliable for moderate skew and kurtosis, which
+        var_breach_rates makes visible.
+    Values are losses (positive numbers) known at each day's close. Columns are
+    a MultiIndex (method, measure, level, horizon, strategy).
+    """
+    names = list(returns.columns)
+    daily = returns.to_numpy(dtype=np.float64)
+    tails = [1 - level for level in levels]
+    blocks, keys = [], []
+
+    def add(method, measure, values):
+        for k, level in enumerate(levels):
+            blocks.append(values[..., k])
+            keys.extend((method, measure, level, horizon, name) for name in names)
+
+    # --- Filtered: one standardized tail per level, scaled per horizon below ---
+    sigma = np.column_stack([
+        ewma_volatility(daily[:, col], [half_life])[:, 0] for col in range(daily.shape[1])
+    ]) / np.sqrt(252)
+    # Strategies that sit flat for weeks drive the EWMA towards zero, and the first
+    # day back in the market would then dominate the standardized tail. The
+    # forecast is floored at a share of the window's root-mean-square return.
+    long_run = np.sqrt(pd.DataFrame(daily ** 2).rolling(window, min_periods=21).mean().to_numpy())
+    sigma = np.fmax(sigma, vol_floor * long_run)
+    sigma[np.isnan(daily)] = np.nan
+    standardized = daily / np.vstack([np.full((1, daily.shape[1]), np.nan), sigma[:-1]])
+    z_quantile, z_tail = rolling_lower_tail(standardized, window, tails)
+
+    normal = NormalDist()
+    z = np.array([normal.inv_cdf(t) for t in tails])
+    grid = np.array([[normal.inv_cdf(t * (j + 0.5) / tail_points) for j in range(tail_points)] for t in tails])
+
+    for horizon in horizons:
+        window_returns = horizon_returns(daily, horizon)
+
+        quantile, tail_mean = rolling_lower_tail(window_returns, window, tails)
+        add('Historical', 'VaR', -quantile)
+        add('Historical', 'ES', -tail_mean)
+
+        scale = (sigma * np.sqrt(horizon))[..., None]
+        add('Filtered Historical', 'VaR', -z_quantile * scale)
+        add('Filtered Historical', 'ES', -z_tail * scale)
+
+        rolling = pd.DataFrame(window_returns).rolling(window, min_periods=window)
+        mean = rolling.mean().to_numpy()[..., None]
+        std = rolling.std().to_numpy()[..., None]
+        skew = rolling.skew().to_numpy()[..., None]
+        kurt = rolling.kurt().to_numpy()[..., None]
+        add('Cornish-Fisher', 'VaR', -(mean + std * _cornish_fisher_quantile(z, skew, kurt)))
+        tail_quantiles = _cornish_fisher_quantile(grid[None, None], skew[..., None], kurt[..., None])
+        add('Cornish-Fisher', 'ES', -(mean + std * tail_quantiles.mean(axis=-1)))
+
+    columns = pd.MultiIndex.from_tuples(keys, names=['method', 'measure', 'level', 'horizon', 'strategy'])
+    return pd.DataFrame(np.hstack(blocks), index=returns.index, columns=columns).sort_index(axis=1)
+
+def var_breach_rates(returns, risk):
+    """
+    Share of days on which the realized loss over the next `horizon` days
+    exceeded the VaR known at the close, per (method, level, horizon, strategy).
+    """
+    daily = returns.to_numpy(dtype=np.float64)
+    var = risk.xs('VaR', level='measure', axis=1)
+    rows = []
+    for horizon in var.columns.unique('horizon'):
+        realized = pd.DataFrame(horizon_returns(daily, horizon), index=returns.index, columns=returns.columns)
+        forward = realized.shift(-horizon)
+        block = var.xs(horizon, level='horizon', axis=1)
+        for (method, level, strategy), estimate in block.items():
+            valid = estimate.notna() & forward[strategy].notna()
+            breaches = (forward[strategy][valid] < -estimate[valid]).mean()
+            rows.append({'method': method, 'level': level, 'horizon': horizon, 'strategy': strategy,
+                         'Breach Rate': breaches, 'Expected': 1 - level, 'Days': int(valid.sum())})
+    return pd.DataFrame(rows).set_index(['method', 'level', 'horizon', 'strategy'])
+
+def tail_risk_table(returns, levels=(0.95, 0.99)):
+    """
+    Full-sample 1-day historical VaR/ES and Cornish-Fisher VaR of every column.
+    """
+    values = returns.to_numpy(dtype=np.float64)
+    normal = NormalDist()
+    table = {}
+    for level in levels:
+        tail = 1 - level
+        sorted_values = np.sort(values, axis=0)
+        counts = np.sum(~np.isnan(values), axis=0)
+        k = np.maximum(np.ceil(np.round(tail * counts, 9)).astype(np.int64), 1)
+        ranks = np.arange(len(values))[:, None]
+        table[f'VaR {level:.0%}'] = -sorted_values[k - 1, np.arange(values.shape[1])]
+        table[f'ES {level:.0%}'] = -np.nanmean(np.where(ranks < k[None, :], sorted_values, np.nan), axis=0)
+        frame = pd.DataFrame(values)
+        z = _cornish_fisher_quantile(normal.inv_cdf(tail), frame.skew().to_numpy(), frame.kurt().to_numpy())
+        table[f'CF VaR {level:.0%}'] = -(np.nanmean(values, axis=0) + np.nanstd(values, axis=0, ddof=1) * z)
+    return pd.DataFrame(table, index=returns.columns)
@@ -0,0 +1,264 @@
+import os
+import json
+import pickle
+import hashlib
+import inspect
+import importlib.metadata
+from datetime import datetime
+import numpy as np
+
+MANIFEST_VERSION = 1
+ENVIRONMENT_PACKAGES = ['pandas', 'numpy', 'matplotlib', 'plotly']
+
+# --- Fingerprints ---
+
+def _is_project_code(value):
+    return (inspect.isfunction(value) or inspect.isclass(value)) and getattr(value, '__module__', '').startswith('src.')
+
+def _code_objects(function):
+    """
+    A function's code object plus every nested one (comprehensions, inner functions).
+    """
+    stack, found = [function.__code__], []
+    while stack:
+        code = stack.pop()
+        found.append(code)
+        stack.extend(const for const in code.co_consts if inspect.iscode(const))
+    return found
+
+def _constant_text(value, code):
+    """
+    Stable text form of a module-level data value (literals, containers, numpy
+    arrays). Project functions and classes inside it (e.g. a dict of runners) are
+    named and appended to `code`. Raises TypeError for runtime objects such as
+    locks or caches, which are not part of a task's definition.
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}({', '.join(_constant_text(item, code) for item in value)})"
+    if isinstance(value, (set, frozenset)):
+        return f"{type(value).__name__}({', '.join(sorted(_constant_text(item, code) for item in value))})"
+    if isinstance(value, dict):
+        return '{' + ', '.join(f"{_constant_text(k, code)}: {_constant_text(v, code)}" for k, v in value.items()) + '}'
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return f"ndarray({value.dtype}, {value.shape}, {hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()})"
+    if _is_project_code(value):
+        code.append(value)
+        return f"<{value.__module__}.{value.__qualname__}>"
+    raise TypeError(f"no stable form for {type(value).__name__}")
+
+def _reference(module_name, name, target):
+    """
+    (key, dependency) pairs for one name a function uses: project code itself, or
+    the text of a project-module data constant plus any code inside it.
+    """
+    if _is_project_code(target):
+        return [(f"{target.__module__}.{target.__qualname__}", target)]
+    # None marks unset runtime state (e.g. instrument._trace) rather than configuration
+    if (target is None or name.startswith('__') or inspect.ismodule(target) or callable(target)
+            or not module_name.startswith('src.')):
+        return []
+    code = []
+    try:
+        text = _constant_text(target, code)
+    except TypeError:
+        return []
+    return [(f"{module_name}.{name}", text)] + [(f"{c.__module__}.{c.__qualname__}", c) for c in code]
+
+def _referenced_code(value):
+    """
+    Project functions, classes and data constants that `value` refers to by name,
+    including attributes of project modules (e.g. `plots.plot_full_history` or
+    `dashboard.PANELS`), as (qualified name, object or constant text) pairs.
+    Decorated functions are read through to the function they wrap.
+    """
+    functions = [value] if inspect.isfunction(value) else [v for v in vars(value).values() if inspect.isfunction(v)]
+    for function in map(inspect.unwrap, functions):
+        names = {name for code in _code_objects(function) for name in code.co_names}
+        for name in names:
+            if name not in function.__globals__:
+                continue
+            target = function.__globals__[name]
+            if inspect.ismodule(target) and target.__name__.startswith('src.'):
+                for attribute in names:
+                    if hasattr(target, attribute):
+                        yield from _reference(target.__name__, attribute, getattr(target, attribute))
+            else:
+                yield from _reference(function.__module__, name, target)
+
+def code_dependencies(function):
+    """
+    The function and every project function, class or data constant it reaches
+    by name, transitively, as {qualified name: object}; constants map to their
+    text form.
+    """
+    found = {}
+    stack = [(f"{function.__module__}.{function.__qualname__}", function)]
+    while stack:
+        key, value = stack.pop()
+        if key in found:
+            continue
+        found[key] = value
+        if not isinstance(value, str):
+            stack.extend(_referenced_code(value))
+    return found
+
+def code_fingerprint(function):
+    """
+    Hash of the source of the function and all project code it depends on, plus
+    the module-level constants that code reads (HTML templates, palettes, ...),
+    so editing a plotting helper or template invalidates every figure that uses it.
+    """
+    digest = hashlib.sha256()
+    for key, value in sorted(code_dependencies(function).items()):
+        digest.update(key.encode())
+        digest.update((value if isinstance(value, str) else inspect.getsource(value)).encode())
+    return digest.hexdigest()
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    SHA-256 of a file's contents, or None if it does not exist.
+    """
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def environment_fingerprint():
+    """
+    Versions of the libraries that shape the rendered output.
+    """
+    versions = []
+    for package in ENVIRONMENT_PACKAGES:
+        try:
+            versions.append(f"{package}={importlib.metadata.version(package)}")
+        except importlib.metadata.PackageNotFoundError:
+            versions.append(f"{package}=missing")
+    return ';'.join(versions)
+
+def task_fingerprints(tasks, order, source_files=None, outputs=None):
+    """
+    Fingerprint of every task in `order` (dependency order). A task's fingerprint
+    covers its code, the fingerprints of its inputs, the contents of the data
+    files it reads and the outputs it declares. Because inputs enter through their
+    fingerprints rather than their values, nothing has to be computed to decide
+    what is stale.
+    """
+    source_files = source_files or {}
+    outputs = outputs or {}
+    environment = environment_fingerprint()
+    fingerprints = {}
+    for name in order:
+        kind, function, inputs = tasks[name]
+        digest = hashlib.sha256()
+        parts = [name, kind, environment, code_fingerprint(function)]
+        parts += [f"{i}:{fingerprints[i]}" for i in inputs]
+        parts += [f"{path}:{file_digest(path)}" for path in source_files.get(name, [])]
+        parts += sorted(outputs.get(name, []))
+        for part in parts:
+            digest.update(part.encode())
+            digest.update(b'\0')
+        fingerprints[name] = digest.hexdigest()
+    return fingerprints
+
+# --- Manifest ---
+
+def load_manifest(cache_dir):
+    """
+    Reads the manifest, or returns an empty one if it is missing, unreadable
+    or written by another manifest version.
+    """
+    path = os.path.join(cache_dir, 'manifest.json')
+    try:
+        with open(path) as handle:
+            manifest = json.load(handle)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'version': MANIFEST_VERSION, 'tasks': {}}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'tasks': {}}
+    return manifest
+
+def save_manifest(cache_dir, manifest):
+    """
+    Writes the manifest atomically (temporary file, then rename).
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, 'manifest.json')
+    with open(path + '.tmp', 'w') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+def output_record(path):
+    """
+    Size, modification time and content hash of one output file.
+    """
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_digest(path)}
+
+def outputs_intact(records):
+    """
+    True if every recorded output still exists unchanged. Size and mtime are
+    checked first; the file is only re-hashed when they differ.
+    """
+    for path, record in records.items():
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if stat.st_size != record['size']:
+            return False
+        if stat.st_mtime_ns != record['mtime_ns'] and file_digest(path) != record['sha256']:
+            return False
+    return True
+
+def is_fresh(manifest, name, fingerprint):
+    """
+    True if the manifest holds `name` at this fingerprint and its outputs are intact.
+    """
+    entry = manifest['tasks'].get(name)
+    return entry is not None and entry['fingerprint'] == fingerprint and outputs_intact(entry.get('outputs', {}))
+
+def record_task(manifest, name, kind, fingerprint, output_paths, seconds):
+    """
+    Stores a finished task (and the state of the files it wrote) in the manifest.
+    """
+    manifest['tasks'][name] = {
+        'kind': kind,
+        'fingerprint': fingerprint,
+        'outputs': {path: output_record(path) for path in output_paths if os.path.exists(path)},
+        'seconds': round(seconds, 4),
+        'updated': datetime.now().isoformat(timespec='seconds'),
+    }
+
+# --- Artifact Store ---
+
+def _artifact_path(cache_dir, name, fingerprint):
+    return os.path.join(cache_dir, 'artifacts', f"{name}-{fingerprint[:16]}.pkl")
+
+def load_artifact(cache_dir, name, fingerprint):
+    """
+    Returns (True, value) for a stored artifact at this fingerprint, else (False, None).
+    """
+    path = _artifact_path(cache_dir, name, fingerprint)
+    if not os.path.exists(path):
+        return False, None
+    with open(path, 'rb') as handle:
+        return True, pickle.load(handle)
+
+def store_artifact(cache_dir, name, fingerprint, value):
+    """
+    Pickles an artifact under its fingerprint and removes older versions of it.
+    """
+    directory = os.path.join(cache_dir, 'artifacts')
+    os.makedirs(directory, exist_ok=True)
+    path = _artifact_path(cache_dir, name, fingerprint)
+    for stale in os.listdir(directory):
+        if stale.startswith(f"{name}-") and stale.endswith('.pkl') and os.path.join(directory, stale) != path:
+            os.remove(os.path.join(directory, stale))
+    with open(path + '.tmp', 'wb') as handle:
+        pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + '.tmp', path)
@@ -0,0 +1,190 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import json
+import numpy as np
+import pandas as pd
+import plotly.offline
+from plotly.subplots import make_subplots
+import plotly.graph_objects as go
+from src.core.backtest import load_data, calculate_signals, run_strategy
+from src.core.drawdowns import drawdown_series
+from src.core.metrics import performance_table
+from src.analysis.retail_investor import run_retail_strategy
+from src.analysis.vix_filter import run_vix_filtered_strategy
+from src.analysis.ma_filter import run_ma_filtered_strategy
+from src.visualization.downsample import encode_typed_array
+
+BENCHMARK = 'S&P 500 (SPY)'
+PANELS = ['Cumulative Return (Log Scale)', 'Position', 'Drawdown']
+COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#9467bd', '#8c564b', '#e377c2']
+
+def dashboard_series(results):
+    """
+    Puts every strategy on one shared date axis (the union of their dates, NaN
+    where a strategy has no data) and returns (dates, {(panel, name): values}).
+    The benchmark is compounded from the union of the strategies' SPY returns.
+    """
+    dates = results[next(iter(results))].index
+    for frame in results.values():
+        dates = dates.union(frame.index)
+
+    aligned = {name: frame.reindex(dates) for name, frame in results.items()}
+    spy_return = pd.concat([frame['SPY_return'] for frame in results.values()], axis=1).reindex(dates).bfill(axis=1).iloc[:, 0]
+    returns = pd.DataFrame({name: frame['strategy_return'] for name, frame in aligned.items()})
+    returns[BENCHMARK] = spy_return
+    drawdowns = drawdown_series(returns)
+
+    series = {}
+    for number, (name, frame) in enumerate(aligned.items()):
+        series[(PANELS[0], name)] = frame['cumulative_strategy_return'].to_numpy()
+        series[(PANELS[1], name)] = frame['strategy_weight'].to_numpy()
+        series[(PANELS[2], name)] = drawdowns[:, number]
+    series[(PANELS[0], BENCHMARK)] = (1 + spy_return.fillna(0.0)).cumprod().where(spy_return.notna()).to_numpy()
+    series[(PANELS[2], BENCHMARK)] = drawdowns[:, -1]
+    return dates, series
+
+def dashboard_figure(names):
+    """
+    Styled figure skeleton without data: one subplot per panel on a shared date
+    axis and one trace per (panel, strategy), in the order of dashboard_series.
+    """
+    fig = make_subplots(rows=len(PANELS), cols=1, shared_xaxes=True, vertical_spacing=0.05,
+                        subplot_titles=PANELS, row_heights=[0.5, 0.25, 0.25])
+    for row, panel in enumerate(PANELS, start=1):
+        for number, name in enumerate(names):
+            if name == BENCHMARK and panel == PANELS[1]:
+                continue
+            fig.add_trace(go.Scatter(
+                name=name, legendgroup=name, showlegend=(row == 1), mode='lines',
+                line=dict(color='grey' if name == BENCHMARK else COLORS[number % len(COLORS)], width=1),
+                hovertemplate='%{y:.4f}'
+            ), row=row, col=1)
+
+    fig.update_yaxes(type='log', row=1, col=1)
+    fig.update_yaxes(tickformat='.0%', row=3, col=1)
+    fig.update_xaxes(type='date')
+    fig.update_xaxes(rangeselector=dict(buttons=[
+        dict(count=1, label="1y", step="year", stepmode="backward"),
+        dict(count=5, label="5y", step="year", stepmode="backward"),
+        dict(step="all"),
+    ]), row=1, col=1)
+    fig.update_layout(template='plotly_white', height=950, hovermode='x unified',
+                      legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    return fig
+
+def statistics_table(results):
+    """
+    Performance of every strategy over its own dates, as an HTML table.
+    """
+    table = pd.concat([
+        performance_table(frame['strategy_return'].dropna().to_numpy(), names=[name]) for name, frame in results.items()
+    ])
+    table.insert(0, 'Start', [f"{frame.index[0]:%Y-%m-%d}" for frame in results.values()])
+    formats = {'CAGR': '{:.2%}', 'Volatility': '{:.2%}', 'Sharpe Ratio': '{:.2f}', 'Max Drawdown': '{:.2%}'}
+    for column, fmt in formats.items():
+        table[column] = table[column].map(fmt.format)
+    return table.to_html(classes='stats', border=0)
+
+def build_dashboard(results, filename, title='Strategy Dashboard', plotlyjs='inline'):
+    """
+    Writes one self-contained HTML file for all strategies in `results` (name ->
+    run_* DataFrame). plotly.js is embedded once ('inline') or loaded from the
+    CDN ('cdn'); the date axis is stored once as int32 day numbers and every
+    series as a float32 typed array, all base64-encoded. Returns the file size.
+    """
+    dates, series = dashboard_series(results)
+    names = list(results) + [BENCHMARK]
+    fig = dashboard_figure(names)
+
+    days = (dates.values.astype('datetime64[D]').astype(np.int64)).astype(np.int32)
+    payload = {
+        'days': encode_typed_array(days, '<i4'),
+        'series': [encode_typed_array(series[(PANELS[int(trace.yaxis[1:] or 1) - 1], trace.name)], '<f4') for trace in fig.data],
+    }
+
+    if plotlyjs == 'inline':
+        plotly_script = f"<script type=\"text/javascript\">{plotly.offline.get_plotlyjs()}</script>"
+    elif plotlyjs == 'cdn':
+        plotly_script = f"<script src=\"https://cdn.plot.ly/plotly-{plotly.offline.get_plotlyjs_version()}.min.js\"></script>"
+    else:
+        raise ValueError(f"plotlyjs must be 'inline' or 'cdn', not '{plotlyjs}'")
+
+    html = (_DASHBOARD_TEMPLATE
+            .replace('__TITLE__', title)
+            .replace('__PLOTLYJS__', plotly_script)
+            .replace('__STATS__', statistics_table(results))
+            .replace('__FIGURE__', fig.to_json())
+            .replace('__DATA__', json.dumps(payload)))
+    with open(filename, 'w', encoding='utf-8') as handle:
+        handle.write(html)
+    print(f"Strategy dashboard saved to {filename} ({len(dates)} dates, {len(fig.data)} traces)")
+    return os.path.getsize(filename)
+
+_DASHBOARD_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+body { font-family: sans-serif; margin: 20px; }
+table.stats { border-collapse: collapse; margin-bottom: 10px; }
+table.stats th, table.stats td { padding: 4px 12px; text-align: right; border-bottom: 1px solid #ddd; }
+</style>
+__PLOTLYJS__
+</head>
+<body>
+<h2>__TITLE__</h2>
+__STATS__
+<div id="dashboard"></div>
+<script type="text/javascript">
+(function () {
+    var decode = function (b64, ArrayType) {
+        var raw = atob(b64), bytes = new Uint8Array(raw.length);
+        for (var i = 0; i < raw.length; i++) { bytes[i] = raw.charCodeAt(i); }
+        return new ArrayType(bytes.buffer);
+    };
+    var figure = __FIGURE__;
+    var data = __DATA__;
+    var days = decode(data.days, Int32Array), x = new Float64Array(days.length);
+    for (var i = 0; i < days.length; i++) { x[i] = days[i] * 86400000; }
+    figure.data.forEach(function (trace, number) {
+        trace.x = x;
+        trace.y = decode(data.series[number], Float32Array);
+    });
+    Plotly.newPlot('dashboard', figure.data, figure.layout, {responsive: true});
+})();
+</script>
+</body>
+</html>
+"""
+
+def main():
+    """
+    Main function to build the multi-strategy dashboard.
+    """
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    if base_data is None:
+        return
+
+    try:
+        vix_data = pd.read_csv('data/vix.csv', index_col='Date', parse_dates=True)
+        vix_data = vix_data.rename(columns={'VIXSIM': 'VIX'})
+    except FileNotFoundError:
+        print("Error: VIX data not found. The Hedged Equity strategy will be left out.")
+        vix_data = None
+
+    data_with_signals = calculate_signals(base_data)
+    results = {
+        'Dual-Signal': run_strategy(data_with_signals.copy()),
+        'Calendar-Only': run_retail_strategy(data_with_signals.copy()),
+        'MA-Filtered': run_ma_filtered_strategy(data_with_signals.copy(), ma_window=200, buffer=0.02),
+    }
+    if vix_data is not None:
+        results['Hedged Equity'] = run_vix_filtered_strategy(data_with_signals.join(vix_data, how='inner'), vix_threshold=20)
+
+    size = build_dashboard(results, 'plots/other/strategy_dashboard.html')
+    print(f"Dashboard size: {size / 1e6:.2f} MB")
+
+if __name__ == '__main__':
+    main()
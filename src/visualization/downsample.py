@@ -0,0 +1,260 @@
+import json
+import base64
+import numpy as np
+
+# --- Point Selection ---
+
+def _numeric_x(x):
+    """
+    x as float64 (dates become days since the first date), for triangle areas.
+    """
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').astype(np.int64)
+        return (x - x[0]) / 86_400e9
+    return x.astype(np.float64)
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: keeps the first and last point and, from each
+    of n_out - 2 equal buckets in between, the point forming the largest triangle
+    with the previously kept point and the mean of the next bucket. Returns
+    sorted indices into x/y.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _numeric_x(x)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = np.floor(np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # Bucket means from prefix sums; the point after the last bucket is the last point
+    x_sum = np.concatenate([[0.0], np.cumsum(x)])
+    y_sum = np.concatenate([[0.0], np.cumsum(y)])
+    counts = np.diff(edges)
+    mean_x = np.append((x_sum[edges[1:]] - x_sum[edges[:-1]]) / counts, x[-1])
+    mean_y = np.append((y_sum[edges[1:]] - y_sum[edges[:-1]]) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        bx, by = x[start:end], y[start:end]
+        cx, cy = mean_x[bucket + 1], mean_y[bucket + 1]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        selected[bucket + 1] = a
+    return selected
+
+def minmax_indices(y, n_out):
+    """
+    Min-max decimation: splits the series into n_out // 2 equal buckets and keeps
+    each bucket's minimum and maximum (plus the first and last point), so every
+    spike survives. Returns sorted indices into y.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    bucket = np.arange(n) * (n_out // 2) // n
+
+    # Within each bucket, the first entry of a (bucket, value) sort is the minimum
+    order = np.lexsort((y, bucket))
+    first = np.flatnonzero(np.r_[True, bucket[order][1:] != bucket[order][:-1]])
+    last = np.r_[first[1:] - 1, n - 1]
+    return np.unique(np.concatenate([[0, n - 1], order[first], order[last]]))
+
+def downsample_indices(x, y, n_out, method='lttb'):
+    """
+    Indices of at most about n_out points of (x, y) chosen by `method` ('lttb' or
+    'minmax'). NaN points are skipped, but the first NaN of every interior gap is
+    kept so plotted lines still break there.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.flatnonzero(np.isfinite(y))
+    if len(finite) == 0:
+        return np.arange(0)
+    if method == 'lttb':
+        kept = finite[lttb_indices(np.asarray(x)[finite], y[finite], n_out)]
+    elif method == 'minmax':
+        kept = finite[minmax_indices(y[finite], n_out)]
+    else:
+        raise ValueError(f"Unknown downsampling method '{method}'")
+
+    gap_starts = np.flatnonzero(~np.isfinite(y[1:]) & np.isfinite(y[:-1])) + 1
+    gap_starts = gap_starts[gap_starts < finite[-1]]
+    return np.union1d(kept, gap_starts)
+
+def resolution_tiers(x, y, base_points=2000, factor=4, method='lttb'):
+    """
+    Index arrays from coarse to fine: base_points, base_points * factor, ... and
+    finally every point. Tier k serves views spanning about 1 / factor**k of the range.
+    """
+    n = len(y)
+    tiers, points = [], base_points
+    while points < n:
+        tiers.append(downsample_indices(x, y, points, method))
+        points *= factor
+    tiers.append(np.arange(n))
+    return tiers
+
+# --- Plotly Figures ---
+
+_PER_POINT_KEYS = ('text', 'hovertext', 'customdata', 'ids')
+
+def _per_point_arrays(trace, n):
+    """
+    Names of trace attributes (besides x/y) that hold one value per point.
+    """
+    keys = [key for key in _PER_POINT_KEYS if trace[key] is not None and np.ndim(trace[key]) > 0 and len(trace[key]) == n]
+    marker_keys = [f"marker.{key}" for key in ('color', 'size', 'symbol')
+                   if trace.marker[key] is not None and np.ndim(trace.marker[key]) > 0 and len(trace.marker[key]) == n]
+    return keys + marker_keys
+
+def encode_typed_array(values, dtype):
+    """
+    Base64 of the raw bytes of `values` as `dtype` (e.g. '<f4'), which the
+    browser decodes straight into the matching JavaScript typed array.
+    """
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode('ascii')
+
+def downsample_figure(fig, max_points=2000, method='lttb', tiers=True, factor=4):
+    """
+    Cuts every scatter trace longer than max_points down to about max_points in
+    place, keeping visual extremes. Traces with per-point text or marker arrays
+    get the same points selected from those arrays.
+
+    With `tiers`, plain line traces also get finer resolution tiers; the returned
+    JavaScript (pass it as write_html(post_script=...)) swaps in the tier that
+    matches the zoomed x-range, splicing it into the coarse data so the rest of
+    the chart and any range slider stay intact. Returns '' when nothing is tiered.
+    """
+    tiered, axes = {}, {}
+    for trace_number, trace in enumerate(fig.data):
+        if trace.type not in ('scatter', 'scattergl') or trace.x is None or trace.y is None:
+            continue
+        n = len(trace.y)
+        if n <= max_points:
+            continue
+
+        x = np.asarray(trace.x)
+        y = np.asarray(trace.y, dtype=np.float64)
+        extra = _per_point_arrays(trace, n)
+        is_line = trace.mode is None or 'lines' in trace.mode
+        trace_tiers = resolution_tiers(x, y, max_points, factor, method) if tiers and is_line and not extra else None
+        keep = trace_tiers[0] if trace_tiers else downsample_indices(x, y, max_points, method)
+
+        updates = {'x': x[keep], 'y': y[keep]}
+        for key in extra:
+            values = trace[key] if not key.startswith('marker.') else trace.marker[key.split('.', 1)[1]]
+            updates[key] = np.asarray(values)[keep]
+        for key, values in updates.items():
+            if key.startswith('marker.'):
+                trace.marker[key.split('.', 1)[1]] = values
+            else:
+                trace[key] = values
+
+        if trace_tiers and np.issubdtype(x.dtype, np.datetime64):
+            # Full-resolution x is stored once per distinct axis; tiers are index arrays into it
+            milliseconds = x.astype('datetime64[ms]').astype(np.float64)
+            axis = axes.setdefault(milliseconds.tobytes(), len(axes))
+            tiered[trace_number] = {
+                'axis': axis,
+                'y': encode_typed_array(y, '<f4'),
+                'tiers': [encode_typed_array(tier, '<u4') for tier in trace_tiers[:-1]],
+            }
+    if not tiered:
+        return ''
+    x_axes = [encode_typed_array(np.frombuffer(key, dtype=np.float64), '<f8') for key in axes]
+    return zoom_tiers_script(x_axes, tiered, max_points)
+
+def zoom_tiers_script(x_axes, tiered, max_points):
+    """
+    Plotly post_script that re-slices the tiered traces on every x-axis zoom or pan.
+    """
+    return (_ZOOM_SCRIPT.replace('__AXES__', json.dumps(x_axes)).replace('__TIERS__', json.dumps(tiered))
+            .replace('__TARGET__', str(int(max_points))))
+
+_ZOOM_SCRIPT = """
+(function () {
+    var gd = document.getElementById('{plot_id}');
+    var target = __TARGET__;
+    var decode = function (b64, ArrayType) {
+        var raw = atob(b64), bytes = new Uint8Array(raw.length);
+        for (var i = 0; i < raw.length; i++) { bytes[i] = raw.charCodeAt(i); }
+        return new ArrayType(bytes.buffer);
+    };
+    var gather = function (values, index) {
+        var out = new Float64Array(index.length);
+        for (var i = 0; i < index.length; i++) { out[i] = values[index[i]]; }
+        return out;
+    };
+    var toMs = function (value) {
+        if (typeof value === 'number') { return value; }
+        var s = String(value).replace(' ', 'T');
+        return Date.parse(s.length === 10 ? s + 'T00:00:00Z' : s + 'Z');
+    };
+    var axes = __AXES__.map(function (b64) { return decode(b64, Float64Array); });
+    var traces = [], tiers = [];
+    var encoded = __TIERS__;
+    Object.keys(encoded).forEach(function (key) {
+        var entry = encoded[key], x = axes[entry.axis], y = decode(entry.y, Float32Array);
+        var levels = entry.tiers.map(function (b64) {
+            var index = decode(b64, Uint32Array);
+            return {x: gather(x, index), y: gather(y, index)};
+        });
+        levels.push({x: x, y: y});
+        traces.push(parseInt(key, 10));
+        tiers.push(levels);
+    });
+    var first = function (xs, value) {
+        var lo = 0, hi = xs.length;
+        while (lo < hi) { var mid = (lo + hi) >> 1; if (xs[mid] < value) { lo = mid + 1; } else { hi = mid; } }
+        return lo;
+    };
+    var view = function (levels, start, end) {
+        var base = levels[0], full = base.x[base.x.length - 1] - base.x[0];
+        var fraction = (start === null) ? 1 : Math.max((end - start) / full, 1e-9);
+        var level = levels.length - 1;
+        for (var k = 0; k < levels.length; k++) {
+            if (levels[k].x.length * fraction >= target) { level = k; break; }
+        }
+        if (level === 0 || start === null) { return {x: Array.from(base.x), y: Array.from(base.y)}; }
+        var fine = levels[level];
+        var i0 = Math.max(first(fine.x, start) - 1, 0), i1 = Math.min(first(fine.x, end) + 1, fine.x.length);
+        var b0 = first(base.x, fine.x[i0]), b1 = first(base.x, fine.x[i1 - 1] + 1);
+        var x = Array.from(base.x.subarray(0, b0)).concat(Array.from(fine.x.subarray(i0, i1)), Array.from(base.x.subarray(b1)));
+        var y = Array.from(base.y.subarray(0, b0)).concat(Array.from(fine.y.subarray(i0, i1)), Array.from(base.y.subarray(b1)));
+        return {x: x, y: y};
+    };
+    var busy = false, queued = null;
+    var apply = function (start, end) {
+        if (busy) { queued = [start, end]; return; }
+        var xs = [], ys = [];
+        tiers.forEach(function (levels) {
+            var v = view(levels, start, end);
+            xs.push(v.x); ys.push(v.y);
+        });
+        busy = true;
+        var done = function () {
+            busy = false;
+            if (queued) { var next = queued; queued = null; apply(next[0], next[1]); }
+        };
+        Plotly.restyle(gd, {x: xs, y: ys}, traces).then(done, done);
+    };
+    gd.on('plotly_relayout', function (event) {
+        var start, end, found = false;
+        Object.keys(event).forEach(function (key) {
+            var match = key.match(/^xaxis\\d*\\.(range\\[0\\]|range\\[1\\]|range|autorange)$/);
+            if (!match || found) { return; }
+            found = true;
+            var axis = key.split('.')[0], range = (gd.layout[axis] || {}).range;
+            if (match[1] === 'autorange' || !range) { start = null; end = null; }
+            else { start = toMs(range[0]); end = toMs(range[1]); }
+        });
+        if (found) { apply(start, end); }
+    });
+})();
+"""
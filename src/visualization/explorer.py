@@ -0,0 +1,404 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import json
+import time
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+import numpy as np
+import pandas as pd
+import plotly.offline
+from src.core import instrument
+from src.core.backtest import load_data, calculate_signals, run_strategy_arrays
+from src.core.drawdowns import drawdown_series
+from src.analysis.retail_investor import run_retail_strategy_arrays
+from src.analysis.vix_filter import run_vix_filtered_strategy_arrays
+from src.analysis.ma_filter import run_ma_filtered_strategy_arrays
+from src.visualization.downsample import encode_typed_array
+
+# --- Strategies ---
+
+def _run_dual(df, threshold_weight):
+    return run_strategy_arrays(df, threshold_weight, 1 - threshold_weight)
+
+def _run_calendar(df):
+    return run_retail_strategy_arrays(df)
+
+def _run_hedged(df, vix_threshold):
+    return run_vix_filtered_strategy_arrays(df, vix_threshold)
+
+def _run_ma(df, ma_window, buffer):
+    return run_ma_filtered_strategy_arrays(df, int(ma_window), buffer)
+
+# key: (label, runner, {parameter: (default, minimum, maximum, step)})
+STRATEGIES = {
+    'dual': ('Dual-Signal', _run_dual, {'threshold_weight': (0.6, 0.0, 1.0, 0.05)}),
+    'calendar': ('Calendar-Only', _run_calendar, {}),
+    'hedged': ('Hedged Equity', _run_hedged, {'vix_threshold': (20.0, 10.0, 40.0, 0.5)}),
+    'ma': ('MA-Filtered', _run_ma, {'ma_window': (200.0, 20.0, 400.0, 10.0), 'buffer': (0.02, 0.0, 0.1, 0.005)}),
+}
+
+def parse_parameters(strategy, query):
+    """
+    Validates a strategy key and its query parameters (defaults fill the gaps),
+    rounded to the slider step so equivalent requests share one cache entry.
+    Raises ValueError for anything unknown or out of range.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}'")
+    schema = STRATEGIES[strategy][2]
+    unknown = set(query) - set(schema) - {'strategy'}
+    if unknown:
+        raise ValueError(f"Unknown parameters for '{strategy}': {', '.join(sorted(unknown))}")
+
+    params = {}
+    for name, (default, minimum, maximum, step) in schema.items():
+        value = float(query.get(name, default))
+        if not minimum <= value <= maximum:
+            raise ValueError(f"{name} must be between {minimum} and {maximum}")
+        params[name] = round(minimum + round((value - minimum) / step) * step, 10)
+    return params
+
+# --- Worker Side ---
+# Each worker receives the signals once, at start-up, and keeps them for its lifetime.
+
+_worker_data = None
+
+def _init_worker(data, trace_config=None):
+    global _worker_data
+    _worker_data = data
+    if trace_config is not None:
+        instrument.enable(**trace_config)
+
+def compute_strategy(strategy, params):
+    """
+    Runs one strategy on the worker's signals and returns the JSON response
+    body: statistics plus cumulative return, position and drawdown as float32
+    typed arrays on the shared date axis (NaN where the strategy has no data).
+    """
+    start = time.perf_counter()
+    label, runner, _ = STRATEGIES[strategy]
+    result = runner(_worker_data, **params)
+
+    rows = _worker_data.index.get_indexer(result.index)
+    series = np.full((3, len(_worker_data)), np.nan)
+    series[0, rows] = result.cumulative
+    series[1, rows] = result.weight
+    series[2, rows] = drawdown_series(result.returns)
+
+    stats = result.statistics().loc['Strategy']
+    body = {
+        'strategy': strategy,
+        'label': label,
+        'params': params,
+        'stats': {key: float(value) for key, value in stats.items()},
+        'cumulative': encode_typed_array(series[0], '<f4'),
+        'weight': encode_typed_array(series[1], '<f4'),
+        'drawdown': encode_typed_array(series[2], '<f4'),
+        'compute_ms': round((time.perf_counter() - start) * 1000, 2),
+    }
+    return json.dumps(body).encode()
+
+def _compute_job(strategy, params):
+    # Worker entry point: the response body plus the spans recorded for it
+    with instrument.stage('explorer_compute', category='task', strategy=strategy):
+        body = compute_strategy(strategy, params)
+    return body, instrument.drain()
+
+# --- Server Side ---
+
+class LRUCache:
+    """
+    Least-recently-used cache of response bodies keyed by (strategy, parameters).
+    """
+    __slots__ = ('maxsize', 'hits', 'misses', '_items')
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        if key not in self._items:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+class Explorer:
+    """
+    State of a running explorer: the process pool holding the signals, the LRU
+    of recent results and the requests currently being computed (so identical
+    concurrent requests share one computation).
+    """
+    __slots__ = ('pool', 'cache', 'inflight', 'dates_body')
+
+    def __init__(self, data, workers=None, cache_size=256):
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                        initargs=(data, instrument.worker_config()))
+        self.cache = LRUCache(cache_size)
+        self.inflight = {}
+        days = data.index.values.astype('datetime64[D]').astype(np.int64).astype(np.int32)
+        spy = np.cumprod(1 + data['SPY_return'].fillna(0.0).to_numpy())
+        self.dates_body = json.dumps({
+            'days': encode_typed_array(days, '<i4'),
+            'spy': encode_typed_array(spy, '<f4'),
+            'spy_drawdown': encode_typed_array(drawdown_series(data['SPY_return'].fillna(0.0).to_numpy()), '<f4'),
+        }).encode()
+
+    async def run(self, strategy, params):
+        """
+        Returns (body, status) where status is 'hit', 'shared' or 'miss'.
+        """
+        key = (strategy, tuple(sorted(params.items())))
+        body = self.cache.get(key)
+        if body is not None:
+            return body, 'hit'
+        if key in self.inflight:
+            return await asyncio.shield(self.inflight[key]), 'shared'
+
+        future = asyncio.get_running_loop().run_in_executor(self.pool, _compute_job, strategy, params)
+        self.inflight[key] = asyncio.ensure_future(self._unpack(future))
+        try:
+            body = await self.inflight[key]
+        finally:
+            del self.inflight[key]
+        self.cache.put(key, body)
+        return body, 'miss'
+
+    async def _unpack(self, future):
+        body, spans = await future
+        instrument.merge(spans)
+        return body
+
+    async def warm_up(self):
+        """
+        Computes every strategy at its defaults, which also starts the workers.
+        """
+        await asyncio.gather(*(self.run(strategy, parse_parameters(strategy, {})) for strategy in STRATEGIES))
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+def _response(writer, status, body, content_type='application/json', headers=None):
+    reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}[status]
+    lines = [f"HTTP/1.1 {status} {reason}", f"Content-Type: {content_type}", f"Content-Length: {len(body)}",
+             "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + body)
+
+async def handle_request(explorer, reader, writer):
+    """
+    Minimal HTTP/1.1 handler: GET only, one request per connection.
+    """
+    start = time.perf_counter()
+    try:
+        request_line = (await reader.readline()).decode('latin-1').split()
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        if len(request_line) != 3:
+            return
+        method, target, _ = request_line
+        if method != 'GET':
+            _response(writer, 405, b'{"error": "GET only"}')
+            return
+
+        url = urlsplit(target)
+        query = dict(parse_qsl(url.query))
+        if url.path == '/':
+            _response(writer, 200, _PAGE.encode(), 'text/html; charset=utf-8')
+        elif url.path == '/plotly.js':
+            _response(writer, 200, _plotlyjs(), 'application/javascript', {'Cache-Control': 'max-age=86400'})
+        elif url.path == '/api/strategies':
+            schema = {key: {'label': label, 'params': params} for key, (label, _, params) in STRATEGIES.items()}
+            _response(writer, 200, json.dumps(schema).encode())
+        elif url.path == '/api/dates':
+            _response(writer, 200, explorer.dates_body)
+        elif url.path == '/api/run':
+            try:
+                strategy = query.get('strategy', '')
+                params = parse_parameters(strategy, query)
+            except ValueError as error:
+                _response(writer, 400, json.dumps({'error': str(error)}).encode())
+                return
+            body, status = await explorer.run(strategy, params)
+            elapsed = (time.perf_counter() - start) * 1000
+            _response(writer, 200, body, headers={'X-Cache': status, 'Server-Timing': f"total;dur={elapsed:.1f}"})
+        elif url.path == '/api/cache':
+            info = {'entries': len(explorer.cache), 'hits': explorer.cache.hits, 'misses': explorer.cache.misses}
+            _response(writer, 200, json.dumps(info).encode())
+        else:
+            _response(writer, 404, b'{"error": "not found"}')
+    except Exception as error:
+        _response(writer, 500, json.dumps({'error': repr(error)}).encode())
+    finally:
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+_plotlyjs_bytes = None
+
+def _plotlyjs():
+    global _plotlyjs_bytes
+    if _plotlyjs_bytes is None:
+        _plotlyjs_bytes = plotly.offline.get_plotlyjs().encode()
+    return _plotlyjs_bytes
+
+async def serve(data, host='127.0.0.1', port=8050, workers=None, cache_size=256):
+    """
+    Starts the explorer on host:port and serves until cancelled.
+    """
+    explorer = Explorer(data, workers=workers, cache_size=cache_size)
+    try:
+        await explorer.warm_up()
+        server = await asyncio.start_server(lambda r, w: handle_request(explorer, r, w), host, port)
+        print(f"Parameter explorer running on http://{host}:{port} (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+    finally:
+        explorer.close()
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Strategy Parameter Explorer</title>
+<script src="/plotly.js"></script>
+<style>
+body { font-family: sans-serif; margin: 20px; }
+.controls { display: flex; gap: 30px; flex-wrap: wrap; }
+.strategy { border: 1px solid #ddd; padding: 8px 12px; min-width: 220px; }
+.strategy label { display: block; font-size: 13px; margin-top: 6px; }
+.stats { font-size: 13px; color: #333; margin-top: 6px; }
+</style>
+</head>
+<body>
+<h2>Strategy Parameter Explorer</h2>
+<div class="controls" id="controls"></div>
+<div id="chart"></div>
+<script type="text/javascript">
+(function () {
+    var decode = function (b64, ArrayType) {
+        var raw = atob(b64), bytes = new Uint8Array(raw.length);
+        for (var i = 0; i < raw.length; i++) { bytes[i] = raw.charCodeAt(i); }
+        return new ArrayType(bytes.buffer);
+    };
+    var getJSON = function (url) { return fetch(url).then(function (r) { return r.json(); }); };
+    var x, traceOf = {}, timers = {};
+
+    var update = function (key) {
+        var inputs = document.querySelectorAll('input[data-strategy="' + key + '"]');
+        var query = ['strategy=' + key];
+        inputs.forEach(function (input) {
+            query.push(input.name + '=' + input.value);
+            document.getElementById(key + '-' + input.name).textContent = input.value;
+        });
+        var started = performance.now();
+        fetch('/api/run?' + query.join('&')).then(function (response) {
+            var cache = response.headers.get('X-Cache');
+            return response.json().then(function (body) {
+                var t = traceOf[key];
+                Plotly.restyle('chart', {y: [decode(body.cumulative, Float32Array), decode(body.drawdown, Float32Array)]}, [t, t + 1]);
+                var s = body.stats;
+                document.getElementById(key + '-stats').textContent =
+                    'CAGR ' + (100 * s['CAGR']).toFixed(2) + '%, Sharpe ' + s['Sharpe Ratio'].toFixed(2) +
+                    ', Max DD ' + (100 * s['Max Drawdown']).toFixed(2) + '% (' + cache + ', ' +
+                    Math.round(performance.now() - started) + ' ms)';
+            });
+        });
+    };
+
+    Promise.all([getJSON('/api/strategies'), getJSON('/api/dates')]).then(function (loaded) {
+        var strategies = loaded[0], dates = loaded[1];
+        var days = decode(dates.days, Int32Array);
+        x = new Float64Array(days.length);
+        for (var i = 0; i < days.length; i++) { x[i] = days[i] * 86400000; }
+
+        var traces = [
+            {x: x, y: decode(dates.spy, Float32Array), name: 'S&P 500 (SPY)', line: {color: 'grey', width: 1}},
+            {x: x, y: decode(dates.spy_drawdown, Float32Array), name: 'S&P 500 (SPY)', line: {color: 'grey', width: 1},
+             yaxis: 'y2', showlegend: false}
+        ];
+        var controls = document.getElementById('controls');
+        Object.keys(strategies).forEach(function (key) {
+            var strategy = strategies[key];
+            traceOf[key] = traces.length;
+            traces.push({x: x, y: [], name: strategy.label, legendgroup: key, line: {width: 1}});
+            traces.push({x: x, y: [], name: strategy.label, legendgroup: key, line: {width: 1}, yaxis: 'y2', showlegend: false});
+
+            var box = document.createElement('div');
+            box.className = 'strategy';
+            box.innerHTML = '<b>' + strategy.label + '</b>';
+            Object.keys(strategy.params).forEach(function (name) {
+                var p = strategy.params[name];
+                var label = document.createElement('label');
+                label.innerHTML = name + ': <span id="' + key + '-' + name + '">' + p[0] + '</span><br>';
+                var input = document.createElement('input');
+                input.type = 'range'; input.name = name; input.dataset.strategy = key;
+                input.min = p[1]; input.max = p[2]; input.step = p[3]; input.value = p[0];
+                input.addEventListener('input', function () {
+                    clearTimeout(timers[key]);
+                    timers[key] = setTimeout(function () { update(key); }, 30);
+                });
+                label.appendChild(input);
+                box.appendChild(label);
+            });
+            var stats = document.createElement('div');
+            stats.className = 'stats'; stats.id = key + '-stats';
+            box.appendChild(stats);
+            controls.appendChild(box);
+        });
+
+        Plotly.newPlot('chart', traces, {
+            template: 'plotly_white', height: 750, hovermode: 'x unified',
+            xaxis: {type: 'date'},
+            yaxis: {type: 'log', title: 'Cumulative Return', domain: [0.35, 1]},
+            yaxis2: {title: 'Drawdown', tickformat: '.0%', domain: [0, 0.3]}
+        }, {responsive: true}).then(function () {
+            Object.keys(strategies).forEach(update);
+        });
+    });
+})();
+</script>
+</body>
+</html>
+"""
+
+def main(host='127.0.0.1', port=8050, workers=2):
+    """
+    Main function to start the local parameter explorer.
+    """
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    if base_data is None:
+        return
+
+    try:
+        vix_data = pd.read_csv('data/vix.csv', index_col='Date', parse_dates=True)
+        vix_data = vix_data.rename(columns={'VIXSIM': 'VIX'})
+    except FileNotFoundError:
+        print("Error: The file at vix.csv was not found.")
+        return
+
+    print("--- Loading Signals ---")
+    data = calculate_signals(base_data).join(vix_data, how='inner')
+    try:
+        asyncio.run(serve(data, host, port, workers))
+    except KeyboardInterrupt:
+        print("\nExplorer stopped.")
+
+if __name__ == '__main__':
+    main()
@@ -5,13 +5,15 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from src.visualization.downsample import downsample_figure
 from src.core.backtest import load_data, calculate_signals
 from src.analysis.ma_filter import run_ma_filtered_strategy
 
-def plot_interactive_ma_strategy(df, title, filename):
+def plot_interactive_ma_strategy(df, title, filename, max_points=2000):
     """
     Generates a comprehensive interactive plot of the MA-filtered strategy,
-    including equity curve, price/MA bands, positions, and turnover.
+    including equity curve, price/MA bands, positions, and turnover. Every trace
+    is downsampled to about max_points, with finer detail loaded on zoom.
     """
     # --- Calculate Turnover ---
     df['turnover'] = df['strategy_weight'].diff().abs()
@@ -109,7 +111,8 @@ def plot_interactive_ma_strategy(df, title, filename):
     fig.update_yaxes(title_text="Annualized Turnover", row=3, col=1)
     fig.update_xaxes(title_text="Date", row=3, col=1, rangeslider_visible=True)
 
-    fig.write_html(filename)
+    zoom_script = downsample_figure(fig, max_points)
+    fig.write_html(filename, post_script=zoom_script or None)
     print(f"Interactive MA strategy plot saved to {filename}")
 
 def main():
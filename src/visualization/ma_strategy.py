@@ -6,6 +6,7 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from src.core.backtest import load_data, calculate_signals
+from src.core.drawdowns import drawdown_series
 from src.analysis.ma_filter import run_ma_filtered_strategy
 
 def plot_ma_strategy_performance(df):
@@ -25,10 +26,7 @@ def plot_ma_strategy_performance(df):
     plt.close()
     print("MA-filtered strategy equity curve saved to plots/ma_strategy/plot_ma_strategy_equity_curve.png")
 
-    strategy_peak = df['cumulative_strategy_return'].cummax()
-    strategy_drawdown = (df['cumulative_strategy_return'] - strategy_peak) / strategy_peak
-    spy_peak = df['cumulative_spy_return'].cummax()
-    spy_drawdown = (df['cumulative_spy_return'] - spy_peak) / spy_peak
+    strategy_drawdown, spy_drawdown = drawdown_series(df[['strategy_return', 'SPY_return']]).T
     
     plt.figure(figsize=(12, 8))
     plt.plot(df.index, strategy_drawdown, label='MA-Filtered Strategy Drawdown', color='blue')
@@ -0,0 +1,397 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import pandas as pd
+from src.core.backtest import load_data, calculate_signals, run_strategy
+from src.core.regimes import find_episodes
+from src.core import instrument
+from src.analysis.retail_investor import run_retail_strategy
+from src.analysis.vix_filter import run_vix_filtered_strategy
+from src.analysis.ma_filter import run_ma_filtered_strategy
+from src.analysis.walk_forward import run_walk_forward_analysis
+from src.visualization import plots, ma_strategy, imbalance, pnl_by_regime, position_vs_vix, position
+from src.visualization import signal_contribution, interactive_ma_strategy, dashboard
+from src.visualization import build_cache
+
+CACHE_DIR = '.plot_cache'
+
+# --- Shared Artifacts ---
+# Every artifact is computed once and handed to the tasks that list it as an input.
+# An artifact that comes back as None (e.g. missing VIX data) skips everything downstream.
+
+def load_vix_data():
+    try:
+        vix_data = pd.read_csv('data/vix.csv', index_col='Date', parse_dates=True)
+    except FileNotFoundError:
+        print("Error: VIX data not found. Plots that need it will be skipped.")
+        return None
+    return vix_data.rename(columns={'VIXSIM': 'VIX'})
+
+def signals_since_1997():
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
+    return None if base_data is None else calculate_signals(base_data)
+
+def full_history_signals():
+    full_data = load_data('data/Return.csv')
+    return None if full_data is None else calculate_signals(full_data)
+
+@instrument.instrumented('vix_join')
+def join_vix(signals, vix_data):
+    return signals.join(vix_data, how='inner')
+
+def dual_signal_strategy(signals):
+    return run_strategy(signals.copy())
+
+def calendar_strategy(signals):
+    return run_retail_strategy(signals.copy())
+
+def hedged_strategy(signals_vix):
+    return run_vix_filtered_strategy(signals_vix.copy(), vix_threshold=20)
+
+def ma_filtered_strategy(signals):
+    return run_ma_filtered_strategy(signals.copy(), ma_window=200, buffer=0.02)
+
+def walk_forward(signals):
+    return run_walk_forward_analysis(signals.copy(), 5, 2, 2, use_vix_filter=False)
+
+def walk_forward_vix(signals_vix):
+    return run_walk_forward_analysis(signals_vix.copy(), 5, 2, 2, use_vix_filter=True, vix_threshold=20)
+
+def high_vix_episodes(signals_vix):
+    return find_episodes(signals_vix['VIX'], [20 * 1000])
+
+# --- Plot Tasks ---
+
+def render_walk_forward(results):
+    plots.plot_walk_forward_equity_curve(results, filename='plots/walk_forward/plot_walk_forward.png', title_suffix=' (Baseline Retail)')
+
+def render_walk_forward_vix(results):
+    plots.plot_walk_forward_equity_curve(results, filename='plots/walk_forward/plot_walk_forward_vix_filtered.png', title_suffix=' (VIX-Filtered)')
+
+def render_baseline_performance(signals):
+    plots.plot_baseline_performance(signals.copy())
+
+def render_monte_carlo(calendar):
+    plots.plot_monte_carlo_distribution(calendar['strategy_return'])
+
+def render_crisis_analysis(signals_vix):
+    plots.plot_crisis_analysis_curves(signals_vix.copy())
+
+def render_full_history(full_signals):
+    plots.plot_full_history(run_retail_strategy(full_signals.copy()))
+
+def render_sensitivity(signals, signals_vix):
+    plots.plot_all_sensitivity_analyses(signals.copy(), signals_vix.copy())
+
+def render_vix_strategy(hedged):
+    plots.plot_vix_strategy_performance(hedged)
+
+def render_ma_strategy(ma):
+    ma_strategy.plot_ma_strategy_performance(ma)
+
+def render_interactive_ma(ma):
+    interactive_ma_strategy.plot_interactive_ma_strategy(
+        ma.copy(), 'Ultimate MA-Filtered Strategy Dashboard', 'plots/ma_strategy/plot_interactive_ma_strategy_dashboard.html'
+    )
+
+def render_imbalance(signals):
+    imbalance.plot_imbalance_indicator(signals)
+
+def render_signal_contribution(signals):
+    signal_contribution.plot_signal_contribution(signals.copy())
+
+def render_pnl_by_regime(dual, calendar, hedged, vix_data, episodes):
+    pnl_by_regime.plot_pnl_by_regime(
+        join_vix(dual, vix_data), 'P&L by Regime: Original Dual-Signal Strategy',
+        'plots/other/plot_pnl_by_regime_dual_signal.png', episodes=episodes
+    )
+    pnl_by_regime.plot_pnl_by_regime(
+        join_vix(calendar, vix_data), 'P&L by Regime: Calendar-Only Strategy',
+        'plots/other/plot_pnl_by_regime_calendar_only.png', episodes=episodes
+    )
+    pnl_by_regime.plot_pnl_by_regime(
+        hedged.copy(), 'P&L by Regime: Hedged Equity Strategy',
+        'plots/hedged_equity/plot_pnl_by_regime_hedged_equity.png', episodes=episodes
+    )
+
+def render_position_vs_vix(dual, calendar, hedged, vix_data):
+    position_vs_vix.plot_position_vs_vix(
+        join_vix(dual, vix_data), 'Position vs. VIX: Original Dual-Signal Strategy',
+        'plots/other/plot_position_vs_vix_dual_signal.png'
+    )
+    position_vs_vix.plot_position_vs_vix(
+        join_vix(calendar, vix_data), 'Position vs. VIX: Calendar-Only Strategy',
+        'plots/other/plot_position_vs_vix_calendar_only.png'
+    )
+    position_vs_vix.plot_position_vs_vix(
+        hedged, 'Position vs. VIX: Hedged Equity Strategy',
+        'plots/hedged_equity/plot_position_vs_vix_hedged_equity.png'
+    )
+
+def render_interactive_position(dual, calendar):
+    position.plot_interactive_position(
+        dual, 'Interactive Plot: Daily Position (Original Dual-Signal)',
+        'plots/other/plot_interactive_position_dual_signal.html'
+    )
+    position.plot_interactive_position(
+        calendar, 'Interactive Plot: Daily Position (Calendar-Only)',
+        'plots/other/plot_interactive_position_calendar_only.html'
+    )
+
+def render_interactive_position_hedged(hedged):
+    position.plot_interactive_position(
+        hedged, 'Interactive Plot: Daily Position (Hedged Equity)',
+        'plots/hedged_equity/plot_interactive_position_hedged_equity.html'
+    )
+
+def render_dashboard(dual, calendar, ma, hedged):
+    dashboard.build_dashboard(
+        {'Dual-Signal': dual, 'Calendar-Only': calendar, 'MA-Filtered': ma, 'Hedged Equity': hedged},
+        'plots/other/strategy_dashboard.html'
+    )
+
+# --- Task Graph ---
+# name: (kind, function, inputs). Inputs name other tasks; their results are
+# passed to the function positionally, in the listed order.
+
+TASKS = {
+    'vix_data': ('artifact', load_vix_data, []),
+    'signals': ('artifact', signals_since_1997, []),
+    'full_signals': ('artifact', full_history_signals, []),
+    'signals_vix': ('artifact', join_vix, ['signals', 'vix_data']),
+    'dual': ('artifact', dual_signal_strategy, ['signals']),
+    'calendar': ('artifact', calendar_strategy, ['signals']),
+    'hedged': ('artifact', hedged_strategy, ['signals_vix']),
+    'ma': ('artifact', ma_filtered_strategy, ['signals']),
+    'walk_forward': ('artifact', walk_forward, ['signals']),
+    'walk_forward_vix': ('artifact', walk_forward_vix, ['signals_vix']),
+    'high_vix_episodes': ('artifact', high_vix_episodes, ['signals_vix']),
+
+    'plot_walk_forward': ('plot', render_walk_forward, ['walk_forward']),
+    'plot_walk_forward_vix': ('plot', render_walk_forward_vix, ['walk_forward_vix']),
+    'plot_baseline_performance': ('plot', render_baseline_performance, ['signals']),
+    'plot_monte_carlo': ('plot', render_monte_carlo, ['calendar']),
+    'plot_crisis_analysis': ('plot', render_crisis_analysis, ['signals_vix']),
+    'plot_full_history': ('plot', render_full_history, ['full_signals']),
+    'plot_sensitivity': ('plot', render_sensitivity, ['signals', 'signals_vix']),
+    'plot_vix_strategy': ('plot', render_vix_strategy, ['hedged']),
+    'plot_ma_strategy': ('plot', render_ma_strategy, ['ma']),
+    'plot_interactive_ma': ('plot', render_interactive_ma, ['ma']),
+    'plot_imbalance': ('plot', render_imbalance, ['signals']),
+    'plot_signal_contribution': ('plot', render_signal_contribution, ['signals']),
+    'plot_pnl_by_regime': ('plot', render_pnl_by_regime, ['dual', 'calendar', 'hedged', 'vix_data', 'high_vix_episodes']),
+    'plot_position_vs_vix': ('plot', render_position_vs_vix, ['dual', 'calendar', 'hedged', 'vix_data']),
+    'plot_interactive_position': ('plot', render_interactive_position, ['dual', 'calendar']),
+    'plot_interactive_position_hedged': ('plot', render_interactive_position_hedged, ['hedged']),
+    'plot_dashboard': ('plot', render_dashboard, ['dual', 'calendar', 'ma', 'hedged']),
+}
+
+# Data files read by the loading artifacts and files written by each plot task.
+# Both feed the build-cache fingerprints; outputs are also tracked in the manifest.
+
+SOURCE_FILES = {
+    'vix_data': ['data/vix.csv'],
+    'signals': ['data/Return.csv'],
+    'full_signals': ['data/Return.csv'],
+}
+
+OUTPUTS = {
+    'plot_walk_forward': ['plots/walk_forward/plot_walk_forward.png'],
+    'plot_walk_forward_vix': ['plots/walk_forward/plot_walk_forward_vix_filtered.png'],
+    'plot_baseline_performance': ['plots/other/performance.png'],
+    'plot_monte_carlo': ['plots/other/plot_monte_carlo.png'],
+    'plot_crisis_analysis': ['plots/other/plot_crisis_analysis.png'],
+    'plot_full_history': ['plots/other/plot_full_history.png'],
+    'plot_sensitivity': ['plots/sensitivity/plot_sensitivity_weights.png', 'plots/sensitivity/plot_sensitivity_norm.png',
+                         'plots/sensitivity/plot_sensitivity_vix.png'],
+    'plot_vix_strategy': ['plots/hedged_equity/plot_vix_strategy_equity_curve.png',
+                          'plots/hedged_equity/plot_vix_strategy_drawdowns.png'],
+    'plot_ma_strategy': ['plots/ma_strategy/plot_ma_strategy_equity_curve.png', 'plots/ma_strategy/plot_ma_strategy_drawdowns.png'],
+    'plot_interactive_ma': ['plots/ma_strategy/plot_interactive_ma_strategy_dashboard.html'],
+    'plot_imbalance': ['plots/other/plot_imbalance_indicator.png'],
+    'plot_signal_contribution': ['plots/other/plot_signal_contribution.png'],
+    'plot_pnl_by_regime': ['plots/other/plot_pnl_by_regime_dual_signal.png', 'plots/other/plot_pnl_by_regime_calendar_only.png',
+                           'plots/hedged_equity/plot_pnl_by_regime_hedged_equity.png'],
+    'plot_position_vs_vix': ['plots/other/plot_position_vs_vix_dual_signal.png', 'plots/other/plot_position_vs_vix_calendar_only.png',
+                             'plots/hedged_equity/plot_position_vs_vix_hedged_equity.png'],
+    'plot_interactive_position': ['plots/other/plot_interactive_position_dual_signal.html',
+                                  'plots/other/plot_interactive_position_calendar_only.html'],
+    'plot_interactive_position_hedged': ['plots/hedged_equity/plot_interactive_position_hedged_equity.html'],
+    'plot_dashboard': ['plots/other/strategy_dashboard.html'],
+}
+
+# --- Scheduler ---
+
+def required_tasks(tasks, targets=None):
+    """
+    The targets (default: every task) plus everything they depend on, in
+    dependency order. Raises ValueError on unknown names or cycles.
+    """
+    ordered, state = [], {}
+
+    def visit(name, path):
+        if name not in tasks:
+            raise ValueError(f"Unknown task '{name}' (required by {' -> '.join(path) or 'targets'})")
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        state[name] = 'visiting'
+        for dependency in tasks[name][2]:
+            visit(dependency, path + [name])
+        state[name] = 'done'
+        ordered.append(name)
+
+    for name in (tasks if targets is None else targets):
+        visit(name, [])
+    return ordered
+
+def _init_worker(trace_config=None):
+    import matplotlib
+    matplotlib.use('Agg')
+    if trace_config is not None:
+        instrument.enable(**trace_config)
+
+def _run_task(name, kind, function, args):
+    """
+    Runs one task in a worker and times it there, so the report shows compute
+    time rather than time spent queued. With tracing on, the task is a span and
+    the worker's spans travel back with the result.
+    """
+    start = time.perf_counter()
+    try:
+        with instrument.stage(name, category=kind):
+            value, error = function(*args), None
+    except Exception:
+        value, error = None, traceback.format_exc()
+    return value, error, time.perf_counter() - start, os.getpid(), instrument.drain()
+
+def plan_incremental(tasks, order, targets, fingerprints, manifest, cache_dir):
+    """
+    Splits the graph for an incremental build. Plots whose fingerprint and outputs
+    match the manifest are up to date; for the rest, the artifacts they need are
+    loaded from the artifact store when cached, otherwise they are rerun along
+    with whatever they need in turn. Returns (to_run, preloaded, up_to_date).
+    """
+    up_to_date = [name for name in order
+                  if tasks[name][0] == 'plot' and build_cache.is_fresh(manifest, name, fingerprints[name])]
+    roots = [name for name in order if tasks[name][0] == 'plot' and name not in up_to_date]
+    if targets is not None:
+        roots += [name for name in targets if tasks[name][0] == 'artifact']
+
+    to_run, preloaded = set(), {}
+    stack = list(roots)
+    while stack:
+        name = stack.pop()
+        if name in to_run or name in preloaded:
+            continue
+        if tasks[name][0] == 'artifact':
+            hit, value = build_cache.load_artifact(cache_dir, name, fingerprints[name])
+            if hit:
+                preloaded[name] = value
+                continue
+        to_run.add(name)
+        stack.extend(tasks[name][2])
+    return [name for name in order if name in to_run], preloaded, up_to_date
+
+def run_pipeline(tasks=None, targets=None, max_workers=None, cache_dir=None, source_files=None, outputs=None):
+    """
+    Runs the task graph on a process pool. A task is submitted as soon as all its
+    inputs exist, so independent artifacts and plots run side by side, and each
+    artifact is computed exactly once. With a `cache_dir`, only stale plots (and
+    the artifacts they need that are not in the artifact store) run; see
+    src.visualization.build_cache. Returns (results, timings).
+    """
+    tasks = TASKS if tasks is None else tasks
+    source_files = SOURCE_FILES if source_files is None else source_files
+    outputs = OUTPUTS if outputs is None else outputs
+    order = required_tasks(tasks, targets)
+    results, timings, running = {}, [], {}
+    pipeline_start = time.perf_counter()
+
+    if cache_dir is not None:
+        fingerprints = build_cache.task_fingerprints(tasks, order, source_files, outputs)
+        manifest = build_cache.load_manifest(cache_dir)
+        order, results, up_to_date = plan_incremental(tasks, order, targets, fingerprints, manifest, cache_dir)
+        for name, status in [(name, 'cached') for name in results] + [(name, 'up to date') for name in up_to_date]:
+            timings.append({'task': name, 'kind': tasks[name][0], 'status': status,
+                            'start': time.perf_counter() - pipeline_start, 'seconds': 0.0, 'worker': None})
+    pending = {name: tasks[name][2] for name in order}
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(instrument.worker_config(),)) as pool:
+            while pending or running:
+                ready = [name for name, inputs in pending.items() if all(i in results for i in inputs)]
+                for name in ready:
+                    del pending[name]
+                    kind, function, inputs = tasks[name]
+                    args = [results[i] for i in inputs]
+                    missing = [i for i, value in zip(inputs, args) if value is None]
+                    if missing:
+                        results[name] = None
+                        timings.append({'task': name, 'kind': kind, 'status': f"skipped (no {', '.join(missing)})",
+                                        'start': time.perf_counter() - pipeline_start, 'seconds': 0.0, 'worker': None})
+                        continue
+                    future = pool.submit(_run_task, name, kind, function, args)
+                    running[future] = (name, kind, time.perf_counter() - pipeline_start)
+                if ready and not running:
+                    continue  # skipped tasks may have unblocked others
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, kind, submitted = running.pop(future)
+                    value, error, seconds, worker, spans = future.result()
+                    instrument.merge(spans)
+                    results[name] = value
+                    if error is not None:
+                        print(f"Task '{name}' failed:\n{error}")
+                    elif cache_dir is not None:
+                        if kind == 'artifact' and value is not None:
+                            build_cache.store_artifact(cache_dir, name, fingerprints[name], value)
+                        build_cache.record_task(manifest, name, kind, fingerprints[name], outputs.get(name, []), seconds)
+                    timings.append({'task': name, 'kind': kind, 'status': 'failed' if error else 'ok',
+                                    'start': submitted, 'seconds': seconds, 'worker': worker})
+    finally:
+        if cache_dir is not None:
+            build_cache.save_manifest(cache_dir, manifest)
+
+    timings = pd.DataFrame(timings, columns=['task', 'kind', 'status', 'start', 'seconds', 'worker']).set_index('task')
+    timings.attrs['wall_time'] = time.perf_counter() - pipeline_start
+    return results, timings
+
+def print_timing_report(timings):
+    """
+    Prints per-task start offset, run time and worker, then the wall time against
+    the summed task time.
+    """
+    print("\n--- Plot Pipeline Timing Report ---")
+    print(f"{'Task':<34} {'Kind':<9} {'Start':>7} {'Time':>8} {'Worker':>7}  Status")
+    print("-" * 80)
+    for name, row in timings.sort_values('start').iterrows():
+        worker = '' if pd.isna(row['worker']) else int(row['worker'])
+        print(f"{name:<34} {row['kind']:<9} {row['start']:>6.2f}s {row['seconds']:>7.2f}s {worker:>7}  {row['status']}")
+    busy = timings['seconds'].sum()
+    wall = timings.attrs['wall_time']
+    print("-" * 80)
+    print(f"Summed task time: {busy:.2f}s, wall time: {wall:.2f}s ({busy / wall:.1f}x parallelism)")
+    reused = timings['status'].isin(['cached', 'up to date']).sum()
+    if reused:
+        print(f"{reused} of {len(timings)} tasks reused from the build cache")
+
+def main(max_workers=None, force=False):
+    """
+    Main function to generate every plot of the report in one process pool,
+    redrawing only the figures whose inputs or code changed unless `force` is set.
+    """
+    print("--- Generating All Plots ---")
+    _, timings = run_pipeline(max_workers=max_workers, cache_dir=None if force else CACHE_DIR)
+    print_timing_report(timings)
+
+if __name__ == '__main__':
+    main(force='--force' in sys.argv[1:])
@@ -5,10 +5,12 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from src.core.backtest import load_data, calculate_signals, run_strategy
+from src.core.drawdowns import drawdown_series
 from src.analysis.retail_investor import run_retail_strategy
 from src.analysis.monte_carlo import run_monte_carlo_simulation
 from src.analysis.walk_forward import run_walk_forward_analysis
 from src.analysis.vix_filter import run_vix_filtered_strategy
+from src.analysis.sensitivity import sensitivity_tables
 
 # --- Plotting Functions ---
 
@@ -29,18 +31,10 @@ def plot_walk_forward_equity_curve(walk_forward_results, filename='plots/walk_fo
     plt.close()
     print(f"Walk-forward plot saved to {filename}")
 
-def plot_monte_carlo_distribution():
+def plot_monte_carlo_distribution(strategy_returns, num_sims=5000, horizon=10):
     """
     Generates and saves a histogram of the Monte Carlo simulation results.
     """
-    base_data = load_data('c:/Users/rwydaegh/OneDrive - UGent/Desktop/Documents/investeren/The Unintended Consequence of Rebalancing/data/Return.csv', start_date='1997-09-10')
-    if base_data is None: return
-    base_data = calculate_signals(base_data)
-    strategy_data = run_retail_strategy(base_data.copy())
-    strategy_returns = strategy_data['strategy_return']
-    
-    num_sims = 5000
-    horizon = 10
     strategy_mc = run_monte_carlo_simulation(strategy_returns, num_simulations=num_sims, horizons=[horizon])
     cagr_dist = strategy_mc[horizon]['cagr_dist']
     
@@ -83,15 +77,10 @@ def plot_crisis_analysis_curves(data_with_signals_vix):
     plt.close()
     print("Crisis analysis plot saved to plots/other/plot_crisis_analysis.png")
 
-def plot_full_history():
+def plot_full_history(results):
     """
-    Generates and saves a plot of the full backtest period.
+    Generates and saves a plot of the full backtest period from the retail strategy results.
     """
-    full_data = load_data('c:/Users/rwydaegh/OneDrive - UGent/Desktop/Documents/investeren/The Unintended Consequence of Rebalancing/data/Return.csv')
-    if full_data is None: return
-    full_data = calculate_signals(full_data)
-    results = run_retail_strategy(full_data)
-    
     plt.figure(figsize=(12, 8))
     plt.plot(results.index, results['cumulative_strategy_return'], label='Retail Strategy (Full History)')
     plt.plot(results.index, results['cumulative_spy_return'], label='S&P 500 (SPY)')
@@ -151,48 +140,11 @@ def plot_all_sensitivity_analyses(data_with_signals, data_with_signals_vix):
     """
     print("\n--- Generating Sensitivity Analysis Plots ---")
     
-    # 1. Varying Signal Weights
-    weight_results = []
-    weights = np.arange(0.2, 0.81, 0.1)
-    for w in weights:
-        temp_df = data_with_signals.copy()
-        temp_df['strategy_weight'] = w * temp_df['modified_threshold_signal'] + (1-w) * temp_df['modified_calendar_signal']
-        temp_df['spread_return'] = temp_df['SPY_return'] - temp_df['TLT_return']
-        temp_df['strategy_return'] = temp_df['strategy_weight'].shift(1) * temp_df['spread_return']
-        temp_df = temp_df.dropna().copy()
-        cagr = (1 + temp_df['strategy_return']).prod()**(252/len(temp_df)) - 1
-        sharpe = cagr / (temp_df['strategy_return'].std() * np.sqrt(252))
-        weight_results.append({'CAGR': cagr, 'Sharpe': sharpe})
-    weight_df = pd.DataFrame(weight_results, index=[f"{w:.1f}/{1-w:.1f}" for w in weights])
-    plot_sensitivity_results(weight_df, 'Signal Weight (Threshold/Calendar)', 'Performance vs. Signal Weights', 'plots/sensitivity/plot_sensitivity_weights.png')
-
-    # 2. Varying Normalization Constant
-    norm_results = []
-    norms = np.arange(0.006, 0.0181, 0.002)
-    for norm in norms:
-        temp_df = data_with_signals.copy()
-        temp_df['modified_threshold_signal'] = - (data_with_signals['avg_threshold_signal'] / norm)
-        temp_df['strategy_weight'] = 0.6 * temp_df['modified_threshold_signal'] + 0.4 * temp_df['modified_calendar_signal']
-        temp_df['spread_return'] = temp_df['SPY_return'] - temp_df['TLT_return']
-        temp_df['strategy_return'] = temp_df['strategy_weight'].shift(1) * temp_df['spread_return']
-        temp_df = temp_df.dropna().copy()
-        cagr = (1 + temp_df['strategy_return']).prod()**(252/len(temp_df)) - 1
-        sharpe = cagr / (temp_df['strategy_return'].std() * np.sqrt(252))
-        norm_results.append({'CAGR': cagr, 'Sharpe': sharpe})
-    norm_df = pd.DataFrame(norm_results, index=[f"{norm:.4f}" for norm in norms])
-    plot_sensitivity_results(norm_df, 'Normalization Constant', 'Performance vs. Normalization Constant', 'plots/sensitivity/plot_sensitivity_norm.png')
-
-    # 3. Varying VIX Threshold
-    if data_with_signals_vix is not None:
-        vix_results = []
-        thresholds = np.arange(15, 31, 2.5)
-        for thresh in thresholds:
-            temp_df = run_vix_filtered_strategy(data_with_signals_vix.copy(), vix_threshold=thresh)
-            cagr = (1 + temp_df['strategy_return']).prod()**(252/len(temp_df)) - 1
-            sharpe = cagr / (temp_df['strategy_return'].std() * np.sqrt(252)) if temp_df['strategy_return'].std() > 0 else 0
-            vix_results.append({'CAGR': cagr, 'Sharpe': sharpe})
-        vix_df = pd.DataFrame(vix_results, index=[f"> {t}" for t in thresholds])
-        plot_sensitivity_results(vix_df, 'VIX Threshold', 'Performance vs. VIX Threshold', 'plots/sensitivity/plot_sensitivity_vix.png')
+    tables = sensitivity_tables(data_with_signals, data_with_signals_vix)
+    plot_sensitivity_results(tables['weights'], 'Signal Weight (Threshold/Calendar)', 'Performance vs. Signal Weights', 'plots/sensitivity/plot_sensitivity_weights.png')
+    plot_sensitivity_results(tables['norm'], 'Normalization Constant', 'Performance vs. Normalization Constant', 'plots/sensitivity/plot_sensitivity_norm.png')
+    if tables['vix'] is not None:
+        plot_sensitivity_results(tables['vix'], 'VIX Threshold', 'Performance vs. VIX Threshold', 'plots/sensitivity/plot_sensitivity_vix.png')
 
 def plot_vix_strategy_performance(df):
     """
@@ -211,10 +163,7 @@ def plot_vix_strategy_performance(df):
     plt.close()
     print("VIX-filtered strategy equity curve saved to plots/hedged_equity/plot_vix_strategy_equity_curve.png")
 
-    strategy_peak = df['cumulative_strategy_return'].cummax()
-    strategy_drawdown = (df['cumulative_strategy_return'] - strategy_peak) / strategy_peak
-    spy_peak = df['cumulative_spy_return'].cummax()
-    spy_drawdown = (df['cumulative_spy_return'] - spy_peak) / spy_peak
+    strategy_drawdown, spy_drawdown = drawdown_series(df[['strategy_return', 'SPY_return']]).T
     
     plt.figure(figsize=(12, 8))
     plt.plot(df.index, strategy_drawdown, label='VIX-Filtered Strategy Drawdown', color='blue')
@@ -233,11 +182,11 @@ def main():
     Main function to generate all plots for the report.
     """
     # --- Load Data Once ---
-    base_data = load_data('c:/Users/rwydaegh/OneDrive - UGent/Desktop/Documents/investeren/The Unintended Consequence of Rebalancing/data/Return.csv', start_date='1997-09-10')
+    base_data = load_data('data/Return.csv', start_date='1997-09-10')
     if base_data is None: return
     
     try:
-        vix_data = pd.read_csv('c:/Users/rwydaegh/OneDrive - UGent/Desktop/Documents/investeren/The Unintended Consequence of Rebalancing/data/vix.csv', index_col='Date', parse_dates=True)
+        vix_data = pd.read_csv('data/vix.csv', index_col='Date', parse_dates=True)
         vix_data = vix_data.rename(columns={'VIXSIM': 'VIX'})
     except FileNotFoundError:
         print("Error: VIX data not found. Some plots will be skipped.")
@@ -262,10 +211,12 @@ def main():
 
     print("\n--- Generating Other Analysis Plots ---")
     plot_baseline_performance(data_with_signals.copy())
-    plot_monte_carlo_distribution()
+    plot_monte_carlo_distribution(run_retail_strategy(data_with_signals.copy())['strategy_return'])
     if data_with_signals_vix is not None:
         plot_crisis_analysis_curves(data_with_signals_vix.copy())
-    plot_full_history()
+    full_data = load_data('data/Return.csv')
+    if full_data is not None:
+        plot_full_history(run_retail_strategy(calculate_signals(full_data)))
     
     if data_with_signals_vix is not None:
         plot_all_sensitivity_analyses(data_with_signals.copy(), data_with_signals_vix.copy())
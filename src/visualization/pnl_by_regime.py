@@ -7,12 +7,16 @@ import matplotlib.pyplot as plt
 from src.core.backtest import load_data, calculate_signals, run_strategy
 from src.analysis.retail_investor import run_retail_strategy
 from src.analysis.vix_filter import run_vix_filtered_strategy
+from src.core.regimes import find_episodes, episode_mask
 
-def plot_pnl_by_regime(df, title, filename, vix_threshold=20):
+def plot_pnl_by_regime(df, title, filename, vix_threshold=20, episodes=None):
     """
     Generates an equity curve plot separating P&L from different VIX regimes for a given strategy.
+    A precomputed episode table (src.core.regimes.find_episodes) can be passed in to share it across plots.
     """
-    df['high_vix_period'] = df['VIX'] > (vix_threshold * 1000)
+    if episodes is None:
+        episodes = find_episodes(df['VIX'], [vix_threshold * 1000])
+    df['high_vix_period'] = episode_mask(df.index, episodes, threshold=vix_threshold * 1000)
     
     # Calculate returns for each regime
     df['high_vix_return'] = np.where(df['high_vix_period'].shift(1).fillna(False), df['strategy_return'], 0)
@@ -57,6 +61,7 @@ def main():
 
     data_with_signals = calculate_signals(base_data.copy())
     data_with_vix = data_with_signals.join(vix_data, how='inner')
+    high_vix_episodes = find_episodes(data_with_vix['VIX'], [20 * 1000])
 
     # --- 1. Original Dual-Signal Strategy ---
     print("\n1. Plotting for Dual-Signal Strategy...")
@@ -64,7 +69,8 @@ def main():
     plot_pnl_by_regime(
         strategy_data_dual,
         'P&L by Regime: Original Dual-Signal Strategy',
-        'plots/other/plot_pnl_by_regime_dual_signal.png'
+        'plots/other/plot_pnl_by_regime_dual_signal.png',
+        episodes=high_vix_episodes
     )
 
     # --- 2. Calendar-Only (Retail) Strategy ---
@@ -73,7 +79,8 @@ def main():
     plot_pnl_by_regime(
         strategy_data_retail,
         'P&L by Regime: Calendar-Only Strategy',
-        'plots/other/plot_pnl_by_regime_calendar_only.png'
+        'plots/other/plot_pnl_by_regime_calendar_only.png',
+        episodes=high_vix_episodes
     )
 
     # --- 3. Hedged Equity Strategy ---
@@ -82,7 +89,8 @@ def main():
     plot_pnl_by_regime(
         strategy_data_hedged,
         'P&L by Regime: Hedged Equity Strategy',
-        'plots/hedged_equity/plot_pnl_by_regime_hedged_equity.png'
+        'plots/hedged_equity/plot_pnl_by_regime_hedged_equity.png',
+        episodes=high_vix_episodes
     )
 
 if __name__ == '__main__':
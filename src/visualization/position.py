@@ -3,13 +3,15 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 import pandas as pd
 import plotly.graph_objects as go
+from src.visualization.downsample import downsample_figure
 from src.core.backtest import load_data, calculate_signals, run_strategy
 from src.analysis.retail_investor import run_retail_strategy
 from src.analysis.vix_filter import run_vix_filtered_strategy
 
-def plot_interactive_position(df, title, filename):
+def plot_interactive_position(df, title, filename, max_points=2000):
     """
-    Generates an interactive plot of a strategy's position over time.
+    Generates an interactive plot of a strategy's position over time, downsampled
+    to about max_points per trace with finer detail loaded on zoom.
     """
     fig = go.Figure()
 
@@ -42,7 +44,8 @@ def plot_interactive_position(df, title, filename):
         )
     )
 
-    fig.write_html(filename)
+    zoom_script = downsample_figure(fig, max_points)
+    fig.write_html(filename, post_script=zoom_script or None)
     print(f"Interactive position plot saved to {filename}")
 
 def main():
@@ -0,0 +1,12 @@
+import os
+import pytest
+from src.cli import IMPORT_BUDGETS, measure_import
+
+# Slow machines can stretch every budget, e.g. IMPORT_BUDGET_SCALE=2
+SCALE = float(os.environ.get('IMPORT_BUDGET_SCALE', '1'))
+
+@pytest.mark.parametrize('module, budget', IMPORT_BUDGETS, ids=[module for module, _ in IMPORT_BUDGETS])
+def test_import_budget(module, budget):
+    seconds, heavy = measure_import(module)
+    assert not heavy, f"{module} imports {', '.join(heavy)} at module level"
+    assert seconds <= budget * SCALE, f"{module} took {seconds:.3f}s to import (budget {budget * SCALE:.2f}s)"